@@ -0,0 +1,71 @@
+"""
+Maintenance commands.
+
+Usage:
+    python -m app.cli migrate [--status] [--target VERSION]
+    python -m app.cli rollups rebuild [--user-id ID]
+    python -m app.cli rollups backfill
+"""
+import argparse
+from typing import List, Optional
+
+from sqlmodel import Session
+
+from app.core.rollups import backfill_rollups, rebuild_rollups
+from app.db import create_db_and_tables, engine
+from app.migrations import applied_versions, current_version, get_migrations, migrate
+
+
+def _migrate(args: argparse.Namespace) -> None:
+    if args.status:
+        with engine.begin() as connection:
+            applied_set = applied_versions(connection)
+        for migration in get_migrations():
+            state = "applied" if migration.version in applied_set else "pending"
+            print(f"{migration.version:04d}  {state:8}  {migration.description}")
+        return
+    applied = migrate(engine, target=args.target)
+    for migration in applied:
+        print(f"Applied {migration.version:04d}: {migration.description}")
+    print(f"Schema at version {current_version(engine)}")
+
+
+def _rollups(args: argparse.Namespace) -> None:
+    create_db_and_tables()
+    with Session(engine) as session:
+        if args.action == "rebuild":
+            count = rebuild_rollups(session, user_id=args.user_id)
+            print(f"Rebuilt rollups for {count} user(s)")
+        else:
+            count = backfill_rollups(session)
+            print(f"Backfilled rollups for {count} user(s)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="HyperFocus maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = subparsers.add_parser("migrate", help="Apply the pending schema migrations")
+    migrate_parser.add_argument("--status", action="store_true", help="List migrations without applying them")
+    migrate_parser.add_argument("--target", type=int, default=None, help="Stop at this version")
+    migrate_parser.set_defaults(func=_migrate)
+
+    rollups = subparsers.add_parser("rollups", help="Maintain the hourly stats rollups")
+    rollups.add_argument(
+        "action",
+        choices=["rebuild", "backfill"],
+        help="rebuild: recompute from raw rows; backfill: only users whose rollups miss raw rows",
+    )
+    rollups.add_argument("--user-id", type=int, default=None, help="Only rebuild this user")
+    rollups.set_defaults(func=_rollups)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
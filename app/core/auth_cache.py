@@ -0,0 +1,168 @@
+"""
+In-process caches used by the auth dependencies (`app/core/deps.py`).
+
+- tokens: verified JWT subject keyed by the raw token, kept until the
+  token's `exp` (and at most AUTH_CACHE_TTL_SECONDS).
+- users: column snapshot of the user row keyed by id, for
+  AUTH_CACHE_TTL_SECONDS. Any insert/update/delete of a User through an
+  ORM Session (e.g. toggling `is_active` or `is_superuser`) drops the
+  entry once the transaction commits: dropping it at flush time would let
+  a concurrent request re-cache the old row before the commit. Bulk
+  `update(User)` / `delete(User)` run through a Session clear every cached
+  user on commit, since the rows they touched are unknown. Statements run
+  on a bare Connection bypass all of this; the TTL bounds their staleness.
+
+Both are bounded LRUs, one per worker: invalidation does not cross
+workers, so the TTL bounds how long another worker may see the old row.
+AUTH_CACHE_TTL_SECONDS=0 disables them.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session, object_session
+
+from app.core.config import settings
+from app.models import User
+
+
+class TTLCache:
+    """Thread-safe LRU with a per-entry expiry and hit/miss counters."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self, reset_counters: bool = True) -> None:
+        with self._lock:
+            self._entries.clear()
+            if reset_counters:
+                self.hits = 0
+                self.misses = 0
+
+    def info(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class AuthCache:
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.tokens = TTLCache(max_entries)
+        self.users = TTLCache(max_entries)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get_token_subject(self, token: str) -> Optional[str]:
+        return self.tokens.get(token) if self.enabled else None
+
+    def set_token_subject(self, token: str, subject: str, expires_at: Optional[float]) -> None:
+        if not self.enabled:
+            return
+        ttl = self.ttl_seconds
+        if expires_at is not None:
+            ttl = min(ttl, expires_at - time.time())
+        self.tokens.set(token, subject, ttl)
+
+    def get_user(self, user_id: int) -> Optional[Dict[str, Any]]:
+        return self.users.get(user_id) if self.enabled else None
+
+    def set_user(self, user: User) -> None:
+        if self.enabled:
+            self.users.set(user.id, user.model_dump(), self.ttl_seconds)
+
+    def invalidate_user(self, user_id: Optional[int]) -> None:
+        if user_id is not None:
+            self.users.pop(user_id)
+
+    def invalidate_all_users(self) -> None:
+        self.users.clear(reset_counters=False)
+
+    def clear(self) -> None:
+        self.tokens.clear()
+        self.users.clear()
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "ttl_seconds": self.ttl_seconds,
+            "tokens": self.tokens.info(),
+            "users": self.users.info(),
+        }
+
+
+auth_cache = AuthCache(
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+)
+
+
+# Session.info keys of the users written in the current transaction
+_DIRTY_USERS = "auth_cache_dirty_users"
+_ALL_USERS = "auth_cache_all_users"
+
+
+@event.listens_for(User, "after_insert")
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _mark_user_dirty(mapper, connection, target: User) -> None:
+    session = object_session(target)
+    if session is None:
+        auth_cache.invalidate_user(target.id)
+    else:
+        session.info.setdefault(_DIRTY_USERS, set()).add(target.id)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_bulk_user_writes(orm_execute_state: ORMExecuteState) -> None:
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and any(
+        mapper.class_ is User for mapper in orm_execute_state.all_mappers
+    ):
+        orm_execute_state.session.info[_ALL_USERS] = True
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _invalidate_dirty_users(session: Session) -> None:
+    # After a rollback the old row is still current; dropping it is merely harmless
+    if session.info.pop(_ALL_USERS, False):
+        auth_cache.invalidate_all_users()
+    for user_id in session.info.pop(_DIRTY_USERS, ()):
+        auth_cache.invalidate_user(user_id)
@@ -0,0 +1,90 @@
+"""
+Closed-form distribution of a time interval over cyclic buckets
+(hours of the day, days of the week).
+
+Instead of walking the interval bucket by bucket, the overlap is computed
+arithmetically in integer microseconds: every full cycle adds one period to
+each bucket, and the remainder (shorter than a cycle) is intersected with
+each bucket and its next-cycle copy. The cost depends on the number of
+buckets, not on the length of the interval.
+
+Bucketing uses the wall clock of the datetimes (naive values are taken as
+they are), like `datetime.hour` and `datetime.weekday()` do.
+"""
+from datetime import datetime, timedelta
+from typing import Iterator, List, Tuple
+
+MICROSECOND = timedelta(microseconds=1)
+HOUR_US = 3600 * 1_000_000
+DAY_US = 24 * HOUR_US
+
+EPOCH = datetime(1970, 1, 1)
+# 1970-01-01 was a Thursday
+EPOCH_WEEKDAY = 3
+
+
+def to_micros(dt: datetime) -> int:
+    """Microseconds between the Unix epoch and the wall-clock time of `dt`."""
+    return (dt.replace(tzinfo=None) - EPOCH) // MICROSECOND
+
+
+def _overlap(a_start: int, a_end: int, b_start: int, b_end: int) -> int:
+    return max(0, min(a_end, b_end) - max(a_start, b_start))
+
+
+def cyclic_overlap(start_us: int, end_us: int, bucket_us: int, buckets: int, offset: int = 0) -> List[int]:
+    """
+    Microseconds of [start_us, end_us) falling in each of `buckets` cyclic
+    buckets of `bucket_us`. Bucket 0 starts at time 0 shifted back by
+    `offset` buckets (i.e. time 0 belongs to bucket `offset`).
+    """
+    totals = [0] * buckets
+    if end_us <= start_us:
+        return totals
+
+    cycle = bucket_us * buckets
+    full_cycles, remainder = divmod(end_us - start_us, cycle)
+    if full_cycles:
+        totals = [full_cycles * bucket_us] * buckets
+    if not remainder:
+        return totals
+
+    # Position of the remainder inside the cycle; it wraps around at most once
+    position = (start_us + offset * bucket_us) % cycle
+    tail_end = position + remainder
+    for index in range(buckets):
+        bucket_start = index * bucket_us
+        bucket_end = bucket_start + bucket_us
+        totals[index] += _overlap(position, tail_end, bucket_start, bucket_end)
+        if tail_end > cycle:
+            totals[index] += _overlap(position, tail_end, bucket_start + cycle, bucket_end + cycle)
+    return totals
+
+
+def bucket_overlaps(start_us: int, end_us: int, bucket_us: int) -> Iterator[Tuple[int, int]]:
+    """
+    (bucket start, microseconds) for each absolute bucket of `bucket_us`
+    that [start_us, end_us) overlaps. Only the first and the last bucket can
+    be partial; the ones in between get `bucket_us` each.
+    """
+    if end_us <= start_us:
+        return
+    first = start_us - start_us % bucket_us
+    last = (end_us - 1) - (end_us - 1) % bucket_us
+    if first == last:
+        yield first, end_us - start_us
+        return
+    yield first, first + bucket_us - start_us
+    for bucket in range(first + bucket_us, last, bucket_us):
+        yield bucket, bucket_us
+    yield last, end_us - last
+
+
+def hour_of_day_overlap(start: datetime, end: datetime) -> List[int]:
+    """Microseconds of [start, end) in each hour of the day (index 0-23)."""
+    return cyclic_overlap(to_micros(start), to_micros(end), HOUR_US, 24)
+
+
+def weekday_overlap(start: datetime, end: datetime) -> List[int]:
+    """Microseconds of [start, end) in each weekday (index 0 = Monday)."""
+    return cyclic_overlap(to_micros(start), to_micros(end), DAY_US, 7, offset=EPOCH_WEEKDAY)
@@ -0,0 +1,293 @@
+"""
+Per-user cache for the stats responses.
+
+Entries are keyed by (user_id, function, range_days, time bucket, data
+version). The bucket is `now // STATS_CACHE_TTL_SECONDS`, so a result is
+never served for longer than one TTL even though the "last N days" window
+keeps moving. The data version is the one the router read for the ETag: a
+result computed while a write lands is stored under the version it started
+from and is never served with the newer ETag. STATS_CACHE_TTL_SECONDS=0
+disables the cache.
+
+Backends:
+- "memory": in-process LRU with a maximum number of entries (one per worker).
+  `invalidate_user()` (called on writes) frees the user's entries early.
+- "redis": any Redis-compatible server, shared by every uvicorn worker.
+  Entries of older data versions are never read again and expire with their
+  TTL; eviction and memory limits are the server's (e.g. maxmemory-policy
+  allkeys-lru). The async stats router calls it from worker threads.
+- "none": caching disabled.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from anyio import to_thread
+
+from app.core.config import settings
+
+
+class CacheBackend:
+    """Storage interface used by StatsCache."""
+
+    name = "base"
+    # Does network I/O: the async path calls it from a worker thread
+    blocking = False
+
+    def get(self, user_id: int, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def set(self, user_id: int, key: str, value: Any, ttl: int) -> None:
+        raise NotImplementedError
+
+    def invalidate_user(self, user_id: int) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def size(self) -> Optional[int]:
+        """Number of stored entries, if the backend knows it."""
+        return None
+
+
+class NullCacheBackend(CacheBackend):
+    name = "none"
+
+    def get(self, user_id: int, key: str) -> Optional[Any]:
+        return None
+
+    def set(self, user_id: int, key: str, value: Any, ttl: int) -> None:
+        pass
+
+    def invalidate_user(self, user_id: int) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def size(self) -> Optional[int]:
+        return 0
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Thread-safe LRU with per-entry expiry and a maximum number of entries."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[int, str], Tuple[float, Any]]" = OrderedDict()
+        self._user_keys: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get((user_id, key))
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                self._delete((user_id, key))
+                return None
+            self._entries.move_to_end((user_id, key))
+            return value
+
+    def set(self, user_id: int, key: str, value: Any, ttl: int) -> None:
+        with self._lock:
+            self._entries[(user_id, key)] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end((user_id, key))
+            self._user_keys.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._delete(oldest)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            for key in list(self._user_keys.get(user_id, ())):
+                self._delete((user_id, key))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._user_keys.clear()
+
+    def size(self) -> Optional[int]:
+        return len(self._entries)
+
+    def _delete(self, entry_key: Tuple[int, str]) -> None:
+        self._entries.pop(entry_key, None)
+        user_id, key = entry_key
+        keys = self._user_keys.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._user_keys[user_id]
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Backend for a Redis-compatible server. Only needs `get`, `set(ex=...)`,
+    `scan_iter` and `delete` from the client, so local stand-ins work too.
+    """
+
+    # Keys deleted per DEL when clearing
+    CLEAR_BATCH_SIZE = 500
+
+    name = "redis"
+    blocking = True
+
+    def __init__(self, client: Any, prefix: str = "hf:stats"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisCacheBackend":
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("STATS_CACHE_BACKEND=redis requires the 'redis' package")
+        return cls(redis.Redis.from_url(url))
+
+    def _key(self, user_id: int, key: str) -> str:
+        return f"{self.prefix}:{user_id}:{key}"
+
+    def get(self, user_id: int, key: str) -> Optional[Any]:
+        raw = self.client.get(self._key(user_id, key))
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, user_id: int, key: str, value: Any, ttl: int) -> None:
+        self.client.set(self._key(user_id, key), json.dumps(value), ex=ttl)
+
+    def invalidate_user(self, user_id: int) -> None:
+        # The data version in the key already moved on; old entries expire
+        pass
+
+    def clear(self) -> None:
+        batch = []
+        for key in self.client.scan_iter(match=f"{self.prefix}:*", count=self.CLEAR_BATCH_SIZE):
+            batch.append(key)
+            if len(batch) == self.CLEAR_BATCH_SIZE:
+                self.client.delete(*batch)
+                batch = []
+        if batch:
+            self.client.delete(*batch)
+
+
+class StatsCache:
+    """Read-through cache of stats results with hit/miss counters."""
+
+    def __init__(self, backend: CacheBackend, ttl_seconds: int = 60):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def time_bucket(self) -> int:
+        """Current TTL-sized time slot; results are never reused across slots."""
+        if not self.enabled:
+            # No cache: one-second slots, so stats ETags still follow the moving window
+            return int(time.time())
+        return int(time.time() // self.ttl_seconds)
+
+    def _key(self, name: str, range_days: Optional[int], data_version: int) -> str:
+        return f"{name}:{range_days}:{self.time_bucket()}:{data_version}"
+
+    def get_or_compute(
+        self,
+        user_id: int,
+        name: str,
+        range_days: Optional[int],
+        data_version: int,
+        compute: Callable[[], Any],
+    ) -> Any:
+        """
+        Returns the cached result of `name` for the user at `data_version`,
+        computing it on a miss.
+        """
+        if not self.enabled:
+            return compute()
+        key = self._key(name, range_days, data_version)
+        value = self.backend.get(user_id, key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = compute()
+        self.backend.set(user_id, key, value, self.ttl_seconds)
+        return value
+
+    async def get_or_compute_async(
+        self,
+        user_id: int,
+        name: str,
+        range_days: Optional[int],
+        data_version: int,
+        compute: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        `get_or_compute` for an awaitable computation. Blocking backends
+        (Redis) are called from a worker thread, off the event loop.
+        """
+        if not self.enabled:
+            return await compute()
+        key = self._key(name, range_days, data_version)
+        value = await self._call_backend(self.backend.get, user_id, key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = await compute()
+        await self._call_backend(self.backend.set, user_id, key, value, self.ttl_seconds)
+        return value
+
+    async def _call_backend(self, method: Callable[..., Any], *args: Any) -> Any:
+        if self.backend.blocking:
+            return await to_thread.run_sync(method, *args)
+        return method(*args)
+
+    def invalidate_user(self, user_id: int) -> None:
+        self.backend.invalidate_user(user_id)
+
+    def clear(self) -> None:
+        self.backend.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend.name,
+            "ttl_seconds": self.ttl_seconds,
+            "entries": self.backend.size(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def build_stats_cache() -> StatsCache:
+    """Creates the stats cache configured in settings."""
+    if settings.STATS_CACHE_BACKEND == "memory":
+        backend: CacheBackend = InMemoryCacheBackend(max_entries=settings.STATS_CACHE_MAX_ENTRIES)
+    elif settings.STATS_CACHE_BACKEND == "redis":
+        backend = RedisCacheBackend.from_url(settings.REDIS_URL)
+    elif settings.STATS_CACHE_BACKEND == "none":
+        backend = NullCacheBackend()
+    else:
+        raise ValueError(
+            f"Unknown STATS_CACHE_BACKEND '{settings.STATS_CACHE_BACKEND}'. "
+            "Expected one of: memory, redis, none"
+        )
+    return StatsCache(backend, ttl_seconds=settings.STATS_CACHE_TTL_SECONDS)
+
+
+stats_cache = build_stats_cache()
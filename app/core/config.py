@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -9,10 +9,81 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "changethis_to_a_secure_random_string_in_production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Per-worker cache of verified tokens and authenticated users
+    # (app/core/auth_cache.py); 0 disables it
+    AUTH_CACHE_TTL_SECONDS: int = 30
+    AUTH_CACHE_MAX_ENTRIES: int = 4096
+    # Argon2 cost; existing hashes are upgraded on the next successful login
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536  # KiB
+    ARGON2_PARALLELISM: int = 4
+    # Password hashing pool (app/core/hashing.py): "thread" or "process";
+    # beyond WORKERS + QUEUE_SIZE pending hashes requests get 503 + Retry-After
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
     
     # Database
     DATABASE_URL: str = "sqlite:///./hyperfocus.db"
+    # Optional read replica: stats and GET listings read from it
+    READ_DATABASE_URL: Optional[str] = None
+    # Serve the stats endpoints from an async engine (needs aiosqlite or asyncpg)
+    DB_ASYNC: bool = False
+
+    # Engine tuning (app/core/engine_config.py); False keeps the driver defaults
+    DB_TUNING: bool = True
+    # SQLite: PRAGMAs applied on every connection
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE: int = -65536  # negative = KiB (64 MiB)
+    SQLITE_MMAP_SIZE: int = 268435456  # 256 MiB
+    # PostgreSQL: connection pool and per-statement timeout
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 30000
+
+    # Stats
+    # "python" (reference implementation), "sql" (aggregates in the database),
+    # "rollup" (precomputed hourly buckets, see app/core/rollups.py)
+    # or "numpy" (vectorized over columns, requires numpy)
+    STATS_BACKEND: str = "python"
+
+    # Stats cache: "memory" (per worker), "redis" (shared) or "none"
+    STATS_CACHE_BACKEND: str = "memory"
+    STATS_CACHE_TTL_SECONDS: int = 60
+    STATS_CACHE_MAX_ENTRIES: int = 2048
+    REDIS_URL: str = "redis://localhost:6379/0"
     
+    # Prometheus-style metrics at GET /metrics (app/core/metrics.py). Off by
+    # default; scrapers must send `Authorization: Bearer <METRICS_TOKEN>`
+    METRICS_ENABLED: bool = False
+    METRICS_TOKEN: str = ""
+    # Per-request profile in a Server-Timing header (app/core/profiling.py);
+    # requests slower than SLOW_REQUEST_MS are logged with their SQL (0: never)
+    REQUEST_PROFILING: bool = False
+    SLOW_REQUEST_MS: int = 1000
+    # Superuser sampling profiler: ?__profile=1 and /profiler/process (app/core/sampler.py)
+    SAMPLING_PROFILER_ENABLED: bool = True
+
+    # Logging (app/core/logging_config.py): a background thread writes the
+    # console and LOG_DIR/hyperfocus.log; records beyond LOG_QUEUE_SIZE are dropped
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "text"  # "text" or "json" (one object per line)
+    LOG_DIR: str = "logs"
+    LOG_QUEUE_SIZE: int = 10000
+    # "size" (LOG_MAX_BYTES) or "time" (LOG_ROTATE_WHEN, e.g. "midnight", "H")
+    LOG_ROTATION: str = "size"
+    LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    LOG_ROTATE_WHEN: str = "midnight"
+    LOG_BACKUP_COUNT: int = 5
+
+    # Maximum interruptions accepted by one POST /interruptions/bulk
+    INTERRUPTIONS_BULK_MAX_ITEMS: int = 1000
+
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = [
         "http://localhost",
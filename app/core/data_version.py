@@ -0,0 +1,30 @@
+"""
+Per-user data version: a counter bumped in the same transaction as every
+write to the user's sessions or interruptions. Conditional GETs compare it
+(through the ETag) instead of recomputing the response.
+"""
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.upsert import upsert_counters
+from app.models import UserDataVersion
+
+
+def bump_data_version(db: Session, user_id: int) -> None:
+    """
+    Increments the user's version with an atomic upsert (the first write of
+    a user creates the row). Call it before committing the write.
+    """
+    upsert_counters(db, UserDataVersion, [{"user_id": user_id, "version": 1}], keys=("user_id",), counters=("version",))
+
+
+def get_data_version(db: Session, user_id: int) -> int:
+    """Returns the user's current version (0 if nothing was written yet)."""
+    row = db.get(UserDataVersion, user_id)
+    return row.version if row else 0
+
+
+async def get_data_version_async(db: AsyncSession, user_id: int) -> int:
+    """`get_data_version` for the async stats router."""
+    row = await db.get(UserDataVersion, user_id)
+    return row.version if row else 0
@@ -1,12 +1,18 @@
-from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+import hmac
+from typing import AsyncGenerator, Generator, Optional
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from pydantic import ValidationError
-from sqlmodel import Session, select
+from sqlalchemy.orm import make_transient_to_detached
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.auth_cache import auth_cache
 from app.core.config import settings
+from app.core.data_version import get_data_version, get_data_version_async
 from app.core.security import create_access_token
-from app.db import get_session
+from app import db as database
+from app.db import get_async_session, get_session
 from app.models import User
 from app.schemas import TokenPayload
 
@@ -14,9 +20,10 @@ reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/login/access-token"
 )
 
-def get_current_user(
-    session: Session = Depends(get_session), token: str = Depends(reusable_oauth2)
-) -> User:
+def _token_subject(token: str) -> Optional[str]:
+    subject = auth_cache.get_token_subject(token)
+    if subject is not None:
+        return subject
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
@@ -27,13 +34,60 @@ def get_current_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = session.get(User, token_data.sub)
+    if token_data.sub is not None:
+        auth_cache.set_token_subject(token, token_data.sub, payload.get("exp"))
+    return token_data.sub
+
+def _user_id(token: str) -> Optional[int]:
+    subject = _token_subject(token)
+    return int(subject) if subject and subject.isdigit() else None
+
+def _cached_user(user_id: int) -> Optional[User]:
+    """
+    Detached copy of the cached user row, or None on a miss. Callers attach
+    it with `session.merge(user, load=False)`, which issues no query.
+    """
+    data = auth_cache.get_user(user_id)
+    if data is None:
+        return None
+    user = User(**data)
+    make_transient_to_detached(user)
+    return user
+
+def _remember(user: Optional[User]) -> Optional[User]:
+    if user is not None:
+        auth_cache.set_user(user)
+    return user
+
+def _check_user(user: Optional[User]) -> User:
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return user
 
+def get_current_user(
+    session: Session = Depends(get_session), token: str = Depends(reusable_oauth2)
+) -> User:
+    user_id = _user_id(token)
+    if user_id is None:
+        return _check_user(None)
+    cached = _cached_user(user_id)
+    if cached is not None:
+        return _check_user(session.merge(cached, load=False))
+    return _check_user(_remember(session.get(User, user_id)))
+
+async def get_current_user_async(
+    session: AsyncSession = Depends(get_async_session), token: str = Depends(reusable_oauth2)
+) -> User:
+    user_id = _user_id(token)
+    if user_id is None:
+        return _check_user(None)
+    cached = _cached_user(user_id)
+    if cached is not None:
+        return _check_user(await session.merge(cached, load=False))
+    return _check_user(_remember(await session.get(User, user_id)))
+
 def get_current_active_superuser(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -42,3 +96,57 @@ def get_current_active_superuser(
             status_code=400, detail="The user doesn't have enough privileges"
         )
     return current_user
+
+async def get_current_active_superuser_async(
+    current_user: User = Depends(get_current_user_async),
+) -> User:
+    return get_current_active_superuser(current_user)
+
+def require_metrics_token(authorization: Optional[str] = Header(default=None)) -> None:
+    """
+    Only scrapers that send `Authorization: Bearer <METRICS_TOKEN>` may read
+    /metrics; with no METRICS_TOKEN configured nobody can.
+    """
+    expected = f"Bearer {settings.METRICS_TOKEN}"
+    if not settings.METRICS_TOKEN or not hmac.compare_digest((authorization or "").encode(), expected.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+def get_read_session(
+    session: Session = Depends(get_session), token: str = Depends(reusable_oauth2)
+) -> Generator[Session, None, None]:
+    """
+    Session for read-only endpoints: the read replica when READ_DATABASE_URL
+    is set, otherwise the request's primary session.
+
+    Read-your-writes: if the replica has not yet replayed the user's last
+    write (its data version is behind the primary's), the primary is used.
+    """
+    if database.read_engine is None:
+        yield session
+        return
+    user_id = _user_id(token)
+    with Session(database.read_engine) as replica:
+        if user_id is not None and get_data_version(replica, user_id) < get_data_version(session, user_id):
+            yield session
+        else:
+            yield replica
+
+async def get_read_session_async(
+    session: AsyncSession = Depends(get_async_session), token: str = Depends(reusable_oauth2)
+) -> AsyncGenerator[AsyncSession, None]:
+    """`get_read_session` for the async stats router."""
+    if database.async_read_engine is None:
+        yield session
+        return
+    user_id = _user_id(token)
+    async with AsyncSession(database.async_read_engine, expire_on_commit=False) as replica:
+        if user_id is not None and (
+            await get_data_version_async(replica, user_id) < await get_data_version_async(session, user_id)
+        ):
+            yield session
+        else:
+            yield replica
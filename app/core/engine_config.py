@@ -0,0 +1,79 @@
+"""
+Engine tuning driven by Settings (DB_TUNING=false keeps the driver defaults).
+
+SQLite: WAL journal, `synchronous`, `mmap_size`, `cache_size` and
+`busy_timeout` are applied with PRAGMAs on every new connection, so readers
+no longer block the writer and concurrent writers wait for the lock
+instead of failing with "database is locked".
+
+PostgreSQL: pool size, overflow, recycle and pre-ping for the pool, and a
+server-side `statement_timeout` for every connection.
+"""
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+
+def _dialect(url: str) -> str:
+    return url.split("://", 1)[0].split("+", 1)[0]
+
+
+def _driver(url: str) -> str:
+    scheme = url.split("://", 1)[0]
+    return scheme.split("+", 1)[1] if "+" in scheme else ""
+
+
+def sqlite_pragmas() -> Dict[str, Any]:
+    """PRAGMAs run on every SQLite connection, in order."""
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+    }
+
+
+def engine_options(url: str) -> Dict[str, Any]:
+    """Keyword arguments for create_engine / create_async_engine for this URL."""
+    dialect = _dialect(url)
+    if dialect == "sqlite":
+        connect_args: Dict[str, Any] = {} if _driver(url) == "aiosqlite" else {"check_same_thread": False}
+        return {"connect_args": connect_args}
+
+    if not settings.DB_TUNING:
+        return {}
+
+    options: Dict[str, Any] = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if dialect == "postgresql" and settings.DB_STATEMENT_TIMEOUT_MS:
+        timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        if _driver(url) == "asyncpg":
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+
+def configure_engine(engine: Engine) -> Engine:
+    """Registers the per-connection setup of the engine's dialect (sync engines or `.sync_engine`)."""
+    if settings.DB_TUNING and engine.dialect.name == "sqlite":
+        pragmas = sqlite_pragmas()
+
+        @event.listens_for(engine, "connect")
+        def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for name, value in pragmas.items():
+                    cursor.execute(f"PRAGMA {name}={value}")
+            finally:
+                cursor.close()
+
+    return engine
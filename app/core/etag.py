@@ -0,0 +1,36 @@
+"""
+Weak ETags and `If-None-Match` handling for conditional GETs.
+"""
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+
+def weak_etag(*parts: object) -> str:
+    """Builds a weak ETag from the values that identify a response's content."""
+    digest = hashlib.sha1(":".join(str(p) for p in parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison of `etag` against the request's If-None-Match header."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def conditional_response(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Returns a 304 response if the client already has `etag`; otherwise sets the
+    ETag on `response` and returns None so the endpoint builds the body.
+    """
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
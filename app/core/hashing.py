@@ -0,0 +1,122 @@
+"""
+Dedicated executor for password hashing (Argon2).
+
+Argon2 is deliberately slow and memory hungry. Running it in the request
+handlers used the shared Starlette threadpool, so a burst of logins starved
+every other sync endpoint. Hashes now run on their own pool
+(PASSWORD_HASH_EXECUTOR: "thread" or "process", PASSWORD_HASH_WORKERS
+workers) and the handlers await them without holding a threadpool thread.
+
+Admission control: at most PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_SIZE
+hashes are running or queued. Beyond that, `run_hashing` fails fast with
+503 and `Retry-After` instead of letting the backlog grow.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.metrics import HASHING_DURATION, HASHING_WAIT, metrics
+
+
+class HashingBusy(Exception):
+    """Raised when the hashing queue is full."""
+
+
+def _timed(fn: Callable[..., Any], *args: Any) -> Tuple[Any, float]:
+    """Runs on the worker (thread or process): fn's result and its run time."""
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+class HashingPool:
+    def __init__(self, kind: str, workers: int, queue_size: int):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown PASSWORD_HASH_EXECUTOR: {kind!r}")
+        self.kind = kind
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="hashing")
+            return self._executor
+
+    def _release(self, completed: bool) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += completed
+        self._slots.release()
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Queues fn(*args) or raises HashingBusy if the queue is full."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HashingBusy()
+        with self._lock:
+            self.in_flight += 1
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._release(completed=False)
+            raise
+        future.add_done_callback(lambda _: self._release(completed=True))
+        return future
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        queued = time.perf_counter()
+        result, seconds = await asyncio.wrap_future(self.submit(_timed, fn, *args))
+        metrics.observe(HASHING_DURATION, (), seconds)
+        metrics.observe(HASHING_WAIT, (), max(time.perf_counter() - queued - seconds, 0.0))
+        return result
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "executor": self.kind,
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+hashing_pool = HashingPool(
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+)
+
+
+async def run_hashing(fn: Callable[..., Any], *args: Any) -> Any:
+    """Runs fn(*args) on the hashing pool; 503 + Retry-After when it is saturated."""
+    try:
+        return await hashing_pool.run(fn, *args)
+    except HashingBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many password operations in progress, try again shortly",
+            headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+        )
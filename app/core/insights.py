@@ -0,0 +1,262 @@
+"""
+Insight engine behind /stats/insights.
+
+Sessions and interruptions of the widest window the analyzers need (30 days)
+are fetched once; narrower windows (7d, 14d) are sliced from those rows in
+memory. Each rule is an analyzer registered with `@analyzer(name)` and is
+timed individually.
+"""
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlmodel import Session
+
+from app.core.stats_logic import (
+    InterruptionRow,
+    SessionRow,
+    _ensure_utc,
+    _get_interruptions_in_range,
+    _get_range_dates,
+    _get_sessions_in_range,
+    _interruption_types_from_rows,
+    _productive_hours_from_rows,
+    _weekly_pattern_from_rows,
+)
+
+logger = logging.getLogger(__name__)
+
+# Widest window any analyzer looks at
+INSIGHTS_WINDOW_DAYS = 30
+
+FALLBACK_INSIGHT = {
+    "type": "info",
+    "title": "Gathering Data 📊",
+    "description": "Keep tracking your sessions! I need a bit more data to generate personalized insights.",
+    "score": 50
+}
+
+
+class InsightContext:
+    """
+    Rows of the insights window plus memoized stats over sub-windows of it.
+    """
+
+    def __init__(
+        self,
+        user_id: int,
+        sessions: List[SessionRow],
+        interruptions: List[InterruptionRow],
+        since: datetime,
+        now: datetime,
+    ):
+        self.user_id = user_id
+        self.sessions = sessions
+        self.interruptions = interruptions
+        self.since = since
+        self.now = now
+        self._stats: Dict[Tuple[str, int], Dict] = {}
+
+    @classmethod
+    def load(cls, user_id: int, db: Session, window_days: int = INSIGHTS_WINDOW_DAYS) -> "InsightContext":
+        since, now = _get_range_dates(window_days)
+        return cls(
+            user_id,
+            sessions=_get_sessions_in_range(user_id, db, since, now),
+            interruptions=_get_interruptions_in_range(user_id, db, since),
+            since=since,
+            now=now,
+        )
+
+    def window(self, range_days: int) -> Tuple[List[SessionRow], List[InterruptionRow], datetime]:
+        """Sessions and interruptions that started within the last `range_days` days."""
+        since = self.now - timedelta(days=range_days)
+        if since < self.since:
+            raise ValueError(
+                f"Window of {range_days} days exceeds the loaded {INSIGHTS_WINDOW_DAYS}-day window"
+            )
+        sessions = [s for s in self.sessions if _ensure_utc(s.start_time) >= since]
+        interruptions = [it for it in self.interruptions if _ensure_utc(it.start_time) >= since]
+        return sessions, interruptions, since
+
+    def _memoized(self, name: str, range_days: int, compute: Callable[[], Dict]) -> Dict:
+        key = (name, range_days)
+        if key not in self._stats:
+            self._stats[key] = compute()
+        return self._stats[key]
+
+    def productive_hours(self, range_days: int) -> Dict:
+        def compute():
+            sessions, interruptions, since = self.window(range_days)
+            return _productive_hours_from_rows(
+                self.user_id, range_days, sessions, interruptions, since, self.now
+            )
+        return self._memoized("productive_hours", range_days, compute)
+
+    def interruption_types(self, range_days: int) -> Dict:
+        def compute():
+            _, interruptions, _ = self.window(range_days)
+            return _interruption_types_from_rows(self.user_id, range_days, interruptions)
+        return self._memoized("interruption_types", range_days, compute)
+
+    def weekly_pattern(self, range_days: int) -> Dict:
+        def compute():
+            sessions, interruptions, since = self.window(range_days)
+            return _weekly_pattern_from_rows(
+                self.user_id, range_days, sessions, interruptions, since, self.now
+            )
+        return self._memoized("weekly_pattern", range_days, compute)
+
+
+Analyzer = Callable[[InsightContext], Optional[Dict]]
+
+# Registered analyzers, run in registration order
+ANALYZERS: List[Tuple[str, Analyzer]] = []
+
+
+def analyzer(name: str) -> Callable[[Analyzer], Analyzer]:
+    """Registers a function that returns one insight dict (or None) for a context."""
+    def decorator(fn: Analyzer) -> Analyzer:
+        ANALYZERS.append((name, fn))
+        return fn
+    return decorator
+
+
+@dataclass
+class InsightReport:
+    insights: List[Dict]
+    # Milliseconds spent in each step ("load" plus one entry per analyzer)
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+def run_insights(
+    user_id: int,
+    db: Session,
+    analyzers: Optional[List[Tuple[str, Analyzer]]] = None,
+) -> InsightReport:
+    """Loads the insights window once and runs every analyzer over it."""
+    start = time.perf_counter()
+    context = InsightContext.load(user_id, db)
+    return analyze(context, analyzers, load_ms=(time.perf_counter() - start) * 1000)
+
+
+def analyze(
+    context: InsightContext,
+    analyzers: Optional[List[Tuple[str, Analyzer]]] = None,
+    load_ms: float = 0.0,
+) -> InsightReport:
+    """Runs the analyzers over an already loaded context (no database access)."""
+    timings: Dict[str, float] = {"load": load_ms}
+
+    insights: List[Dict] = []
+    for name, fn in ANALYZERS if analyzers is None else analyzers:
+        start = time.perf_counter()
+        insight = fn(context)
+        timings[name] = (time.perf_counter() - start) * 1000
+        if insight:
+            insights.append(insight)
+
+    # Fallback if no data
+    if not insights:
+        insights.append(dict(FALLBACK_INSIGHT))
+
+    logger.debug(
+        "Insights for user %s: %s",
+        context.user_id,
+        ", ".join(f"{name}={ms:.2f}ms" for name, ms in timings.items()),
+    )
+    return InsightReport(insights=insights, timings=timings)
+
+
+# ============================================================
+# Analyzers
+# ============================================================
+
+@analyzer("peak_hours")
+def _peak_hours(context: InsightContext) -> Optional[Dict]:
+    """Analyze Peak Hours (Productivity)"""
+    hours = context.productive_hours(30)["hours"]
+
+    # Find top 3 hours by work volume
+    sorted_hours = sorted(hours, key=lambda x: x["work_seconds"], reverse=True)
+    top_hours = sorted_hours[:3]
+
+    if not top_hours or top_hours[0]["work_seconds"] <= 3600: # At least 1 hour of data
+        return None
+
+    best_hour = top_hours[0]["hour"]
+
+    if 5 <= best_hour < 12:
+        return {
+            "type": "productivity",
+            "title": "Morning Person 🌅",
+            "description": f"You are most productive around {best_hour}:00. Try to schedule your hardest tasks then!",
+            "score": 90
+        }
+    elif 12 <= best_hour < 18:
+        return {
+            "type": "productivity",
+            "title": "Afternoon Warrior ☀️",
+            "description": f"Your focus peaks around {best_hour}:00. Perfect time for deep work.",
+            "score": 90
+        }
+    return {
+        "type": "productivity",
+        "title": "Night Owl 🦉",
+        "description": f"You find your flow late at night around {best_hour}:00. Embrace the quiet!",
+        "score": 90
+    }
+
+
+@analyzer("distractions")
+def _distractions(context: InsightContext) -> Optional[Dict]:
+    """Analyze Distractions"""
+    counts = context.interruption_types(7)["counts"]
+    if not counts:
+        return None
+
+    top_distractor = max(counts, key=counts.get)
+    count = counts[top_distractor]
+
+    if count <= 5:
+        return None
+    return {
+        "type": "warning",
+        "title": f"Distraction Alert: {top_distractor} ⚠️",
+        "description": f"'{top_distractor}' interrupted you {count} times this week. Consider blocking it.",
+        "score": 70
+    }
+
+
+@analyzer("power_day")
+def _power_day(context: InsightContext) -> Optional[Dict]:
+    """Weekly Consistency: most productive day"""
+    days = context.weekly_pattern(14)["days"]
+
+    best_day = max(days, key=lambda x: x["work_seconds"])
+    if best_day["work_seconds"] <= 7200: # > 2 hours
+        return None
+    return {
+        "type": "success",
+        "title": f"{best_day['day']} is your Power Day ⚡",
+        "description": "You consistently crush it on this day. Keep the momentum going!",
+        "score": 85
+    }
+
+
+@analyzer("weekend_warrior")
+def _weekend_warrior(context: InsightContext) -> Optional[Dict]:
+    """Weekend Warrior Check"""
+    days = context.weekly_pattern(14)["days"]
+
+    weekend_work = sum(d["work_seconds"] for d in days if d["weekday_index"] >= 5)
+    if weekend_work <= 10800: # > 3 hours on weekends
+        return None
+    return {
+        "type": "info",
+        "title": "Weekend Warrior 🛡️",
+        "description": "You put in significant time on weekends. Don't forget to rest!",
+        "score": 60
+    }
@@ -1,30 +1,183 @@
+"""
+Logging pipeline: records are queued and written by a background thread.
+
+The root logger and `uvicorn.access` only get a `DroppingQueueHandler`,
+which puts the record on a bounded queue and returns; a `QueueListener`
+thread formats it and does the console and file I/O. A slow disk or a
+blocked stdout therefore no longer stalls the request (or, for the access
+log, the whole event loop) that logged.
+
+- Bounded: at LOG_QUEUE_SIZE queued records new ones are dropped, not
+  waited for. Drops are counted (`hyperfocus_log_records_dropped_total`)
+  and reported by the listener once the queue drains.
+- Rotation: the file rolls over by size (LOG_MAX_BYTES) or by time
+  (LOG_ROTATE_WHEN), keeping LOG_BACKUP_COUNT old files.
+- LOG_FORMAT=json writes one JSON object per line.
+
+`setup_logging()` is idempotent: calling it again (the lifespan runs on
+every app start) replaces the pipeline instead of stacking handlers.
+`shutdown_logging()` flushes the queue, stops the thread and gives
+`uvicorn.access` back its previous handlers and propagation.
+"""
+import json
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import LOG_DROPPED, metrics
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+LOG_FILE = "hyperfocus.log"
+
+# Attributes every LogRecord has; anything else came in through `extra=`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with the `extra=` fields at the top level."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key not in entry:
+                entry[key] = value
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops (and counts) records when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        # Incremented in emit, which logging runs under the handler lock
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting is the listener's job: only freeze what may change or
+        # cannot outlive the call (the arguments, the traceback)
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            metrics.add(LOG_DROPPED)
+
+
+class _DropReportingListener(logging.handlers.QueueListener):
+    """Writes a warning with the number of dropped records once there is room again."""
+
+    def __init__(self, log_queue: queue.Queue, producer: DroppingQueueHandler, *handlers: logging.Handler):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.producer = producer
+        self.reported = 0
+
+    def enqueue_sentinel(self) -> None:
+        # The queue may be full: wait for room rather than failing to stop
+        self.queue.put(self._sentinel)
+
+    def handle(self, record: logging.LogRecord) -> None:
+        dropped = self.producer.dropped
+        if dropped > self.reported:
+            super().handle(logging.makeLogRecord({
+                "name": __name__,
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": f"Log queue full: {dropped - self.reported} records dropped",
+            }))
+            self.reported = dropped
+        super().handle(record)
+
+
+_lock = threading.Lock()
+_handler: Optional[DroppingQueueHandler] = None
+_listener: Optional[_DropReportingListener] = None
+# `uvicorn.access` handlers and propagate from before setup_logging()
+_access_state: Optional[Tuple[List[logging.Handler], bool]] = None
+
+
+def _file_handler(log_dir: Path) -> logging.Handler:
+    path = log_dir / LOG_FILE
+    if settings.LOG_ROTATION == "time":
+        return logging.handlers.TimedRotatingFileHandler(
+            path, when=settings.LOG_ROTATE_WHEN, backupCount=settings.LOG_BACKUP_COUNT, encoding="utf-8"
+        )
+    if settings.LOG_ROTATION == "size":
+        return logging.handlers.RotatingFileHandler(
+            path, maxBytes=settings.LOG_MAX_BYTES, backupCount=settings.LOG_BACKUP_COUNT, encoding="utf-8"
+        )
+    raise ValueError(f"Unknown LOG_ROTATION '{settings.LOG_ROTATION}' (use 'size' or 'time')")
+
+
+def _output_handlers() -> List[logging.Handler]:
+    formatter = JsonFormatter() if settings.LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT)
+    log_dir = Path(settings.LOG_DIR)
+    log_dir.mkdir(parents=True, exist_ok=True)
+    handlers = [logging.StreamHandler(sys.stdout), _file_handler(log_dir)]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def setup_logging() -> DroppingQueueHandler:
+    """Installs (or reinstalls) the queued pipeline on the root and access loggers."""
+    global _handler, _listener, _access_state
+    with _lock:
+        _shutdown()
+        log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+        _handler = DroppingQueueHandler(log_queue)
+        _listener = _DropReportingListener(log_queue, _handler, *_output_handlers())
+        _listener.start()
+
+        root = logging.getLogger()
+        root.setLevel(settings.LOG_LEVEL)
+        root.addHandler(_handler)
+        # Uvicorn access log, kept from propagating to the root: once is enough
+        access = logging.getLogger("uvicorn.access")
+        _access_state = (list(access.handlers), access.propagate)
+        access.handlers = [_handler]
+        access.propagate = False
+        return _handler
+
+
+def _shutdown() -> None:
+    global _handler, _listener, _access_state
+    if _listener is None:
+        return
+    logging.getLogger().removeHandler(_handler)
+    # The access logger goes back to how setup_logging() found it
+    access = logging.getLogger("uvicorn.access")
+    access.handlers, access.propagate = _access_state
+    # Writes what is still queued, then closes the files
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _handler = _listener = _access_state = None
+
 
-def setup_logging():
-    # Create logs directory if it doesn't exist
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
-    
-    # Define formatter
-    formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
-    
-    # File Handler
-    file_handler = logging.FileHandler(log_dir / "hyperfocus.log")
-    file_handler.setFormatter(formatter)
-    
-    # Stream Handler (Console)
-    stream_handler = logging.StreamHandler(sys.stdout)
-    stream_handler.setFormatter(formatter)
-    
-    # Root Logger
-    logger = logging.getLogger()
-    logger.setLevel(logging.INFO)
-    logger.addHandler(file_handler)
-    logger.addHandler(stream_handler)
-    
-    # Uvicorn access log
-    logging.getLogger("uvicorn.access").handlers = [stream_handler, file_handler]
+def shutdown_logging() -> None:
+    """Flushes the queued records and stops the writer thread."""
+    with _lock:
+        _shutdown()
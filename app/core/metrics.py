@@ -0,0 +1,297 @@
+"""
+Prometheus-style metrics, served in the text exposition format at GET /metrics.
+
+Recording is lock-free on the hot path: every thread writes to its own
+shard (plain dicts only that thread touches) and a scrape sums the shards.
+What is recorded:
+
+- HTTP: requests and latency histogram per method and route template,
+  requests in flight per method (`MetricsMiddleware`).
+- Database: queries and query time per route, from the SQLAlchemy cursor
+  events of every engine (`instrument_engines`).
+- Connection pools: size, checked out and overflow, read at scrape time
+  (`track_pool`).
+- Password hashing: Argon2 run time and queue wait (app/core/hashing.py).
+- Logging: records dropped because the log queue was full
+  (app/core/logging_config.py).
+
+With METRICS_ENABLED=False the middleware, the engine events and the
+endpoint are not installed.
+"""
+import bisect
+import threading
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+Labels = Tuple[str, ...]
+
+# Seconds; request latency and Argon2 times
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+HASHING_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _Metric:
+    __slots__ = ("name", "kind", "help", "labelnames", "buckets")
+
+    def __init__(self, name: str, kind: str, help: str, labelnames: Labels, buckets: Optional[Tuple[float, ...]]):
+        self.name = name
+        self.kind = kind
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+
+
+class _Shard:
+    """The values written by one thread."""
+
+    __slots__ = ("values", "histograms")
+
+    def __init__(self):
+        self.values: Dict[Tuple[str, Labels], float] = {}
+        # bucket counts (the last one is +Inf) followed by the sum
+        self.histograms: Dict[Tuple[str, Labels], List[float]] = {}
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Tuple[str, Labels, float]]]] = []
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._lock = threading.Lock()
+
+    def _register(self, name, kind, help, labelnames, buckets=None) -> str:
+        self._metrics[name] = _Metric(name, kind, help, tuple(labelnames), buckets)
+        return name
+
+    def counter(self, name: str, help: str, labelnames: Iterable[str] = ()) -> str:
+        return self._register(name, "counter", help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Iterable[str] = ()) -> str:
+        return self._register(name, "gauge", help, labelnames)
+
+    def histogram(
+        self, name: str, help: str, labelnames: Iterable[str] = (), buckets: Tuple[float, ...] = LATENCY_BUCKETS
+    ) -> str:
+        return self._register(name, "histogram", help, labelnames, tuple(sorted(buckets)))
+
+    def add_collector(self, collector: Callable[[], Iterable[Tuple[str, Labels, float]]]) -> None:
+        """`collector()` yields (gauge name, labels, value) at every scrape."""
+        self._collectors.append(collector)
+
+    def _shard(self) -> _Shard:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    def add(self, name: str, labels: Labels = (), value: float = 1) -> None:
+        """Increments a counter (or moves a gauge by `value`)."""
+        values = self._shard().values
+        key = (name, labels)
+        values[key] = values.get(key, 0) + value
+
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        histograms = self._shard().histograms
+        key = (name, labels)
+        state = histograms.get(key)
+        buckets = self._metrics[name].buckets
+        if state is None:
+            state = histograms[key] = [0] * (len(buckets) + 1) + [0.0]
+        state[bisect.bisect_left(buckets, value)] += 1
+        state[-1] += value
+
+    def clear(self) -> None:
+        with self._lock:
+            for shard in self._shards:
+                shard.values.clear()
+                shard.histograms.clear()
+
+    def collect(self) -> Tuple[Dict[Tuple[str, Labels], float], Dict[Tuple[str, Labels], List[float]]]:
+        """The values and histograms summed over every shard."""
+        with self._lock:
+            shards = list(self._shards)
+        values: Dict[Tuple[str, Labels], float] = {}
+        histograms: Dict[Tuple[str, Labels], List[float]] = {}
+        for shard in shards:
+            # dict.copy() runs under the GIL: the owner thread may keep writing
+            for key, value in shard.values.copy().items():
+                values[key] = values.get(key, 0) + value
+            for key, state in shard.histograms.copy().items():
+                total = histograms.setdefault(key, [0] * len(state))
+                for i, count in enumerate(list(state)):
+                    total[i] += count
+        for collector in self._collectors:
+            for name, labels, value in collector():
+                values[(name, labels)] = value
+        return values, histograms
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text format."""
+        values, histograms = self.collect()
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            if metric.kind == "histogram":
+                for (name, labels), state in sorted(histograms.items()):
+                    if name == metric.name:
+                        lines.extend(_histogram_lines(metric, labels, state))
+            else:
+                for (name, labels), value in sorted(values.items()):
+                    if name == metric.name:
+                        lines.append(f"{name}{_labels(metric.labelnames, labels)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Labels, values: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _histogram_lines(metric: _Metric, labels: Labels, state: List[float]) -> Iterable[str]:
+    cumulative = 0
+    for bound, count in zip([*metric.buckets, "+Inf"], state[:-1]):
+        cumulative += count
+        le = 'le="{}"'.format(bound if bound == "+Inf" else _number(bound))
+        yield f"{metric.name}_bucket{_labels(metric.labelnames, labels, le)} {_number(cumulative)}"
+    yield f"{metric.name}_sum{_labels(metric.labelnames, labels)} {_number(state[-1])}"
+    yield f"{metric.name}_count{_labels(metric.labelnames, labels)} {_number(cumulative)}"
+
+
+metrics = MetricsRegistry()
+
+HTTP_REQUESTS = metrics.counter(
+    "hyperfocus_http_requests_total", "HTTP requests served.", ("method", "route", "status")
+)
+HTTP_DURATION = metrics.histogram(
+    "hyperfocus_http_request_duration_seconds", "HTTP request latency.", ("method", "route")
+)
+HTTP_IN_FLIGHT = metrics.gauge("hyperfocus_http_requests_in_flight", "HTTP requests being served.", ("method",))
+DB_QUERIES = metrics.counter("hyperfocus_db_queries_total", "SQL statements executed per route.", ("route",))
+DB_SECONDS = metrics.counter(
+    "hyperfocus_db_query_seconds_total", "Time spent executing SQL statements per route.", ("route",)
+)
+DB_POOL_SIZE = metrics.gauge("hyperfocus_db_pool_size", "Connection pool size.", ("engine",))
+DB_POOL_CHECKED_OUT = metrics.gauge(
+    "hyperfocus_db_pool_checked_out", "Connections checked out of the pool.", ("engine",)
+)
+DB_POOL_OVERFLOW = metrics.gauge(
+    "hyperfocus_db_pool_overflow", "Connections open beyond the pool size.", ("engine",)
+)
+HASHING_DURATION = metrics.histogram(
+    "hyperfocus_password_hash_duration_seconds", "Argon2 hash/verify run time.", buckets=HASHING_BUCKETS
+)
+HASHING_WAIT = metrics.histogram(
+    "hyperfocus_password_hash_wait_seconds", "Time waiting for a hashing worker.", buckets=HASHING_BUCKETS
+)
+LOG_DROPPED = metrics.counter("hyperfocus_log_records_dropped_total", "Log records dropped by a full log queue.")
+
+# SQL time of the request being served; None outside requests
+_request_db: ContextVar[Optional[List[float]]] = ContextVar("request_db", default=None)
+
+# Route label of requests that matched no route (keeps the label set bounded)
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording the HTTP and per-route database metrics."""
+
+    def __init__(self, app: Any, registry: MetricsRegistry = metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        registry = self.registry
+        method = scope["method"]
+        status_code = 500
+        db = [0, 0.0]
+        token = _request_db.set(db)
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        registry.add(HTTP_IN_FLIGHT, (method,), 1)
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = perf_counter() - start
+            _request_db.reset(token)
+            registry.add(HTTP_IN_FLIGHT, (method,), -1)
+            # Set by the router: the path template, e.g. /api/v1/sessions/{session_id}
+            route = scope.get("route")
+            path = getattr(route, "path", UNMATCHED_ROUTE)
+            registry.add(HTTP_REQUESTS, (method, path, str(status_code)))
+            registry.observe(HTTP_DURATION, (method, path), elapsed)
+            if db[0]:
+                registry.add(DB_QUERIES, (path,), db[0])
+                registry.add(DB_SECONDS, (path,), db[1])
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _request_db.get() is not None:
+        context._metrics_start = perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_metrics_start", None)
+    if start is not None:
+        db = _request_db.get()
+        if db is not None:
+            db[0] += 1
+            db[1] += perf_counter() - start
+
+
+def instrument_engines() -> None:
+    """Times the SQL of every engine (sync and async) per request."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def uninstrument_engines() -> None:
+    if event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.remove(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.remove(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def track_pool(name: str, engine: Any, registry: MetricsRegistry = metrics) -> None:
+    """Reports the connection pool of `engine` (sync or async) as `engine=name`."""
+    pool = getattr(engine, "sync_engine", engine).pool
+    if not hasattr(pool, "checkedout"):
+        # StaticPool / NullPool: nothing to report
+        return
+
+    def collect():
+        yield DB_POOL_SIZE, (name,), pool.size()
+        yield DB_POOL_CHECKED_OUT, (name,), pool.checkedout()
+        yield DB_POOL_OVERFLOW, (name,), max(pool.overflow(), 0)
+
+    registry.add_collector(collect)
@@ -0,0 +1,128 @@
+"""
+Keyset (cursor) pagination and field projection for the list endpoints.
+
+A page is ordered by a unique key, e.g. (start_time desc, id desc), and the
+next one starts strictly after the last row of the previous page. Unlike
+OFFSET its cost does not grow with the page number, and rows inserted
+meanwhile do not shift it. The cursor is that last key encoded as an opaque
+string, sent back in the `X-Next-Cursor` header (and `Link: rel="next"`)
+so the response bodies stay plain lists.
+
+`fields=a,b` limits the response (and the SELECT) to those columns.
+"""
+import base64
+import json
+import operator
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import and_, or_
+from sqlmodel import Session
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+LIMIT_QUERY = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size")
+CURSOR_QUERY = Query(None, description="`X-Next-Cursor` of the previous page")
+FIELDS_QUERY = Query(None, description="Comma-separated fields to return, e.g. 'id,start_time'")
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key: Sequence[Any]) -> List[Any]:
+    """Decodes a cursor made by `encode_cursor` for the same key columns."""
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(raw, list) or len(raw) != len(key):
+            raise ValueError(cursor)
+        return [
+            datetime.fromisoformat(value) if column.type.python_type is datetime else column.type.python_type(value)
+            for column, value in zip(key, raw)
+        ]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _after(key: Sequence[Any], values: Sequence[Any], descending: bool):
+    """
+    Rows strictly after `values` in the key order, spelled out
+    (a < x OR (a = x AND b < y)) plus a bound on the leading column, so an
+    index on it is used as a range.
+    """
+    beyond = operator.lt if descending else operator.gt
+    within = operator.le if descending else operator.ge
+    clauses = [
+        and_(*(key[j] == values[j] for j in range(i)), beyond(key[i], values[i]))
+        for i in range(len(key))
+    ]
+    return and_(within(key[0], values[0]), or_(*clauses))
+
+
+def keyset_page(
+    db: Session,
+    query,
+    key: Sequence[Any],
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Runs `query` ordered by the `key` columns (the last one must be unique)
+    from `cursor` on. Returns the rows of the page and the next cursor
+    (None on the last page). The query must select the key columns.
+    """
+    if cursor:
+        query = query.where(_after(key, decode_cursor(cursor, key), descending))
+    query = query.order_by(*(column.desc() if descending else column.asc() for column in key))
+    rows = db.exec(query.limit(limit + 1)).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor([getattr(rows[-1], column.key) for column in key])
+
+
+def as_utc(value: datetime) -> datetime:
+    """Date filters are compared with UTC-stored times; naive values are UTC."""
+    return value.astimezone(timezone.utc) if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel]) -> Optional[List[str]]:
+    """The requested field names (validated against `schema`), or None for all."""
+    if not fields:
+        return None
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in schema.model_fields]
+    if unknown or not names:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}" if unknown else "No fields requested",
+        )
+    return names
+
+
+def select_columns(model: Any, fields: List[str], key: Sequence[Any]) -> List[Any]:
+    """The columns to SELECT for a projection: the fields plus the key."""
+    names = list(dict.fromkeys([*fields, *(column.key for column in key)]))
+    return [getattr(model, name) for name in names]
+
+
+def set_next_cursor(request: Request, response: Response, next_cursor: Optional[str]) -> None:
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+        response.headers["Link"] = f'<{request.url.include_query_params(cursor=next_cursor)}>; rel="next"'
+
+
+def projected_response(response: Response, rows: Sequence[Any], fields: List[str]) -> JSONResponse:
+    """
+    The rows reduced to `fields`, bypassing the endpoint's response_model
+    (which requires every field). Keeps the headers already set on `response`.
+    """
+    content = jsonable_encoder([{name: getattr(row, name) for name in fields} for row in rows])
+    return JSONResponse(content, headers=dict(response.headers))
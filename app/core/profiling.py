@@ -0,0 +1,207 @@
+"""
+Per-request profile sent as a `Server-Timing` header (REQUEST_PROFILING).
+
+For each request:
+
+- db: SQL statements executed and their time (SQLAlchemy cursor events)
+- fetch: rows fetched and ORM objects hydrated, and the time it took. The
+  Session's SELECT results are buffered right away to measure it (SQLite
+  does most of a query's work while rows are fetched, after `execute`
+  returns); `yield_per` / streamed queries are left alone
+- handler: time inside the endpoint function (`ProfiledRoute`); `app` is
+  the handler minus db and fetch, i.e. the endpoint's own Python
+- total: up to the response start; total minus handler is the dependencies
+  (authentication, sessions) plus the response serialization
+
+Requests slower than SLOW_REQUEST_MS are logged with their statements.
+Disabled (the default), nothing is installed: routes behave as plain
+APIRoutes and no event listener is registered.
+"""
+import asyncio
+import functools
+import logging
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Callable, List, Optional, Tuple
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Mapper, ORMExecuteState, Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Statements kept per request for the slow-request log
+MAX_LOGGED_STATEMENTS = 100
+
+
+class RequestProfile:
+    __slots__ = ("queries", "sql_seconds", "fetch_seconds", "rows", "objects", "handler_seconds", "statements")
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.fetch_seconds = 0.0
+        self.rows = 0
+        self.objects = 0
+        self.handler_seconds = 0.0
+        # (milliseconds, SQL) of the first MAX_LOGGED_STATEMENTS statements
+        self.statements: List[Tuple[float, str]] = []
+
+    def server_timing(self, total_seconds: float) -> str:
+        db_ms = self.sql_seconds * 1000
+        fetch_ms = self.fetch_seconds * 1000
+        handler_ms = self.handler_seconds * 1000
+        return ", ".join([
+            f'db;dur={db_ms:.2f};desc="{self.queries} queries"',
+            f'fetch;dur={fetch_ms:.2f};desc="{self.rows} rows, {self.objects} objects"',
+            f"handler;dur={handler_ms:.2f}",
+            f"app;dur={max(handler_ms - db_ms - fetch_ms, 0):.2f}",
+            f"total;dur={total_seconds * 1000:.2f}",
+        ])
+
+
+_profile: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _profile.get() is not None:
+        context._profile_start = perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_profile_start", None)
+    profile = _profile.get()
+    if start is None or profile is None:
+        return
+    elapsed = perf_counter() - start
+    profile.queries += 1
+    profile.sql_seconds += elapsed
+    if len(profile.statements) < MAX_LOGGED_STATEMENTS:
+        profile.statements.append((elapsed * 1000, statement))
+
+
+def _on_load(target, context):
+    profile = _profile.get()
+    if profile is not None:
+        profile.objects += 1
+
+
+def _on_orm_execute(state: ORMExecuteState):
+    profile = _profile.get()
+    options = state.execution_options
+    if profile is None or not state.is_select or options.get("yield_per") or options.get("stream_results"):
+        return None
+    sql_before = profile.sql_seconds
+    start = perf_counter()
+    frozen = state.invoke_statement().freeze()
+    profile.fetch_seconds += perf_counter() - start - (profile.sql_seconds - sql_before)
+    profile.rows += len(frozen.data)
+    return frozen()
+
+
+def install_profiling() -> None:
+    """Registers the SQL and ORM hooks on every engine and mapper (idempotent)."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Mapper, "load", _on_load)
+        event.listen(Session, "do_orm_execute", _on_orm_execute)
+
+
+def uninstall_profiling() -> None:
+    if event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.remove(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.remove(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.remove(Mapper, "load", _on_load)
+        event.remove(Session, "do_orm_execute", _on_orm_execute)
+
+
+def _timed(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """The endpoint, adding its run time to the request profile."""
+    if asyncio.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def timed_endpoint(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                profile = _profile.get()
+                if profile is not None:
+                    profile.handler_seconds += perf_counter() - start
+
+        timed_endpoint._profiled = True
+        return timed_endpoint
+
+    @functools.wraps(endpoint)
+    def timed_endpoint(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            profile = _profile.get()
+            if profile is not None:
+                profile.handler_seconds += perf_counter() - start
+
+    timed_endpoint._profiled = True
+    return timed_endpoint
+
+
+class ProfiledRoute(APIRoute):
+    """APIRoute timing its endpoint when REQUEST_PROFILING is on."""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        # include_router builds the route again from the already timed endpoint
+        if settings.REQUEST_PROFILING and not getattr(endpoint, "_profiled", False):
+            endpoint = _timed(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+class ProfilingMiddleware:
+    """ASGI middleware adding `Server-Timing` and logging the slow requests."""
+
+    def __init__(self, app: Any, slow_request_ms: Optional[int] = None):
+        self.app = app
+        self.slow_request_ms = settings.SLOW_REQUEST_MS if slow_request_ms is None else slow_request_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _profile.set(profile)
+        start = perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", profile.server_timing(perf_counter() - start).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _profile.reset(token)
+            elapsed_ms = (perf_counter() - start) * 1000
+            if self.slow_request_ms and elapsed_ms >= self.slow_request_ms:
+                _log_slow_request(scope, profile, elapsed_ms)
+
+
+def _log_slow_request(scope, profile: RequestProfile, elapsed_ms: float) -> None:
+    query = scope.get("query_string", b"").decode("latin-1")
+    path = scope["path"] + (f"?{query}" if query else "")
+    lines = [
+        f"Slow request {scope['method']} {path}: {elapsed_ms:.0f} ms "
+        f"(db {profile.sql_seconds * 1000:.0f} ms in {profile.queries} queries, "
+        f"fetch {profile.fetch_seconds * 1000:.0f} ms for {profile.rows} rows, "
+        f"handler {profile.handler_seconds * 1000:.0f} ms)"
+    ]
+    lines.extend(f"  {ms:8.2f} ms  {' '.join(sql.split())}" for ms, sql in profile.statements)
+    if profile.queries > len(profile.statements):
+        lines.append(f"  ... {profile.queries - len(profile.statements)} more statements")
+    logger.warning("\n".join(lines))
@@ -0,0 +1,241 @@
+"""
+Maintenance of the hourly rollup tables (`HourlyRollup`, `HourlyTypeRollup`).
+
+The routers bump the user's data version and then call the `record_*`
+helpers before committing a write, so the rollups change in the same
+transaction as the raw rows. `rebuild_rollups`
+recomputes them from scratch (used by the CLI for backfills) while holding
+the user's write lock.
+
+Increments are written as atomic upserts (`INSERT ... ON CONFLICT DO UPDATE
+SET col = col + excluded.col`), so concurrent writes to the same bucket
+neither lose counts nor collide on the unique (user, bucket) key.
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import delete, func
+from sqlmodel import Session, select
+
+from app.core.bucketing import EPOCH, HOUR_US, MICROSECOND, bucket_overlaps, to_micros
+from app.core.data_version import bump_data_version
+from app.core.upsert import upsert_counters
+from app.models import (
+    HourlyRollup,
+    HourlyTypeRollup,
+    Interruption,
+    Session as WorkSession,
+    User,
+)
+
+# Rows read per batch when rebuilding
+REBUILD_BATCH_SIZE = 1000
+
+_COUNTERS = ("work_seconds", "sessions_started", "session_seconds", "interruptions", "lost_seconds")
+
+
+def _wall_clock(dt: datetime) -> datetime:
+    """
+    The naive value the database stores for `dt` (the offset is dropped),
+    which the stats then read as UTC.
+    """
+    return dt.replace(tzinfo=None)
+
+
+def bucket_start(dt: datetime) -> datetime:
+    """Returns the start of the (naive, UTC as stored) hour containing `dt`."""
+    return _wall_clock(dt).replace(minute=0, second=0, microsecond=0)
+
+
+class RollupDelta:
+    """
+    Increments for the rollups of one user, accumulated in memory and then
+    written with `apply()` (incremental writes) or `insert()` (rebuilds).
+    """
+
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self.buckets: Dict[datetime, Dict[str, float]] = defaultdict(lambda: dict.fromkeys(_COUNTERS, 0))
+        self.types: Dict[Tuple[datetime, str], int] = defaultdict(int)
+
+    def add_session_started(self, work_session: WorkSession) -> None:
+        self.buckets[bucket_start(work_session.start_time)]["sessions_started"] += 1
+
+    def add_session_ended(self, work_session: WorkSession) -> None:
+        if work_session.end_time is None:
+            return
+        start = _wall_clock(work_session.start_time)
+        end = _wall_clock(work_session.end_time)
+
+        duration = (end - start).total_seconds()
+        if duration > 0:
+            self.buckets[bucket_start(start)]["session_seconds"] += duration
+
+        for bucket_us, micros in bucket_overlaps(to_micros(start), to_micros(end), HOUR_US):
+            bucket = EPOCH + bucket_us * MICROSECOND
+            self.buckets[bucket]["work_seconds"] += micros / 1_000_000
+
+    def add_interruption(self, interruption: Interruption) -> None:
+        bucket = bucket_start(interruption.start_time)
+        self.buckets[bucket]["interruptions"] += 1
+        if interruption.duration and interruption.duration > 0:
+            self.buckets[bucket]["lost_seconds"] += interruption.duration
+        self.types[(bucket, interruption.type or "unknown")] += 1
+
+    def apply(self, db: Session) -> None:
+        """Adds the increments to the existing rows, creating the missing ones (atomic upserts)."""
+        upsert_counters(
+            db,
+            HourlyRollup,
+            [
+                {"user_id": self.user_id, "bucket_start": bucket, **values}
+                for bucket, values in self.buckets.items()
+            ],
+            keys=("user_id", "bucket_start"),
+            counters=_COUNTERS,
+        )
+        upsert_counters(
+            db,
+            HourlyTypeRollup,
+            [
+                {"user_id": self.user_id, "bucket_start": bucket, "type": it_type, "interruptions": count}
+                for (bucket, it_type), count in self.types.items()
+            ],
+            keys=("user_id", "bucket_start", "type"),
+            counters=("interruptions",),
+        )
+
+    def insert(self, db: Session) -> None:
+        """Inserts the increments as new rows (the user must have no rollups)."""
+        db.add_all(
+            HourlyRollup(user_id=self.user_id, bucket_start=bucket, **values)
+            for bucket, values in self.buckets.items()
+        )
+        db.add_all(
+            HourlyTypeRollup(user_id=self.user_id, bucket_start=bucket, type=it_type, interruptions=count)
+            for (bucket, it_type), count in self.types.items()
+        )
+
+
+def record_session_started(db: Session, work_session: WorkSession) -> None:
+    """Counts a new session in the bucket of its start time."""
+    delta = RollupDelta(work_session.user_id)
+    delta.add_session_started(work_session)
+    delta.apply(db)
+
+
+def record_session_ended(db: Session, work_session: WorkSession) -> None:
+    """Adds the time of a finished session to the buckets it spans."""
+    delta = RollupDelta(work_session.user_id)
+    delta.add_session_ended(work_session)
+    delta.apply(db)
+
+
+def record_interruption(db: Session, interruption: Interruption) -> None:
+    """Counts an interruption (and its lost time) in the bucket of its start time."""
+    delta = RollupDelta(interruption.user_id)
+    delta.add_interruption(interruption)
+    delta.apply(db)
+
+
+def record_interruptions(db: Session, user_id: int, interruptions: Iterable[Interruption]) -> None:
+    """`record_interruption` for a batch of the user's interruptions (one upsert for all buckets)."""
+    delta = RollupDelta(user_id)
+    for interruption in interruptions:
+        delta.add_interruption(interruption)
+    delta.apply(db)
+
+
+def _lock_user(db: Session, user_id: int) -> None:
+    """
+    Takes the user's write lock for the rest of the transaction by bumping
+    their `user_data_version` row, which every write also bumps before its
+    rollup upserts. On PostgreSQL the upsert holds the row lock (like
+    `SELECT ... FOR UPDATE`, but it also creates a missing row); on SQLite it
+    takes the database write lock, before any read of the transaction.
+    """
+    bump_data_version(db, user_id)
+
+
+def rebuild_rollups(db: Session, user_id: Optional[int] = None) -> int:
+    """
+    Deletes and recomputes the rollups of one user (or of every user).
+    Each user is rebuilt in its own transaction under their write lock, so
+    concurrent writes wait for it instead of being lost or counted twice.
+    Returns the number of users rebuilt.
+    """
+    if user_id is None:
+        user_ids = list(db.exec(select(User.id)).all())
+    else:
+        user_ids = [user_id]
+
+    for uid in user_ids:
+        # Also changes the cached ETags, as rollup-backed responses may change
+        _lock_user(db, uid)
+        delta = RollupDelta(uid)
+
+        sessions = db.exec(
+            select(WorkSession)
+            .where(WorkSession.user_id == uid)
+            .execution_options(yield_per=REBUILD_BATCH_SIZE)
+        )
+        for work_session in sessions:
+            delta.add_session_started(work_session)
+            delta.add_session_ended(work_session)
+
+        interruptions = db.exec(
+            select(Interruption)
+            .where(Interruption.user_id == uid)
+            .execution_options(yield_per=REBUILD_BATCH_SIZE)
+        )
+        for interruption in interruptions:
+            delta.add_interruption(interruption)
+
+        db.exec(delete(HourlyRollup).where(HourlyRollup.user_id == uid))
+        db.exec(delete(HourlyTypeRollup).where(HourlyTypeRollup.user_id == uid))
+        delta.insert(db)
+        db.commit()
+
+    return len(user_ids)
+
+
+def _counts_by_user(db: Session, query) -> Dict[int, Tuple[int, int]]:
+    return {user_id: (int(sessions), int(interruptions)) for user_id, sessions, interruptions in db.exec(query)}
+
+
+def backfill_rollups(db: Session) -> int:
+    """
+    Builds the rollups of users whose rollups do not account for all their
+    raw rows (session and interruption counts differ), e.g. users with rows
+    written before the rollups existed, even if they have written since.
+    Returns the number of users backfilled.
+    """
+    raw_interruptions = (
+        select(Interruption.user_id, func.count().label("interruptions"))
+        .group_by(Interruption.user_id)
+        .subquery()
+    )
+    raw = _counts_by_user(
+        db,
+        select(
+            WorkSession.user_id,
+            func.count(),
+            func.coalesce(func.max(raw_interruptions.c.interruptions), 0),
+        )
+        .outerjoin(raw_interruptions, raw_interruptions.c.user_id == WorkSession.user_id)
+        .group_by(WorkSession.user_id),
+    )
+    rolled_up = _counts_by_user(
+        db,
+        select(
+            HourlyRollup.user_id,
+            func.sum(HourlyRollup.sessions_started),
+            func.sum(HourlyRollup.interruptions),
+        ).group_by(HourlyRollup.user_id),
+    )
+    user_ids = [uid for uid, counts in raw.items() if rolled_up.get(uid) != counts]
+
+    for uid in user_ids:
+        rebuild_rollups(db, user_id=uid)
+    return len(user_ids)
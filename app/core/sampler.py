@@ -0,0 +1,252 @@
+"""
+On-demand stack-sampling profiler for superusers.
+
+A background thread reads every thread's Python stack
+(`sys._current_frames()`) at a fixed interval and counts identical stacks.
+Nothing is traced: the profiled code runs unchanged and the cost is the
+sampler thread itself, only while a profile is being taken.
+
+- one request: add `?__profile=1` (superusers only, `SamplingProfilerMiddleware`);
+  the response body is the profile instead of the endpoint's response
+- the whole process: `GET /api/v1/profiler/process?seconds=N`
+
+Profiles come out as collapsed stacks (`thread;frame;...;frame count`, the
+input of flamegraph.pl / inferno / speedscope) or speedscope JSON. Each
+sample is weighted with the time elapsed since the previous one: a thread
+holding the GIL delays the sampler, and the weight keeps the profile in
+real time.
+
+All threads are sampled, so requests served at the same time show up in a
+single-request profile too (under their own thread names). Threads waiting
+for work (thread pool queues, the event loop's selector) are left out.
+"""
+import os
+import sys
+import threading
+from time import perf_counter
+from types import CodeType, FrameType
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+from fastapi.security.utils import get_authorization_scheme_param
+
+from app.core.deps import get_current_active_superuser, get_current_user
+from app.db import get_session
+
+PROFILE_PARAM = "__profile"
+FORMAT_PARAM = "__profile_format"
+FORMATS = ("collapsed", "speedscope")
+# One request lasts milliseconds: it is sampled more often than the process
+REQUEST_INTERVAL_SECONDS = 0.001
+PROCESS_INTERVAL_SECONDS = 0.005
+
+# (file name, function) of the innermost frame of a thread waiting for work
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),  # concurrent.futures, blocked in SimpleQueue.get
+}
+
+# A single profile at a time: two samplers would count each other
+_running = threading.Lock()
+
+
+class ProfilerBusy(Exception):
+    pass
+
+
+def _short_path(filename: str) -> str:
+    marker = f"site-packages{os.sep}"
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    cwd = os.getcwd() + os.sep
+    return filename[len(cwd):] if filename.startswith(cwd) else filename
+
+
+class StackSampler:
+    """Samples the stacks of all threads (but its own) until stopped."""
+
+    def __init__(self, interval: float = PROCESS_INTERVAL_SECONDS, include_idle: bool = False):
+        self.interval = interval
+        self.include_idle = include_idle
+        # (thread name, frame, ..., frame) -> [samples, seconds]
+        self.stacks: Dict[Tuple[str, ...], List[float]] = {}
+        self.duration = 0.0
+        self._labels: Dict[CodeType, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "StackSampler":
+        if not _running.acquire(blocking=False):
+            raise ProfilerBusy("A profile is already being taken")
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+        _running.release()
+
+    def _label(self, code: CodeType) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            # ';' separates the frames of a collapsed stack
+            label = f"{code.co_qualname} ({_short_path(code.co_filename)}:{code.co_firstlineno})".replace(";", ",")
+            self._labels[code] = label
+        return label
+
+    def _stack(self, frame: FrameType) -> Optional[List[str]]:
+        code = frame.f_code
+        if not self.include_idle and (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+            return None
+        stack = []
+        while frame is not None:
+            stack.append(self._label(frame.f_code))
+            frame = frame.f_back
+        stack.reverse()
+        return stack
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        start = last = perf_counter()
+        while not self._stop.wait(self.interval):
+            now = perf_counter()
+            weight, last = now - last, now
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = self._stack(frame)
+                if stack is None:
+                    continue
+                key = (names.get(ident, f"thread-{ident}"), *stack)
+                entry = self.stacks.setdefault(key, [0, 0.0])
+                entry[0] += 1
+                entry[1] += weight
+        self.duration = perf_counter() - start
+
+    @property
+    def samples(self) -> int:
+        return sum(int(count) for count, _ in self.stacks.values())
+
+    def collapsed(self) -> str:
+        """Collapsed stacks, one per line, with their sample count."""
+        return "".join(f"{';'.join(stack)} {int(count)}\n" for stack, (count, _) in sorted(self.stacks.items()))
+
+    def speedscope(self, name: str) -> Dict[str, Any]:
+        """speedscope file (https://www.speedscope.app): one sampled profile per thread."""
+        frames: List[Dict[str, Any]] = []
+        frame_index: Dict[str, int] = {}
+        profiles: Dict[str, Dict[str, Any]] = {}
+        for (thread, *stack), (_, seconds) in sorted(self.stacks.items()):
+            indexes = []
+            for label in stack:
+                if label not in frame_index:
+                    frame_index[label] = len(frames)
+                    function, _, location = label.rpartition(" (")
+                    file, _, line = location.rstrip(")").rpartition(":")
+                    frames.append({"name": function, "file": file, "line": int(line)})
+                indexes.append(frame_index[label])
+            profile = profiles.setdefault(thread, {
+                "type": "sampled",
+                "name": thread,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": 0,
+                "samples": [],
+                "weights": [],
+            })
+            profile["samples"].append(indexes)
+            profile["weights"].append(round(seconds * 1000, 3))
+            profile["endValue"] = round(profile["endValue"] + seconds * 1000, 3)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "hyperfocus",
+            "shared": {"frames": frames},
+            "profiles": list(profiles.values()),
+        }
+
+    def response(self, profile_format: str, name: str, headers: Optional[Dict[str, str]] = None) -> Response:
+        headers = {"X-Profile-Samples": str(self.samples), **(headers or {})}
+        if profile_format == "speedscope":
+            return JSONResponse(self.speedscope(name), headers=headers)
+        return PlainTextResponse(self.collapsed(), headers=headers)
+
+
+def _superuser_check(scope) -> None:
+    """`get_current_active_superuser` on the request's bearer token."""
+    authorization = dict(scope["headers"]).get(b"authorization", b"").decode("latin-1")
+    scheme, token = get_authorization_scheme_param(authorization)
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    # Same session the endpoints get, including the test overrides
+    app = scope.get("app")
+    session_dependency = getattr(app, "dependency_overrides", {}).get(get_session, get_session)
+    sessions = session_dependency()
+    session = next(sessions) if hasattr(sessions, "__next__") else sessions
+    try:
+        get_current_active_superuser(get_current_user(session=session, token=token))
+    finally:
+        if hasattr(sessions, "close"):
+            sessions.close()
+
+
+class SamplingProfilerMiddleware:
+    """ASGI middleware answering `?__profile=1` requests with their profile."""
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or PROFILE_PARAM.encode() not in scope.get("query_string", b""):
+            await self.app(scope, receive, send)
+            return
+
+        params = parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)
+        options = {key: value for key, value in params if key in (PROFILE_PARAM, FORMAT_PARAM)}
+        if options.get(PROFILE_PARAM) != "1":
+            await self.app(scope, receive, send)
+            return
+        profile_format = options.get(FORMAT_PARAM, "collapsed")
+        try:
+            if profile_format not in FORMATS:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown profile format. Use one of: {', '.join(FORMATS)}.",
+                )
+            await run_in_threadpool(_superuser_check, scope)
+        except HTTPException as exc:
+            response = JSONResponse({"detail": exc.detail}, status_code=exc.status_code, headers=exc.headers)
+            await response(scope, receive, send)
+            return
+
+        # The endpoint sees the request without the profiler's parameters
+        query = urlencode([(key, value) for key, value in params if key not in (PROFILE_PARAM, FORMAT_PARAM)])
+        inner_scope = {**scope, "query_string": query.encode("latin-1")}
+        response_status = 0
+
+        async def discard(message):
+            nonlocal response_status
+            if message["type"] == "http.response.start":
+                response_status = message["status"]
+
+        try:
+            with StackSampler(REQUEST_INTERVAL_SECONDS) as sampler:
+                await self.app(inner_scope, receive, discard)
+        except ProfilerBusy as exc:
+            response = JSONResponse({"detail": str(exc)}, status_code=status.HTTP_409_CONFLICT)
+        else:
+            name = f"{scope['method']} {scope['path']}" + (f"?{query}" if query else "")
+            response = sampler.response(profile_format, name, {"X-Profiled-Status": str(response_status)})
+        await response(scope, receive, send)
@@ -0,0 +1,128 @@
+"""
+Stats on an async session (DB_ASYNC mode).
+
+Nothing CPU-bound runs on the event loop, so a large range does not stall
+the other requests of the worker:
+
+- The reference ("python") backend and the insights fetch the range rows
+  with awaited queries, then aggregate them (the `_*_from_rows` helpers of
+  `stats_logic`, the insight analyzers) in a worker thread.
+- Other backends run their sync code, queries included, in a worker thread
+  on a sync session of the same database (`app.db.get_sync_engine`). Those
+  threads come from AnyIO's default limiter, shared with the sync routes,
+  so these backends only keep the event loop free.
+"""
+from datetime import datetime
+from typing import Dict, List
+
+from anyio import to_thread
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.db import get_sync_engine
+from app.core.insights import INSIGHTS_WINDOW_DAYS, InsightContext, analyze
+from app.core.stats_backends import get_stats_backend
+from app.core.stats_logic import (
+    InterruptionRow,
+    SessionRow,
+    _dashboard_from_rows,
+    _get_range_dates,
+    _interruption_types_from_rows,
+    _interruptions_query,
+    _peak_distraction_from_rows,
+    _productive_hours_from_rows,
+    _sessions_query,
+    _summary_from_rows,
+    _weekly_pattern_from_rows,
+)
+
+
+async def _get_sessions_in_range(
+    user_id: int, db: AsyncSession, since: datetime, finished_only: bool = False
+) -> List[SessionRow]:
+    rows = await db.exec(_sessions_query(user_id, since, finished_only))
+    return [SessionRow._make(row) for row in rows]
+
+
+async def _get_interruptions_in_range(user_id: int, db: AsyncSession, since: datetime) -> List[InterruptionRow]:
+    rows = await db.exec(_interruptions_query(user_id, since))
+    return [InterruptionRow._make(row) for row in rows]
+
+
+async def get_summary_stats(user_id: int, db: AsyncSession, range_days: int = 7) -> Dict:
+    since, _ = _get_range_dates(range_days)
+    sessions = await _get_sessions_in_range(user_id, db, since)
+    interruptions = await _get_interruptions_in_range(user_id, db, since)
+    return await to_thread.run_sync(_summary_from_rows, user_id, range_days, sessions, interruptions)
+
+
+async def get_interruption_type_stats(user_id: int, db: AsyncSession, range_days: int = 7) -> Dict:
+    since, _ = _get_range_dates(range_days)
+    interruptions = await _get_interruptions_in_range(user_id, db, since)
+    return await to_thread.run_sync(_interruption_types_from_rows, user_id, range_days, interruptions)
+
+
+async def get_productive_hours_stats(user_id: int, db: AsyncSession, range_days: int = 7) -> Dict:
+    since, now = _get_range_dates(range_days)
+    sessions = await _get_sessions_in_range(user_id, db, since, finished_only=True)
+    interruptions = await _get_interruptions_in_range(user_id, db, since)
+    return await to_thread.run_sync(_productive_hours_from_rows, user_id, range_days, sessions, interruptions, since, now)
+
+
+async def get_peak_distraction_hour(user_id: int, db: AsyncSession, range_days: int = 7) -> Dict:
+    since, _ = _get_range_dates(range_days)
+    interruptions = await _get_interruptions_in_range(user_id, db, since)
+    return await to_thread.run_sync(_peak_distraction_from_rows, user_id, range_days, interruptions)
+
+
+async def get_weekly_pattern(user_id: int, db: AsyncSession, range_days: int = 7) -> Dict:
+    since, now = _get_range_dates(range_days)
+    sessions = await _get_sessions_in_range(user_id, db, since, finished_only=True)
+    interruptions = await _get_interruptions_in_range(user_id, db, since)
+    return await to_thread.run_sync(_weekly_pattern_from_rows, user_id, range_days, sessions, interruptions, since, now)
+
+
+async def get_dashboard_stats(user_id: int, db: AsyncSession, range_days: int = 7) -> Dict:
+    since, now = _get_range_dates(range_days)
+    sessions = await _get_sessions_in_range(user_id, db, since)
+    interruptions = await _get_interruptions_in_range(user_id, db, since)
+    return await to_thread.run_sync(_dashboard_from_rows, user_id, range_days, sessions, interruptions, since, now)
+
+
+ASYNC_STATS_FUNCTIONS = {
+    "get_summary_stats": get_summary_stats,
+    "get_interruption_type_stats": get_interruption_type_stats,
+    "get_productive_hours_stats": get_productive_hours_stats,
+    "get_peak_distraction_hour": get_peak_distraction_hour,
+    "get_weekly_pattern": get_weekly_pattern,
+    "get_dashboard_stats": get_dashboard_stats,
+}
+
+
+async def compute_stats(function_name: str, user_id: int, db: AsyncSession, range_days: int) -> Dict:
+    """Runs a stats function of the configured backend on an async session."""
+    if settings.STATS_BACKEND == "python":
+        return await ASYNC_STATS_FUNCTIONS[function_name](user_id, db, range_days)
+
+    function = getattr(get_stats_backend(), function_name)
+    sync_engine = get_sync_engine(db.bind)
+
+    def compute() -> Dict:
+        with Session(sync_engine) as session:
+            return function(user_id=user_id, db=session, range_days=range_days)
+
+    return await to_thread.run_sync(compute)
+
+
+async def generate_ai_insights(user_id: int, db: AsyncSession) -> List[Dict]:
+    since, now = _get_range_dates(INSIGHTS_WINDOW_DAYS)
+    context = InsightContext(
+        user_id,
+        sessions=await _get_sessions_in_range(user_id, db, since),
+        interruptions=await _get_interruptions_in_range(user_id, db, since),
+        since=since,
+        now=now,
+    )
+    report = await to_thread.run_sync(analyze, context)
+    return report.insights
@@ -0,0 +1,31 @@
+"""
+Selects which implementation serves the stats endpoints.
+
+Every backend is a module exposing the same functions as `stats_logic`
+(`get_summary_stats`, `get_interruption_type_stats`,
+`get_productive_hours_stats`, `get_peak_distraction_hour`,
+`get_weekly_pattern`, `get_dashboard_stats`) and returning the same dicts.
+"""
+from types import ModuleType
+from typing import Optional
+
+from app.core import stats_logic, stats_numpy, stats_rollup, stats_sql
+from app.core.config import settings
+
+STATS_BACKENDS = {
+    "python": stats_logic,
+    "sql": stats_sql,
+    "rollup": stats_rollup,
+    "numpy": stats_numpy,
+}
+
+
+def get_stats_backend(name: Optional[str] = None) -> ModuleType:
+    """Returns the backend module named `name` (defaults to settings.STATS_BACKEND)."""
+    name = name or settings.STATS_BACKEND
+    try:
+        return STATS_BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown STATS_BACKEND '{name}'. Expected one of: {', '.join(STATS_BACKENDS)}"
+        )
@@ -1,8 +1,9 @@
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 from sqlmodel import Session, select
 
+from app.core.bucketing import hour_of_day_overlap, weekday_overlap
 from app.models import Session as WorkSession, Interruption
 
 
@@ -13,26 +14,51 @@ def _get_range_dates(range_days: int) -> Tuple[datetime, datetime]:
     return since, now
 
 
-def _get_sessions_in_range(
-    user_id: int, db: Session, since: datetime, now: datetime
-) -> List[WorkSession]:
-    """Fetches sessions that started within the range."""
-    query = select(WorkSession).where(
+class SessionRow(NamedTuple):
+    """The columns of a session the stats need (no ORM object behind it)."""
+    start_time: datetime
+    end_time: Optional[datetime]
+
+
+class InterruptionRow(NamedTuple):
+    """The columns of an interruption the stats need."""
+    start_time: datetime
+    duration: Optional[int]
+    type: Optional[str]
+
+
+def _sessions_query(user_id: int, since: datetime, finished_only: bool = False):
+    """Columns of the sessions that started within the range (optionally only finished ones)."""
+    query = select(WorkSession.start_time, WorkSession.end_time).where(
         WorkSession.user_id == user_id,
         WorkSession.start_time >= since,
     )
-    return db.exec(query).all()
+    if finished_only:
+        query = query.where(WorkSession.end_time.is_not(None))
+    return query
 
 
-def _get_interruptions_in_range(
-    user_id: int, db: Session, since: datetime
-) -> List[Interruption]:
-    """Fetches interruptions that started within the range."""
-    query = select(Interruption).where(
+def _interruptions_query(user_id: int, since: datetime):
+    """Columns of the interruptions that started within the range."""
+    return select(Interruption.start_time, Interruption.duration, Interruption.type).where(
         Interruption.user_id == user_id,
         Interruption.start_time >= since,
     )
-    return db.exec(query).all()
+
+
+def _get_sessions_in_range(
+    user_id: int, db: Session, since: datetime, now: datetime, finished_only: bool = False
+) -> List[SessionRow]:
+    """Fetches sessions that started within the range (optionally only finished ones)."""
+    query = _sessions_query(user_id, since, finished_only)
+    return [SessionRow._make(row) for row in db.exec(query)]
+
+
+def _get_interruptions_in_range(
+    user_id: int, db: Session, since: datetime
+) -> List[InterruptionRow]:
+    """Fetches interruptions that started within the range."""
+    return [InterruptionRow._make(row) for row in db.exec(_interruptions_query(user_id, since))]
 
 
 def _ensure_utc(dt: Optional[datetime]) -> Optional[datetime]:
@@ -44,33 +70,49 @@ def _ensure_utc(dt: Optional[datetime]) -> Optional[datetime]:
     return dt
 
 
-def get_summary_stats(
-    user_id: int,
-    db: Session,
-    range_days: int = 7,
-) -> Dict:
-    """
-    Calculates general user statistics for a given date range.
-    """
-    since, now = _get_range_dates(range_days)
-    sessions = _get_sessions_in_range(user_id, db, since, now)
-    interruptions = _get_interruptions_in_range(user_id, db, since)
+def _clip_to_range(
+    s: SessionRow, since: datetime, now: datetime
+) -> Optional[Tuple[datetime, datetime]]:
+    """Returns the (start, end) of a finished session clipped to [since, now], or None."""
+    start = _ensure_utc(s.start_time)
+    end = _ensure_utc(s.end_time)
 
-    total_sessions = len(sessions)
-    total_interruptions = len(interruptions)
+    if not start or not end: return None
+    if end <= since or start >= now: return None
 
-    total_time_worked_seconds = 0.0
-    for s in sessions:
-        if s.end_time:
-            delta = (s.end_time - s.start_time).total_seconds()
-            if delta > 0:
-                total_time_worked_seconds += delta
+    start = max(start, since)
+    end = min(end, now)
+    if end <= start: return None
+    return start, end
 
-    total_time_lost_seconds = 0.0
-    for it in interruptions:
-        if it.duration and it.duration > 0:
-            total_time_lost_seconds += it.duration
 
+def _add_work_by_hour(hours_data: Dict[int, Dict], start: datetime, end: datetime) -> None:
+    """Distributes [start, end) across the hours of day in hours_data."""
+    for hour, micros in enumerate(hour_of_day_overlap(start, end)):
+        if micros:
+            hours_data[hour]["work_seconds"] += micros / 1_000_000
+
+
+def _add_work_by_weekday(weekly_data: Dict[int, Dict], start: datetime, end: datetime) -> None:
+    """Distributes [start, end) across the weekdays in weekly_data."""
+    for weekday, micros in enumerate(weekday_overlap(start, end)):
+        if micros:
+            weekly_data[weekday]["work_seconds"] += micros / 1_000_000
+
+
+# ============================================================
+# Result builders (shared by every stats backend)
+# ============================================================
+
+def _summary_result(
+    user_id: int,
+    range_days: int,
+    total_sessions: int,
+    total_interruptions: int,
+    total_time_worked_seconds: float,
+    total_time_lost_seconds: float,
+) -> Dict:
+    """Builds the summary dict from the aggregated totals."""
     effective_time_seconds = max(total_time_worked_seconds - total_time_lost_seconds, 0.0)
 
     average_interruption_duration_seconds = 0.0
@@ -95,22 +137,8 @@ def get_summary_stats(
     }
 
 
-def get_interruption_type_stats(
-    user_id: int,
-    db: Session,
-    range_days: int = 7,
-) -> Dict:
-    """
-    Calculates interruption statistics by type.
-    """
-    since, _ = _get_range_dates(range_days)
-    interruptions = _get_interruptions_in_range(user_id, db, since)
-
-    counts: Dict[str, int] = {}
-    for it in interruptions:
-        it_type = it.type or "unknown"
-        counts[it_type] = counts.get(it_type, 0) + 1
-
+def _interruption_types_result(user_id: int, range_days: int, counts: Dict[str, int]) -> Dict:
+    """Builds the interruption-types dict from the per-type counts."""
     total_interruptions = sum(counts.values())
 
     proportions = {}
@@ -128,59 +156,8 @@ def get_interruption_type_stats(
     }
 
 
-def get_productive_hours_stats(
-    user_id: int,
-    db: Session,
-    range_days: int = 7,
-) -> Dict:
-    """
-    Calculates work time and interruptions per hour of day (0-23).
-    """
-    since, now = _get_range_dates(range_days)
-    
-    # Only finished sessions for hourly calculation
-    sessions_query = select(WorkSession).where(
-        WorkSession.user_id == user_id,
-        WorkSession.start_time >= since,
-        WorkSession.end_time.is_not(None),
-    )
-    sessions = db.exec(sessions_query).all()
-    
-    interruptions = _get_interruptions_in_range(user_id, db, since)
-
-    hours_data = {h: {"work_seconds": 0.0, "interruptions": 0} for h in range(24)}
-
-    # 1. Distribute session time across hours
-    for s in sessions:
-        start = _ensure_utc(s.start_time)
-        end = _ensure_utc(s.end_time)
-
-        if not start or not end: continue
-        if end <= since or start >= now: continue
-
-        start = max(start, since)
-        end = min(end, now)
-        if end <= start: continue
-
-        current = start
-        while current < end:
-            hour_start = current
-            next_hour = (hour_start.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1))
-            chunk_end = min(end, next_hour)
-            delta = (chunk_end - hour_start).total_seconds()
-
-            if delta > 0:
-                hours_data[hour_start.hour]["work_seconds"] += delta
-            
-            current = chunk_end
-
-    # 2. Count interruptions by start hour
-    for it in interruptions:
-        it_start = _ensure_utc(it.start_time)
-        if it_start:
-            hours_data[it_start.hour]["interruptions"] += 1
-
-    # 3. Format response
+def _productive_hours_result(user_id: int, range_days: int, hours_data: Dict[int, Dict]) -> Dict:
+    """Builds the productive-hours dict from per-hour work seconds and interruptions."""
     hours_list: List[dict] = []
     for h in range(24):
         work_seconds = hours_data[h]["work_seconds"]
@@ -211,6 +188,189 @@ def get_productive_hours_stats(
     }
 
 
+def _peak_distraction_result(
+    user_id: int, range_days: int, interruptions_per_hour: Dict[int, int]
+) -> Dict:
+    """Builds the peak-distraction dict from the per-hour interruption counts."""
+    total_interruptions = sum(interruptions_per_hour.values())
+
+    peak_hour = None
+    peak_interruptions = 0
+    
+    if total_interruptions > 0:
+        peak_hour = max(interruptions_per_hour, key=interruptions_per_hour.get)
+        peak_interruptions = interruptions_per_hour[peak_hour]
+
+    return {
+        "user_id": user_id,
+        "range_days": range_days,
+        "peak_hour": peak_hour,
+        "peak_interruptions": peak_interruptions,
+        "total_interruptions": total_interruptions,
+    }
+
+
+def _weekly_pattern_result(user_id: int, range_days: int, weekly_data: Dict[int, Dict]) -> Dict:
+    """Builds the weekly-pattern dict from per-weekday work, lost time and interruptions."""
+    weekday_names = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+    days_list = []
+    
+    for i in range(7):
+        work = weekly_data[i]["work_seconds"]
+        lost = weekly_data[i]["time_lost_seconds"]
+        effective = max(work - lost, 0.0)
+        
+        days_list.append({
+            "weekday_index": i,
+            "day": weekday_names[i], # Short name for charts
+            "work_seconds": int(work),
+            "time_lost_seconds": int(lost),
+            "effective_time_seconds": int(effective),
+            "interruptions": weekly_data[i]["interruptions"],
+            # For charts:
+            "sessions": round(work / 3600, 1), # Hours
+            "lost": round(lost / 3600, 1)      # Hours
+        })
+
+    return {
+        "user_id": user_id,
+        "range_days": range_days,
+        "days": days_list,
+    }
+
+
+def _dashboard_result(
+    user_id: int,
+    range_days: int,
+    summary: Dict,
+    interruption_types: Dict,
+    productive_hours: Dict,
+    peak_distraction: Dict,
+    weekly_pattern: Dict,
+) -> Dict:
+    """Groups the five stats dicts of the dashboard into one response."""
+    return {
+        "user_id": user_id,
+        "range_days": range_days,
+        "summary": summary,
+        "interruption_types": interruption_types,
+        "productive_hours": productive_hours,
+        "peak_distraction": peak_distraction,
+        "weekly_pattern": weekly_pattern,
+    }
+
+
+def get_summary_stats(
+    user_id: int,
+    db: Session,
+    range_days: int = 7,
+) -> Dict:
+    """
+    Calculates general user statistics for a given date range.
+    """
+    since, now = _get_range_dates(range_days)
+    sessions = _get_sessions_in_range(user_id, db, since, now)
+    interruptions = _get_interruptions_in_range(user_id, db, since)
+    return _summary_from_rows(user_id, range_days, sessions, interruptions)
+
+
+def _summary_from_rows(
+    user_id: int,
+    range_days: int,
+    sessions: List[SessionRow],
+    interruptions: List[InterruptionRow],
+) -> Dict:
+    """Summary dict from already fetched rows."""
+    total_time_worked_seconds = 0.0
+    for s in sessions:
+        if s.end_time:
+            delta = (s.end_time - s.start_time).total_seconds()
+            if delta > 0:
+                total_time_worked_seconds += delta
+
+    total_time_lost_seconds = 0.0
+    for it in interruptions:
+        if it.duration and it.duration > 0:
+            total_time_lost_seconds += it.duration
+
+    return _summary_result(
+        user_id,
+        range_days,
+        total_sessions=len(sessions),
+        total_interruptions=len(interruptions),
+        total_time_worked_seconds=total_time_worked_seconds,
+        total_time_lost_seconds=total_time_lost_seconds,
+    )
+
+
+def get_interruption_type_stats(
+    user_id: int,
+    db: Session,
+    range_days: int = 7,
+) -> Dict:
+    """
+    Calculates interruption statistics by type.
+    """
+    since, _ = _get_range_dates(range_days)
+    interruptions = _get_interruptions_in_range(user_id, db, since)
+    return _interruption_types_from_rows(user_id, range_days, interruptions)
+
+
+def _interruption_types_from_rows(
+    user_id: int, range_days: int, interruptions: List[InterruptionRow]
+) -> Dict:
+    """Interruption-types dict from already fetched rows."""
+    counts: Dict[str, int] = {}
+    for it in interruptions:
+        it_type = it.type or "unknown"
+        counts[it_type] = counts.get(it_type, 0) + 1
+
+    return _interruption_types_result(user_id, range_days, counts)
+
+
+def get_productive_hours_stats(
+    user_id: int,
+    db: Session,
+    range_days: int = 7,
+) -> Dict:
+    """
+    Calculates work time and interruptions per hour of day (0-23).
+    """
+    since, now = _get_range_dates(range_days)
+    
+    # Only finished sessions for hourly calculation
+    sessions = _get_sessions_in_range(user_id, db, since, now, finished_only=True)
+    
+    interruptions = _get_interruptions_in_range(user_id, db, since)
+    return _productive_hours_from_rows(user_id, range_days, sessions, interruptions, since, now)
+
+
+def _productive_hours_from_rows(
+    user_id: int,
+    range_days: int,
+    sessions: List[SessionRow],
+    interruptions: List[InterruptionRow],
+    since: datetime,
+    now: datetime,
+) -> Dict:
+    """Productive-hours dict from already fetched rows (unfinished sessions are skipped)."""
+    hours_data = {h: {"work_seconds": 0.0, "interruptions": 0} for h in range(24)}
+
+    # 1. Distribute session time across hours
+    for s in sessions:
+        clipped = _clip_to_range(s, since, now)
+        if clipped:
+            _add_work_by_hour(hours_data, *clipped)
+
+    # 2. Count interruptions by start hour
+    for it in interruptions:
+        it_start = _ensure_utc(it.start_time)
+        if it_start:
+            hours_data[it_start.hour]["interruptions"] += 1
+
+    return _productive_hours_result(user_id, range_days, hours_data)
+
+
 def get_peak_distraction_hour(
     user_id: int,
     db: Session,
@@ -221,30 +381,21 @@ def get_peak_distraction_hour(
     """
     since, _ = _get_range_dates(range_days)
     interruptions = _get_interruptions_in_range(user_id, db, since)
+    return _peak_distraction_from_rows(user_id, range_days, interruptions)
+
 
+def _peak_distraction_from_rows(
+    user_id: int, range_days: int, interruptions: List[InterruptionRow]
+) -> Dict:
+    """Peak-distraction dict from already fetched rows."""
     interruptions_per_hour = {h: 0 for h in range(24)}
-    total_interruptions = 0
 
     for it in interruptions:
         it_start = _ensure_utc(it.start_time)
         if it_start:
             interruptions_per_hour[it_start.hour] += 1
-            total_interruptions += 1
 
-    peak_hour = None
-    peak_interruptions = 0
-    
-    if total_interruptions > 0:
-        peak_hour = max(interruptions_per_hour, key=interruptions_per_hour.get)
-        peak_interruptions = interruptions_per_hour[peak_hour]
-
-    return {
-        "user_id": user_id,
-        "range_days": range_days,
-        "peak_hour": peak_hour,
-        "peak_interruptions": peak_interruptions,
-        "total_interruptions": total_interruptions,
-    }
+    return _peak_distraction_result(user_id, range_days, interruptions_per_hour)
 
 
 def get_weekly_pattern(
@@ -257,15 +408,21 @@ def get_weekly_pattern(
     """
     since, now = _get_range_dates(range_days)
     
-    sessions_query = select(WorkSession).where(
-        WorkSession.user_id == user_id,
-        WorkSession.start_time >= since,
-        WorkSession.end_time.is_not(None),
-    )
-    sessions = db.exec(sessions_query).all()
+    sessions = _get_sessions_in_range(user_id, db, since, now, finished_only=True)
     
     interruptions = _get_interruptions_in_range(user_id, db, since)
+    return _weekly_pattern_from_rows(user_id, range_days, sessions, interruptions, since, now)
+
 
+def _weekly_pattern_from_rows(
+    user_id: int,
+    range_days: int,
+    sessions: List[SessionRow],
+    interruptions: List[InterruptionRow],
+    since: datetime,
+    now: datetime,
+) -> Dict:
+    """Weekly-pattern dict from already fetched rows (unfinished sessions are skipped)."""
     weekly_data = {
         i: {"work_seconds": 0.0, "time_lost_seconds": 0.0, "interruptions": 0}
         for i in range(7)
@@ -273,27 +430,9 @@ def get_weekly_pattern(
 
     # 1. Distribute sessions
     for s in sessions:
-        start = _ensure_utc(s.start_time)
-        end = _ensure_utc(s.end_time)
-
-        if not start or not end: continue
-        if end <= since or start >= now: continue
-
-        start = max(start, since)
-        end = min(end, now)
-        if end <= start: continue
-
-        current = start
-        while current < end:
-            day_start = current
-            next_day = (day_start.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1))
-            chunk_end = min(end, next_day)
-            delta = (chunk_end - day_start).total_seconds()
-
-            if delta > 0:
-                weekly_data[day_start.weekday()]["work_seconds"] += delta
-            
-            current = chunk_end
+        clipped = _clip_to_range(s, since, now)
+        if clipped:
+            _add_work_by_weekday(weekly_data, *clipped)
 
     # 2. Distribute interruptions
     for it in interruptions:
@@ -304,121 +443,95 @@ def get_weekly_pattern(
             if it.duration and it.duration > 0:
                 weekly_data[idx]["time_lost_seconds"] += it.duration
 
-    weekday_names = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-    days_list = []
-    
-    for i in range(7):
-        work = weekly_data[i]["work_seconds"]
-        lost = weekly_data[i]["time_lost_seconds"]
-        effective = max(work - lost, 0.0)
-        
-        days_list.append({
-            "weekday_index": i,
-            "day": weekday_names[i], # Short name for charts
-            "work_seconds": int(work),
-            "time_lost_seconds": int(lost),
-            "effective_time_seconds": int(effective),
-            "interruptions": weekly_data[i]["interruptions"],
-            # For charts:
-            "sessions": round(work / 3600, 1), # Hours
-            "lost": round(lost / 3600, 1)      # Hours
-        })
+    return _weekly_pattern_result(user_id, range_days, weekly_data)
 
-    return {
-        "user_id": user_id,
-        "range_days": range_days,
-        "days": days_list,
+
+def get_dashboard_stats(
+    user_id: int,
+    db: Session,
+    range_days: int = 7,
+) -> Dict:
+    """
+    Computes summary, interruption types, productive hours, peak distraction
+    hour and weekly pattern together: sessions and interruptions are fetched
+    once and each row is visited once.
+    """
+    since, now = _get_range_dates(range_days)
+    sessions = _get_sessions_in_range(user_id, db, since, now)
+    interruptions = _get_interruptions_in_range(user_id, db, since)
+    return _dashboard_from_rows(user_id, range_days, sessions, interruptions, since, now)
+
+
+def _dashboard_from_rows(
+    user_id: int,
+    range_days: int,
+    sessions: List[SessionRow],
+    interruptions: List[InterruptionRow],
+    since: datetime,
+    now: datetime,
+) -> Dict:
+    """Dashboard dict from already fetched rows, visiting each row once."""
+    hours_data = {h: {"work_seconds": 0.0, "interruptions": 0} for h in range(24)}
+    weekly_data = {
+        i: {"work_seconds": 0.0, "time_lost_seconds": 0.0, "interruptions": 0}
+        for i in range(7)
     }
 
+    total_time_worked_seconds = 0.0
+    for s in sessions:
+        if s.end_time:
+            delta = (s.end_time - s.start_time).total_seconds()
+            if delta > 0:
+                total_time_worked_seconds += delta
+
+        clipped = _clip_to_range(s, since, now)
+        if clipped:
+            _add_work_by_hour(hours_data, *clipped)
+            _add_work_by_weekday(weekly_data, *clipped)
+
+    total_time_lost_seconds = 0.0
+    counts: Dict[str, int] = {}
+    interruptions_per_hour = {h: 0 for h in range(24)}
+    for it in interruptions:
+        lost = it.duration if it.duration and it.duration > 0 else 0
+        total_time_lost_seconds += lost
+
+        it_type = it.type or "unknown"
+        counts[it_type] = counts.get(it_type, 0) + 1
+
+        it_start = _ensure_utc(it.start_time)
+        if it_start:
+            hours_data[it_start.hour]["interruptions"] += 1
+            interruptions_per_hour[it_start.hour] += 1
+            idx = it_start.weekday()
+            weekly_data[idx]["interruptions"] += 1
+            weekly_data[idx]["time_lost_seconds"] += lost
+
+    return _dashboard_result(
+        user_id,
+        range_days,
+        summary=_summary_result(
+            user_id,
+            range_days,
+            total_sessions=len(sessions),
+            total_interruptions=len(interruptions),
+            total_time_worked_seconds=total_time_worked_seconds,
+            total_time_lost_seconds=total_time_lost_seconds,
+        ),
+        interruption_types=_interruption_types_result(user_id, range_days, counts),
+        productive_hours=_productive_hours_result(user_id, range_days, hours_data),
+        peak_distraction=_peak_distraction_result(user_id, range_days, interruptions_per_hour),
+        weekly_pattern=_weekly_pattern_result(user_id, range_days, weekly_data),
+    )
+
+
 def generate_ai_insights(
     user_id: int,
     db: Session,
 ) -> List[Dict]:
     """
     Generates a list of 'AI' insights based on user stats.
+    The rules live in app/core/insights.py.
     """
-    insights = []
-    
-    # 1. Analyze Peak Hours (Productivity)
-    productive_stats = get_productive_hours_stats(user_id, db, range_days=30)
-    hours = productive_stats["hours"]
-    
-    # Find top 3 hours by work volume
-    sorted_hours = sorted(hours, key=lambda x: x["work_seconds"], reverse=True)
-    top_hours = sorted_hours[:3]
-    
-    if top_hours and top_hours[0]["work_seconds"] > 3600: # At least 1 hour of data
-        best_hour = top_hours[0]["hour"]
-        
-        if 5 <= best_hour < 12:
-            insights.append({
-                "type": "productivity",
-                "title": "Morning Person 🌅",
-                "description": f"You are most productive around {best_hour}:00. Try to schedule your hardest tasks then!",
-                "score": 90
-            })
-        elif 12 <= best_hour < 18:
-            insights.append({
-                "type": "productivity",
-                "title": "Afternoon Warrior ☀️",
-                "description": f"Your focus peaks around {best_hour}:00. Perfect time for deep work.",
-                "score": 90
-            })
-        else:
-            insights.append({
-                "type": "productivity",
-                "title": "Night Owl 🦉",
-                "description": f"You find your flow late at night around {best_hour}:00. Embrace the quiet!",
-                "score": 90
-            })
-
-    # 2. Analyze Distractions
-    interruption_stats = get_interruption_type_stats(user_id, db, range_days=7)
-    counts = interruption_stats["counts"]
-    
-    if counts:
-        top_distractor = max(counts, key=counts.get)
-        count = counts[top_distractor]
-        
-        if count > 5:
-            insights.append({
-                "type": "warning",
-                "title": f"Distraction Alert: {top_distractor} ⚠️",
-                "description": f"'{top_distractor}' interrupted you {count} times this week. Consider blocking it.",
-                "score": 70
-            })
-
-    # 3. Weekly Consistency
-    weekly_stats = get_weekly_pattern(user_id, db, range_days=14)
-    days = weekly_stats["days"]
-    
-    # Find most productive day
-    best_day = max(days, key=lambda x: x["work_seconds"])
-    if best_day["work_seconds"] > 7200: # > 2 hours
-        insights.append({
-            "type": "success",
-            "title": f"{best_day['day']} is your Power Day ⚡",
-            "description": "You consistently crush it on this day. Keep the momentum going!",
-            "score": 85
-        })
-
-    # 4. Weekend Warrior Check
-    weekend_work = sum(d["work_seconds"] for d in days if d["weekday_index"] >= 5)
-    if weekend_work > 10800: # > 3 hours on weekends
-        insights.append({
-            "type": "info",
-            "title": "Weekend Warrior 🛡️",
-            "description": "You put in significant time on weekends. Don't forget to rest!",
-            "score": 60
-        })
-
-    # Fallback if no data
-    if not insights:
-        insights.append({
-            "type": "info",
-            "title": "Gathering Data 📊",
-            "description": "Keep tracking your sessions! I need a bit more data to generate personalized insights.",
-            "score": 50
-        })
-
-    return insights
+    from app.core.insights import run_insights
+    return run_insights(user_id, db).insights
@@ -0,0 +1,277 @@
+"""
+Columnar (NumPy) backend for the stats endpoints.
+
+Sessions and interruptions of the range are fetched in a single UNION ALL
+query as plain integer columns (epoch microseconds, durations) plus the
+interruption type, read from the DBAPI cursor into one structured array,
+and every stat is computed with vectorized operations:
+`bincount` for per-hour/per-weekday counts, and `searchsorted` over sorted
+cumulative sums for the work time each hour of day / weekday receives.
+Same public functions and return dicts as `app.core.stats_logic`.
+
+NumPy is optional (`pip install numpy`); it is only required when this
+backend is selected with STATS_BACKEND=numpy.
+"""
+from datetime import datetime
+from typing import Dict, List
+
+from sqlalchemy import func, literal, null, union_all
+from sqlmodel import Session, select
+
+from app.core.bucketing import DAY_US, EPOCH_WEEKDAY, HOUR_US, to_micros
+from app.core.stats_logic import (
+    _dashboard_result,
+    _get_range_dates,
+    _interruption_types_result,
+    _peak_distraction_result,
+    _productive_hours_result,
+    _summary_result,
+    _weekly_pattern_result,
+)
+from app.core.stats_sql import epoch_micros
+from app.models import Session as WorkSession, Interruption
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+    _ROW_DTYPE = None
+else:
+    # One row of the UNION ALL query
+    _ROW_DTYPE = np.dtype([
+        ("kind", np.int64),
+        ("start_us", np.int64),
+        ("end_us", np.int64),
+        ("lost", np.int64),
+        ("type", object),
+    ])
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("STATS_BACKEND=numpy requires the 'numpy' package")
+
+
+def _cyclic_totals(starts, ends, bucket_us: int, buckets: int, offset: int = 0):
+    """
+    Total microseconds of all intervals [starts[i], ends[i]) falling in each
+    cyclic bucket (see `app.core.bucketing.cyclic_overlap`), as an int64 array.
+
+    With T(t) = time of [0, t) inside bucket k, an interval contributes
+    T(end) - T(start), and T(t) = (t // cycle) * bucket_us + clip(t % cycle
+    - k * bucket_us, 0, bucket_us). The clipped sums are evaluated for every
+    bucket at once over the sorted phases with searchsorted + cumsum.
+    """
+    cycle = bucket_us * buckets
+    edges = np.arange(buckets, dtype=np.int64) * bucket_us
+
+    def position(points):
+        full_cycles, phase = np.divmod(points + offset * bucket_us, cycle)
+        phase.sort()
+        prefix = np.concatenate(([0], np.cumsum(phase)))
+        lo = np.searchsorted(phase, edges, side="right")
+        hi = np.searchsorted(phase, edges + bucket_us, side="left")
+        # Phases inside the bucket add (phase - edge); phases past it add a full bucket
+        partial = (prefix[hi] - prefix[lo]) - (hi - lo) * edges + (len(phase) - hi) * bucket_us
+        return full_cycles, partial
+
+    start_cycles, start_partial = position(starts)
+    end_cycles, end_partial = position(ends)
+    # Cycle counts are differenced per interval first: their raw sums overflow int64
+    full_cycles = int((end_cycles - start_cycles).sum())
+    return full_cycles * bucket_us + end_partial - start_partial
+
+
+class _Columns:
+    """Sessions and interruptions of one user since a given instant, as arrays."""
+
+    def __init__(self, session_start, session_end, interruption_start, interruption_lost, interruption_type):
+        self.session_start = session_start
+        # Unfinished sessions have end == start, so they add no work time
+        self.session_end = session_end
+        self.interruption_start = interruption_start
+        self.interruption_lost = interruption_lost
+        self.interruption_type = interruption_type
+
+    @classmethod
+    def load(cls, user_id: int, db: Session, since: datetime) -> "_Columns":
+        start_us = epoch_micros(WorkSession.start_time)
+        sessions = select(
+            literal(0).label("kind"),
+            start_us.label("start_us"),
+            func.coalesce(epoch_micros(WorkSession.end_time), start_us).label("end_us"),
+            literal(0).label("lost"),
+            null().label("type"),
+        ).where(WorkSession.user_id == user_id, WorkSession.start_time >= since)
+
+        interruptions = select(
+            literal(1),
+            epoch_micros(Interruption.start_time),
+            epoch_micros(Interruption.start_time),
+            func.coalesce(Interruption.duration, 0),
+            func.coalesce(func.nullif(Interruption.type, ""), "unknown"),
+        ).where(Interruption.user_id == user_id, Interruption.start_time >= since)
+
+        result = db.connection().execute(union_all(sessions, interruptions))
+        # The DBAPI cursor's tuples go straight into one structured array
+        # (a single C-level copy): no SQLAlchemy Row objects, no transposing
+        try:
+            table = np.array(result.cursor.fetchall(), dtype=_ROW_DTYPE)
+        finally:
+            result.close()
+
+        is_session = table["kind"] == 0
+        is_interruption = ~is_session
+        return cls(
+            session_start=table["start_us"][is_session],
+            session_end=table["end_us"][is_session],
+            interruption_start=table["start_us"][is_interruption],
+            interruption_lost=np.maximum(table["lost"][is_interruption], 0),
+            interruption_type=table["type"][is_interruption],
+        )
+
+    def clipped_sessions(self, since: datetime, now: datetime):
+        """Session intervals clipped to [since, now]; empty ones are dropped."""
+        starts = np.maximum(self.session_start, to_micros(since))
+        ends = np.minimum(self.session_end, to_micros(now))
+        keep = ends > starts
+        return starts[keep], ends[keep]
+
+    def interruption_hours(self):
+        return np.bincount((self.interruption_start // HOUR_US) % 24, minlength=24)
+
+    def interruption_weekdays(self):
+        return (self.interruption_start // DAY_US + EPOCH_WEEKDAY) % 7
+
+    # ------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------
+
+    def summary(self, user_id: int, range_days: int) -> Dict:
+        worked = np.maximum(self.session_end - self.session_start, 0)
+        return _summary_result(
+            user_id,
+            range_days,
+            total_sessions=len(self.session_start),
+            total_interruptions=len(self.interruption_start),
+            total_time_worked_seconds=int(worked.sum()) / 1_000_000,
+            total_time_lost_seconds=float(self.interruption_lost.sum()),
+        )
+
+    def interruption_types(self, user_id: int, range_days: int) -> Dict:
+        types, counts = np.unique(self.interruption_type.astype(str), return_counts=True)
+        return _interruption_types_result(user_id, range_days, dict(zip(types.tolist(), counts.tolist())))
+
+    def productive_hours(self, user_id: int, range_days: int, since: datetime, now: datetime) -> Dict:
+        work = _cyclic_totals(*self.clipped_sessions(since, now), HOUR_US, 24)
+        interruptions = self.interruption_hours()
+        hours_data = {
+            h: {"work_seconds": int(work[h]) / 1_000_000, "interruptions": int(interruptions[h])}
+            for h in range(24)
+        }
+        return _productive_hours_result(user_id, range_days, hours_data)
+
+    def peak_distraction(self, user_id: int, range_days: int) -> Dict:
+        per_hour: List[int] = self.interruption_hours().tolist()
+        return _peak_distraction_result(user_id, range_days, dict(enumerate(per_hour)))
+
+    def weekly_pattern(self, user_id: int, range_days: int, since: datetime, now: datetime) -> Dict:
+        work = _cyclic_totals(*self.clipped_sessions(since, now), DAY_US, 7, offset=EPOCH_WEEKDAY)
+        weekdays = self.interruption_weekdays()
+        interruptions = np.bincount(weekdays, minlength=7)
+        lost = np.bincount(weekdays, weights=self.interruption_lost, minlength=7)
+        weekly_data = {
+            i: {
+                "work_seconds": int(work[i]) / 1_000_000,
+                "time_lost_seconds": float(lost[i]),
+                "interruptions": int(interruptions[i]),
+            }
+            for i in range(7)
+        }
+        return _weekly_pattern_result(user_id, range_days, weekly_data)
+
+
+def _load(user_id: int, db: Session, range_days: int):
+    _require_numpy()
+    since, now = _get_range_dates(range_days)
+    return _Columns.load(user_id, db, since), since, now
+
+
+def get_summary_stats(
+    user_id: int,
+    db: Session,
+    range_days: int = 7,
+) -> Dict:
+    """
+    Calculates general user statistics for a given date range.
+    """
+    columns, _, _ = _load(user_id, db, range_days)
+    return columns.summary(user_id, range_days)
+
+
+def get_interruption_type_stats(
+    user_id: int,
+    db: Session,
+    range_days: int = 7,
+) -> Dict:
+    """
+    Calculates interruption statistics by type.
+    """
+    columns, _, _ = _load(user_id, db, range_days)
+    return columns.interruption_types(user_id, range_days)
+
+
+def get_productive_hours_stats(
+    user_id: int,
+    db: Session,
+    range_days: int = 7,
+) -> Dict:
+    """
+    Calculates work time and interruptions per hour of day (0-23).
+    """
+    columns, since, now = _load(user_id, db, range_days)
+    return columns.productive_hours(user_id, range_days, since, now)
+
+
+def get_peak_distraction_hour(
+    user_id: int,
+    db: Session,
+    range_days: int = 7,
+) -> Dict:
+    """
+    Finds the hour of day with the most interruptions.
+    """
+    columns, _, _ = _load(user_id, db, range_days)
+    return columns.peak_distraction(user_id, range_days)
+
+
+def get_weekly_pattern(
+    user_id: int,
+    db: Session,
+    range_days: int = 7,
+) -> Dict:
+    """
+    Calculates weekly work and interruption patterns.
+    """
+    columns, since, now = _load(user_id, db, range_days)
+    return columns.weekly_pattern(user_id, range_days, since, now)
+
+
+def get_dashboard_stats(
+    user_id: int,
+    db: Session,
+    range_days: int = 7,
+) -> Dict:
+    """
+    Dashboard payload computed from a single load of the range's columns.
+    """
+    columns, since, now = _load(user_id, db, range_days)
+    return _dashboard_result(
+        user_id,
+        range_days,
+        summary=columns.summary(user_id, range_days),
+        interruption_types=columns.interruption_types(user_id, range_days),
+        productive_hours=columns.productive_hours(user_id, range_days, since, now),
+        peak_distraction=columns.peak_distraction(user_id, range_days),
+        weekly_pattern=columns.weekly_pattern(user_id, range_days, since, now),
+    )
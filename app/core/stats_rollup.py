@@ -0,0 +1,218 @@
+"""
+Rollup backend for the stats endpoints.
+
+Reads the precomputed `HourlyRollup` / `HourlyTypeRollup` rows instead of the
+raw sessions and interruptions, so a request costs O(hour buckets) rows
+(at most ~8,760 for a year) instead of O(events). Returns the same dicts as
+`app.core.stats_logic`.
+
+Precision is one hour: the bucket containing the start of the range is counted
+whole, and work time is attributed to the hours in which it happened.
+"""
+from datetime import datetime
+from typing import Dict
+
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from app.core.rollups import bucket_start
+from app.core.stats_logic import (
+    _dashboard_result,
+    _get_range_dates,
+    _interruption_types_result,
+    _peak_distraction_result,
+    _productive_hours_result,
+    _summary_result,
+    _weekly_pattern_result,
+)
+from app.core.stats_sql import hour_of, weekday_of
+from app.models import HourlyRollup, HourlyTypeRollup
+
+
+def _range_start_bucket(range_days: int) -> datetime:
+    since, _ = _get_range_dates(range_days)
+    return bucket_start(since)
+
+
+def _summary(user_id: int, db: Session, range_days: int, first_bucket: datetime) -> Dict:
+    query = select(
+        func.coalesce(func.sum(HourlyRollup.sessions_started), 0),
+        func.coalesce(func.sum(HourlyRollup.interruptions), 0),
+        func.coalesce(func.sum(HourlyRollup.session_seconds), 0.0),
+        func.coalesce(func.sum(HourlyRollup.lost_seconds), 0),
+    ).where(
+        HourlyRollup.user_id == user_id,
+        HourlyRollup.bucket_start >= first_bucket,
+    )
+    total_sessions, total_interruptions, total_time_worked_seconds, total_time_lost_seconds = (
+        db.exec(query).one()
+    )
+
+    return _summary_result(
+        user_id,
+        range_days,
+        total_sessions=total_sessions,
+        total_interruptions=total_interruptions,
+        total_time_worked_seconds=total_time_worked_seconds,
+        total_time_lost_seconds=float(total_time_lost_seconds),
+    )
+
+
+def get_summary_stats(
+    user_id: int,
+    db: Session,
+    range_days: int = 7,
+) -> Dict:
+    """
+    Calculates general user statistics for a given date range.
+    """
+    return _summary(user_id, db, range_days, _range_start_bucket(range_days))
+
+
+def _interruption_types(user_id: int, db: Session, range_days: int, first_bucket: datetime) -> Dict:
+    query = (
+        select(HourlyTypeRollup.type, func.sum(HourlyTypeRollup.interruptions))
+        .where(
+            HourlyTypeRollup.user_id == user_id,
+            HourlyTypeRollup.bucket_start >= first_bucket,
+        )
+        .group_by(HourlyTypeRollup.type)
+    )
+    counts: Dict[str, int] = {it_type: count for it_type, count in db.exec(query).all() if count}
+
+    return _interruption_types_result(user_id, range_days, counts)
+
+
+def get_interruption_type_stats(
+    user_id: int,
+    db: Session,
+    range_days: int = 7,
+) -> Dict:
+    """
+    Calculates interruption statistics by type.
+    """
+    return _interruption_types(user_id, db, range_days, _range_start_bucket(range_days))
+
+
+def _hours_data(user_id: int, db: Session, first_bucket: datetime) -> Dict[int, Dict]:
+    """Work seconds and interruptions per hour of day (0-23)."""
+    hour_col = hour_of(HourlyRollup.bucket_start)
+    query = (
+        select(hour_col, func.sum(HourlyRollup.work_seconds), func.sum(HourlyRollup.interruptions))
+        .where(
+            HourlyRollup.user_id == user_id,
+            HourlyRollup.bucket_start >= first_bucket,
+        )
+        .group_by(hour_col)
+    )
+
+    hours_data = {h: {"work_seconds": 0.0, "interruptions": 0} for h in range(24)}
+    for hour, work_seconds, interruptions in db.exec(query).all():
+        hours_data[hour] = {"work_seconds": work_seconds, "interruptions": interruptions}
+    return hours_data
+
+
+def _peak_distraction(user_id: int, range_days: int, hours_data: Dict[int, Dict]) -> Dict:
+    interruptions_per_hour = {h: hours_data[h]["interruptions"] for h in range(24)}
+    return _peak_distraction_result(user_id, range_days, interruptions_per_hour)
+
+
+def get_productive_hours_stats(
+    user_id: int,
+    db: Session,
+    range_days: int = 7,
+) -> Dict:
+    """
+    Calculates work time and interruptions per hour of day (0-23).
+    """
+    hours_data = _hours_data(user_id, db, _range_start_bucket(range_days))
+    return _productive_hours_result(user_id, range_days, hours_data)
+
+
+def get_peak_distraction_hour(
+    user_id: int,
+    db: Session,
+    range_days: int = 7,
+) -> Dict:
+    """
+    Finds the hour of day with the most interruptions.
+    """
+    hour_col = hour_of(HourlyRollup.bucket_start)
+    query = (
+        select(hour_col, func.sum(HourlyRollup.interruptions))
+        .where(
+            HourlyRollup.user_id == user_id,
+            HourlyRollup.bucket_start >= _range_start_bucket(range_days),
+        )
+        .group_by(hour_col)
+    )
+
+    interruptions_per_hour = {h: 0 for h in range(24)}
+    for hour, count in db.exec(query).all():
+        interruptions_per_hour[hour] = count
+
+    return _peak_distraction_result(user_id, range_days, interruptions_per_hour)
+
+
+def _weekly_pattern(user_id: int, db: Session, range_days: int, first_bucket: datetime) -> Dict:
+    weekday_col = weekday_of(HourlyRollup.bucket_start)
+    query = (
+        select(
+            weekday_col,
+            func.sum(HourlyRollup.work_seconds),
+            func.sum(HourlyRollup.lost_seconds),
+            func.sum(HourlyRollup.interruptions),
+        )
+        .where(
+            HourlyRollup.user_id == user_id,
+            HourlyRollup.bucket_start >= first_bucket,
+        )
+        .group_by(weekday_col)
+    )
+
+    weekly_data = {
+        i: {"work_seconds": 0.0, "time_lost_seconds": 0.0, "interruptions": 0}
+        for i in range(7)
+    }
+    for weekday, work_seconds, lost_seconds, interruptions in db.exec(query).all():
+        weekly_data[weekday] = {
+            "work_seconds": work_seconds,
+            "time_lost_seconds": float(lost_seconds),
+            "interruptions": interruptions,
+        }
+
+    return _weekly_pattern_result(user_id, range_days, weekly_data)
+
+
+def get_weekly_pattern(
+    user_id: int,
+    db: Session,
+    range_days: int = 7,
+) -> Dict:
+    """
+    Calculates weekly work and interruption patterns.
+    """
+    return _weekly_pattern(user_id, db, range_days, _range_start_bucket(range_days))
+
+
+def get_dashboard_stats(
+    user_id: int,
+    db: Session,
+    range_days: int = 7,
+) -> Dict:
+    """
+    Dashboard payload for one range start. The per-hour query feeds both
+    the productive hours and the peak distraction hour.
+    """
+    first_bucket = _range_start_bucket(range_days)
+    hours_data = _hours_data(user_id, db, first_bucket)
+
+    return _dashboard_result(
+        user_id,
+        range_days,
+        summary=_summary(user_id, db, range_days, first_bucket),
+        interruption_types=_interruption_types(user_id, db, range_days, first_bucket),
+        productive_hours=_productive_hours_result(user_id, range_days, hours_data),
+        peak_distraction=_peak_distraction(user_id, range_days, hours_data),
+        weekly_pattern=_weekly_pattern(user_id, db, range_days, first_bucket),
+    )
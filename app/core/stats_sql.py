@@ -0,0 +1,362 @@
+"""
+SQL aggregation backend for the stats endpoints.
+
+Same public functions and return dicts as `app.core.stats_logic`, but the
+totals, per-type counts and the interruption counts and lost time per hour
+and weekday are computed by the database (SUM / COUNT / GROUP BY) instead
+of hydrating every row in Python. Session time per hour of day / weekday
+is split from one (start, end) integer pair per finished session with the
+closed-form `bucketing` helpers, since an interval spanning several buckets
+has no portable GROUP BY. `stats_logic` stays as the reference
+implementation.
+"""
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from sqlalchemy import Integer, and_, case, func, literal
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+from sqlmodel import Session, select
+
+from app.core.bucketing import DAY_US, EPOCH_WEEKDAY, HOUR_US, cyclic_overlap, to_micros
+from app.core.stats_logic import (
+    _dashboard_result,
+    _get_range_dates,
+    _interruption_types_result,
+    _peak_distraction_result,
+    _productive_hours_result,
+    _summary_result,
+    _weekly_pattern_result,
+)
+from app.models import Session as WorkSession, Interruption
+
+
+# ============================================================
+# Dialect-specific datetime functions
+# ============================================================
+
+class hour_of(FunctionElement):
+    """Hour of day (0-23) of a datetime column."""
+    type = Integer()
+    inherit_cache = True
+
+
+class weekday_of(FunctionElement):
+    """Day of week of a datetime column, Monday=0 (same as datetime.weekday())."""
+    type = Integer()
+    inherit_cache = True
+
+
+class epoch_micros(FunctionElement):
+    """Microseconds since the Unix epoch of a datetime column (exact integer)."""
+    type = Integer()
+    inherit_cache = True
+
+
+# SQLite's strftime() rounds fractional seconds to milliseconds, so every
+# SQLite variant truncates the stored value to whole seconds first.
+
+@compiles(hour_of, "sqlite")
+def _hour_of_sqlite(element, compiler, **kw):
+    return "CAST(strftime('%%H', substr(%s, 1, 19)) AS INTEGER)" % compiler.process(
+        element.clauses, **kw
+    )
+
+
+@compiles(hour_of, "postgresql")
+def _hour_of_postgresql(element, compiler, **kw):
+    return "CAST(EXTRACT(HOUR FROM %s) AS INTEGER)" % compiler.process(element.clauses, **kw)
+
+
+@compiles(weekday_of, "sqlite")
+def _weekday_of_sqlite(element, compiler, **kw):
+    # strftime('%w') is 0=Sunday; shift to Monday=0
+    return "((CAST(strftime('%%w', substr(%s, 1, 19)) AS INTEGER) + 6) %% 7)" % compiler.process(
+        element.clauses, **kw
+    )
+
+
+@compiles(weekday_of, "postgresql")
+def _weekday_of_postgresql(element, compiler, **kw):
+    return "(CAST(EXTRACT(ISODOW FROM %s) AS INTEGER) - 1)" % compiler.process(
+        element.clauses, **kw
+    )
+
+
+@compiles(epoch_micros, "sqlite")
+def _epoch_micros_sqlite(element, compiler, **kw):
+    # SQLAlchemy stores SQLite datetimes as 'YYYY-MM-DD HH:MM:SS.ffffff'
+    col = compiler.process(element.clauses, **kw)
+    return (
+        "(CAST(strftime('%%s', substr(%s, 1, 19)) AS INTEGER) * 1000000"
+        " + CAST(substr(%s, 21, 6) AS INTEGER))" % (col, col)
+    )
+
+
+@compiles(epoch_micros, "postgresql")
+def _epoch_micros_postgresql(element, compiler, **kw):
+    return "CAST(EXTRACT(EPOCH FROM %s) * 1000000 AS BIGINT)" % compiler.process(
+        element.clauses, **kw
+    )
+
+
+# ============================================================
+# Stats
+# ============================================================
+
+def _session_totals(user_id: int, db: Session, since: datetime) -> Tuple[int, int]:
+    """Number of sessions of the range and microseconds worked in the finished ones."""
+    worked_micros = epoch_micros(WorkSession.end_time) - epoch_micros(WorkSession.start_time)
+    query = select(
+        func.count(WorkSession.id),
+        func.coalesce(
+            func.sum(
+                case(
+                    (and_(WorkSession.end_time.is_not(None), worked_micros > 0), worked_micros),
+                    else_=literal(0),
+                )
+            ),
+            0,
+        ),
+    ).where(
+        WorkSession.user_id == user_id,
+        WorkSession.start_time >= since,
+    )
+    total_sessions, worked_total_micros = db.exec(query).one()
+    return total_sessions, worked_total_micros
+
+
+def _summary(
+    user_id: int, range_days: int, session_totals: Tuple[int, int], interruption_totals: Tuple[int, int]
+) -> Dict:
+    total_sessions, worked_total_micros = session_totals
+    total_interruptions, total_time_lost_seconds = interruption_totals
+    return _summary_result(
+        user_id,
+        range_days,
+        total_sessions=total_sessions,
+        total_interruptions=total_interruptions,
+        total_time_worked_seconds=worked_total_micros / 1_000_000,
+        total_time_lost_seconds=float(total_time_lost_seconds),
+    )
+
+
+def get_summary_stats(
+    user_id: int,
+    db: Session,
+    range_days: int = 7,
+) -> Dict:
+    """
+    Calculates general user statistics for a given date range.
+    """
+    since, _ = _get_range_dates(range_days)
+
+    interruptions_query = select(
+        func.count(Interruption.id),
+        func.coalesce(
+            func.sum(case((Interruption.duration > 0, Interruption.duration), else_=literal(0))),
+            0,
+        ),
+    ).where(
+        Interruption.user_id == user_id,
+        Interruption.start_time >= since,
+    )
+    interruption_totals = db.exec(interruptions_query).one()
+
+    return _summary(user_id, range_days, _session_totals(user_id, db, since), interruption_totals)
+
+
+def _type_counts(user_id: int, db: Session, since: datetime) -> Dict[str, int]:
+    type_col = case(
+        (func.coalesce(Interruption.type, "") == "", literal("unknown")),
+        else_=Interruption.type,
+    )
+    query = (
+        select(type_col, func.count(Interruption.id))
+        .where(
+            Interruption.user_id == user_id,
+            Interruption.start_time >= since,
+        )
+        .group_by(type_col)
+    )
+    return {it_type: count for it_type, count in db.exec(query).all()}
+
+
+def get_interruption_type_stats(
+    user_id: int,
+    db: Session,
+    range_days: int = 7,
+) -> Dict:
+    """
+    Calculates interruption statistics by type.
+    """
+    since, _ = _get_range_dates(range_days)
+    return _interruption_types_result(user_id, range_days, _type_counts(user_id, db, since))
+
+
+def _finished_sessions_micros(
+    user_id: int, db: Session, since: datetime, now: datetime
+) -> List[Tuple[int, int]]:
+    """(start, end) in epoch microseconds of the range's finished sessions, clipped to [since, now]."""
+    query = select(epoch_micros(WorkSession.start_time), epoch_micros(WorkSession.end_time)).where(
+        WorkSession.user_id == user_id,
+        WorkSession.start_time >= since,
+        WorkSession.end_time.is_not(None),
+    )
+    since_us, now_us = to_micros(since), to_micros(now)
+    intervals = []
+    for start_us, end_us in db.exec(query):
+        start_us, end_us = max(start_us, since_us), min(end_us, now_us)
+        if end_us > start_us:
+            intervals.append((start_us, end_us))
+    return intervals
+
+
+def _work_seconds(intervals: List[Tuple[int, int]], bucket_us: int, buckets: int, offset: int = 0) -> List[float]:
+    """Seconds of the intervals falling in each cyclic bucket."""
+    totals = [0] * buckets
+    for start_us, end_us in intervals:
+        for index, micros in enumerate(cyclic_overlap(start_us, end_us, bucket_us, buckets, offset)):
+            totals[index] += micros
+    return [micros / 1_000_000 for micros in totals]
+
+
+def _interruptions_per_hour(user_id: int, db: Session, since: datetime) -> Dict[int, int]:
+    hour_col = hour_of(Interruption.start_time)
+    query = (
+        select(hour_col, func.count(Interruption.id))
+        .where(
+            Interruption.user_id == user_id,
+            Interruption.start_time >= since,
+        )
+        .group_by(hour_col)
+    )
+
+    interruptions_per_hour = {h: 0 for h in range(24)}
+    for hour, count in db.exec(query).all():
+        interruptions_per_hour[hour] = count
+    return interruptions_per_hour
+
+
+def _interruptions_per_weekday(user_id: int, db: Session, since: datetime) -> Dict[int, Tuple[int, float]]:
+    """(interruptions, seconds lost) per weekday (0 = Monday)."""
+    weekday_col = weekday_of(Interruption.start_time)
+    query = (
+        select(
+            weekday_col,
+            func.count(Interruption.id),
+            func.coalesce(
+                func.sum(case((Interruption.duration > 0, Interruption.duration), else_=literal(0))),
+                0,
+            ),
+        )
+        .where(
+            Interruption.user_id == user_id,
+            Interruption.start_time >= since,
+        )
+        .group_by(weekday_col)
+    )
+
+    per_weekday = {i: (0, 0.0) for i in range(7)}
+    for weekday, count, lost_seconds in db.exec(query).all():
+        per_weekday[weekday] = (count, float(lost_seconds))
+    return per_weekday
+
+
+def _productive_hours(
+    user_id: int, range_days: int, intervals: List[Tuple[int, int]], interruptions: Dict[int, int]
+) -> Dict:
+    work = _work_seconds(intervals, HOUR_US, 24)
+    hours_data = {
+        h: {"work_seconds": work[h], "interruptions": interruptions[h]}
+        for h in range(24)
+    }
+    return _productive_hours_result(user_id, range_days, hours_data)
+
+
+def _weekly_pattern(
+    user_id: int, range_days: int, intervals: List[Tuple[int, int]], per_weekday: Dict[int, Tuple[int, float]]
+) -> Dict:
+    work = _work_seconds(intervals, DAY_US, 7, offset=EPOCH_WEEKDAY)
+    weekly_data = {
+        i: {"work_seconds": work[i], "time_lost_seconds": per_weekday[i][1], "interruptions": per_weekday[i][0]}
+        for i in range(7)
+    }
+    return _weekly_pattern_result(user_id, range_days, weekly_data)
+
+
+def get_productive_hours_stats(
+    user_id: int,
+    db: Session,
+    range_days: int = 7,
+) -> Dict:
+    """
+    Calculates work time and interruptions per hour of day (0-23).
+    """
+    since, now = _get_range_dates(range_days)
+    return _productive_hours(
+        user_id,
+        range_days,
+        _finished_sessions_micros(user_id, db, since, now),
+        _interruptions_per_hour(user_id, db, since),
+    )
+
+
+def get_peak_distraction_hour(
+    user_id: int,
+    db: Session,
+    range_days: int = 7,
+) -> Dict:
+    """
+    Finds the hour of day with the most interruptions.
+    """
+    since, _ = _get_range_dates(range_days)
+    return _peak_distraction_result(user_id, range_days, _interruptions_per_hour(user_id, db, since))
+
+
+def get_weekly_pattern(
+    user_id: int,
+    db: Session,
+    range_days: int = 7,
+) -> Dict:
+    """
+    Calculates weekly work and interruption patterns.
+    """
+    since, now = _get_range_dates(range_days)
+    return _weekly_pattern(
+        user_id,
+        range_days,
+        _finished_sessions_micros(user_id, db, since, now),
+        _interruptions_per_weekday(user_id, db, since),
+    )
+
+
+def get_dashboard_stats(
+    user_id: int,
+    db: Session,
+    range_days: int = 7,
+) -> Dict:
+    """
+    Dashboard payload for one (since, now) window. Each aggregate query runs
+    once and feeds every sub-result that needs it: the finished sessions
+    (hours and weekdays), the per-hour counts (hours and peak) and the
+    per-weekday counts (weekdays and the summary's interruption totals).
+    """
+    since, now = _get_range_dates(range_days)
+    intervals = _finished_sessions_micros(user_id, db, since, now)
+    per_hour = _interruptions_per_hour(user_id, db, since)
+    per_weekday = _interruptions_per_weekday(user_id, db, since)
+    interruption_totals = (
+        sum(count for count, _ in per_weekday.values()),
+        sum(lost for _, lost in per_weekday.values()),
+    )
+
+    return _dashboard_result(
+        user_id,
+        range_days,
+        summary=_summary(user_id, range_days, _session_totals(user_id, db, since), interruption_totals),
+        interruption_types=_interruption_types_result(user_id, range_days, _type_counts(user_id, db, since)),
+        productive_hours=_productive_hours(user_id, range_days, intervals, per_hour),
+        peak_distraction=_peak_distraction_result(user_id, range_days, per_hour),
+        weekly_pattern=_weekly_pattern(user_id, range_days, intervals, per_weekday),
+    )
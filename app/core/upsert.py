@@ -0,0 +1,48 @@
+"""
+Atomic counter upserts: `INSERT ... ON CONFLICT DO UPDATE SET col = col +
+excluded.col`, so concurrent writers neither lose increments nor collide on
+the unique key when the row does not exist yet.
+"""
+from typing import List, Sequence
+
+from sqlalchemy import insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session
+
+# Rows per multi-row upsert (keeps SQLite under its bound-parameter limit)
+UPSERT_BATCH_SIZE = 500
+# Dialects with INSERT ... ON CONFLICT DO UPDATE
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def upsert_counters(db: Session, model, rows: List[dict], keys: Sequence[str], counters: Sequence[str]) -> None:
+    """
+    Adds `counters` of each row to the row with the same `keys`, inserting it
+    if missing. One multi-row `INSERT ... ON CONFLICT DO UPDATE` per batch on
+    SQLite and PostgreSQL; elsewhere an atomic `UPDATE col = col + delta`
+    per row, with an INSERT when it matched nothing.
+    """
+    if not rows:
+        return
+    table = model.__table__
+    dialect_insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+
+    if dialect_insert is not None:
+        for offset in range(0, len(rows), UPSERT_BATCH_SIZE):
+            statement = dialect_insert(table).values(rows[offset:offset + UPSERT_BATCH_SIZE])
+            db.exec(
+                statement.on_conflict_do_update(
+                    index_elements=list(keys),
+                    set_={name: table.c[name] + statement.excluded[name] for name in counters},
+                )
+            )
+        return
+
+    for row in rows:
+        result = db.exec(
+            update(table)
+            .where(*(table.c[key] == row[key] for key in keys))
+            .values({name: table.c[name] + row[name] for name in counters})
+        )
+        if result.rowcount == 0:
+            db.exec(insert(table).values(row))
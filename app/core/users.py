@@ -0,0 +1,25 @@
+"""
+User queries shared by the auth and users routers. They are sync and meant
+for `run_in_threadpool` from the async handlers, which await password
+hashing in between.
+"""
+from typing import Optional
+
+from sqlmodel import Session, select
+
+from app.models import User
+
+
+def get_user_by_email(session: Session, email: str) -> Optional[User]:
+    """Looks the user up and gives the connection back to the pool while the password is hashed."""
+    user = session.exec(select(User).where(User.email == email)).first()
+    session.close()
+    return user
+
+
+def save_user(session: Session, user: User) -> User:
+    """Adds or updates the user and returns it refreshed."""
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
@@ -1,29 +1,87 @@
-from typing import Generator
+from typing import AsyncGenerator, Dict, Generator
 
-from sqlmodel import SQLModel, Session, create_engine
-from typing import Generator
-
-from sqlmodel import SQLModel, Session, create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 from .models import User, Session as WorkSession, Interruption  # 👈 añade esta línea
 
 
 from app.core.config import settings
+from app.core.engine_config import configure_engine, engine_options
+from app.migrations import migrate
 
 # Use the DATABASE_URL from settings (which reads from env vars)
 # If it starts with "postgres://", replace it with "postgresql://" for SQLAlchemy compatibility
-DATABASE_URL = settings.DATABASE_URL
-if DATABASE_URL.startswith("postgres://"):
-    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
+def _normalize_url(url: str) -> str:
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql://", 1)
+    return url
+
+
+DATABASE_URL = _normalize_url(settings.DATABASE_URL)
+# Optional read replica for the stats and listing endpoints
+READ_DATABASE_URL = _normalize_url(settings.READ_DATABASE_URL) if settings.READ_DATABASE_URL else None
+
+# Configure engine based on DB type (pool, pragmas, timeouts: see engine_config)
+def create_db_engine(url: str = DATABASE_URL, **engine_kwargs) -> Engine:
+    options = {**engine_options(url), **engine_kwargs}
+    return configure_engine(create_engine(url, echo=False, **options))
+
+
+engine = create_db_engine()
+read_engine = create_db_engine(READ_DATABASE_URL) if READ_DATABASE_URL else None
+
+# Async drivers used when DB_ASYNC is enabled
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def get_async_database_url(url: str) -> str:
+    """Same database URL with the async driver of its dialect."""
+    scheme, rest = url.split("://", 1)
+    dialect = scheme.split("+", 1)[0]
+    if dialect not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{dialect}' databases")
+    return f"{ASYNC_DRIVERS[dialect]}://{rest}"
+
+
+def create_async_db_engine(url: str = DATABASE_URL, **engine_kwargs) -> AsyncEngine:
+    async_url = get_async_database_url(url)
+    options = {**engine_options(async_url), **engine_kwargs}
+    async_engine = create_async_engine(async_url, echo=False, **options)
+    configure_engine(async_engine.sync_engine)
+    return async_engine
 
-# Configure engine based on DB type
-connect_args = {"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
 
-engine = create_engine(
-    DATABASE_URL,
-    echo=False,
-    connect_args=connect_args,
+# Only built in async mode, so the async drivers stay optional
+async_engine = create_async_db_engine() if settings.DB_ASYNC else None
+async_read_engine = (
+    create_async_db_engine(READ_DATABASE_URL) if settings.DB_ASYNC and READ_DATABASE_URL else None
 )
 
+# Sync twins of the async engines, for the stats work the async router runs in worker threads
+_sync_engines: Dict[AsyncEngine, Engine] = {}
+if async_engine is not None:
+    _sync_engines[async_engine] = engine
+if async_read_engine is not None:
+    _sync_engines[async_read_engine] = read_engine
+
+
+def get_sync_engine(async_engine: AsyncEngine) -> Engine:
+    """
+    Sync engine on the same database as `async_engine`. The app's async
+    engines map to its sync ones (and their pools); any other gets one
+    created on first use.
+    """
+    if async_engine not in _sync_engines:
+        url = async_engine.url.set(drivername=async_engine.dialect.name)
+        _sync_engines[async_engine] = create_db_engine(url.render_as_string(hide_password=False))
+    return _sync_engines[async_engine]
+
+
 # Log the database we are connecting to (security safe)
 if "sqlite" in DATABASE_URL:
     print(f"💽 Database: SQLite (Local)")
@@ -31,14 +89,16 @@ else:
     # Hide password, show host
     safe_url = DATABASE_URL.split("@")[-1]
     print(f"🐘 Database: PostgreSQL ({safe_url})")
+if READ_DATABASE_URL:
+    print(f"📖 Read replica: {READ_DATABASE_URL.split('@')[-1]}")
 
 
 def create_db_and_tables() -> None:
     """
-    Crea todas las tablas definidas en los modelos SQLModel.
-    Esta función se llamará al iniciar la aplicación.
+    Lleva el esquema a la última versión aplicando las migraciones
+    pendientes (ver app/migrations). Se llama al iniciar la aplicación.
     """
-    SQLModel.metadata.create_all(engine)
+    migrate(engine)
 
 
 def get_session() -> Generator[Session, None, None]:
@@ -48,3 +108,13 @@ def get_session() -> Generator[Session, None, None]:
     """
     with Session(engine) as session:
         yield session
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependencia asíncrona: sesión sobre el engine async (modo DB_ASYNC).
+    """
+    if async_engine is None:
+        raise RuntimeError("The async engine is only available with DB_ASYNC=true")
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
@@ -1,5 +1,5 @@
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
@@ -7,9 +7,14 @@ from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 
 from app.core.config import settings
-from app.core.logging_config import setup_logging
-from app.db import create_db_and_tables
-from app.routers import auth, users, sessions, interruptions, stats
+from app.core.deps import require_metrics_token
+from app.core.hashing import hashing_pool
+from app.core.logging_config import setup_logging, shutdown_logging
+from app.core.metrics import CONTENT_TYPE, MetricsMiddleware, instrument_engines, metrics, track_pool
+from app.core.profiling import ProfilingMiddleware, install_profiling
+from app.core.sampler import SamplingProfilerMiddleware
+from app.db import async_engine, async_read_engine, create_db_and_tables, engine, read_engine
+from app.routers import auth, users, sessions, interruptions, stats, export, profiler
 
 # Setup Rate Limiter
 limiter = Limiter(key_func=get_remote_address)
@@ -20,10 +25,13 @@ async def lifespan(app: FastAPI):
     Lifespan context:
     - Setup Logging
     - Creates DB tables on startup
+    - Stops the password hashing pool and flushes the logs on shutdown
     """
     setup_logging()
     create_db_and_tables()
     yield
+    hashing_pool.shutdown()
+    shutdown_logging()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -45,8 +53,32 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Keyset pagination of the list endpoints (app/core/pagination.py)
+    expose_headers=["X-Next-Cursor", "Link"],
 )
 
+# Superuser stack sampling of one request (?__profile=1)
+if settings.SAMPLING_PROFILER_ENABLED:
+    app.add_middleware(SamplingProfilerMiddleware)
+
+# Per-request Server-Timing and slow-request log
+if settings.REQUEST_PROFILING:
+    app.add_middleware(ProfilingMiddleware)
+    install_profiling()
+
+# Metrics (outermost, so the latency includes the other middlewares)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    instrument_engines()
+    for name, pool_engine in (
+        ("primary", engine),
+        ("replica", read_engine),
+        ("async_primary", async_engine),
+        ("async_replica", async_read_engine),
+    ):
+        if pool_engine is not None:
+            track_pool(name, pool_engine)
+
 @app.get("/", tags=["health"])
 def read_root():
     return {"message": "HyperFocus API is running 🚀"}
@@ -55,9 +87,21 @@ def read_root():
 def health_check():
     return {"status": "ok"}
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", tags=["health"], include_in_schema=False, dependencies=[Depends(require_metrics_token)])
+    def read_metrics():
+        return Response(metrics.render(), media_type=CONTENT_TYPE)
+
 # Routers
 app.include_router(auth.router, prefix=settings.API_V1_STR, tags=["auth"])
 app.include_router(users.router, prefix=settings.API_V1_STR)
 app.include_router(sessions.router, prefix=settings.API_V1_STR)
 app.include_router(interruptions.router, prefix=settings.API_V1_STR)
-app.include_router(stats.router, prefix=settings.API_V1_STR)
+app.include_router(export.router, prefix=settings.API_V1_STR)
+if settings.SAMPLING_PROFILER_ENABLED:
+    app.include_router(profiler.router, prefix=settings.API_V1_STR)
+if settings.DB_ASYNC:
+    from app.routers import stats_async
+    app.include_router(stats_async.router, prefix=settings.API_V1_STR)
+else:
+    app.include_router(stats.router, prefix=settings.API_V1_STR)
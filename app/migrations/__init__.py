@@ -0,0 +1,142 @@
+"""
+Versioned schema migrations.
+
+Each module `vNNNN_<name>.py` of this package is one migration with a
+`DESCRIPTION` and an `upgrade(connection)` function; NNNN is its version.
+Applied versions are recorded in the `schema_migrations` table and
+`migrate()` runs the pending ones in order, each in its own transaction
+(on PostgreSQL under an advisory lock, so several workers can start at
+once). A migration that cannot run in a transaction (e.g. `CREATE INDEX
+CONCURRENTLY`) sets `TRANSACTIONAL = False` and is applied in autocommit
+mode under a session-level advisory lock instead.
+
+Migrations spell out their DDL instead of reading `app.models`, so a
+version always means the same schema; v0001 is the schema from before
+migrations existed. Databases created back then with `create_all` may
+already have later changes, so every migration must be idempotent
+(`IF NOT EXISTS`, `IF EXISTS`, `checkfirst`, inspecting before altering).
+"""
+import importlib
+import pkgutil
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from types import ModuleType
+from typing import Callable, List, Optional, Set
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+
+# Arbitrary key of the PostgreSQL advisory lock taken while migrating
+MIGRATION_LOCK_ID = 7_231_845
+
+_MODULE_NAME = re.compile(r"^v(\d{4})_\w+$")
+
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("description", String(200), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    upgrade: Callable[[Connection], None]
+    transactional: bool = True
+
+
+def _load(module: ModuleType, version: int) -> Migration:
+    return Migration(
+        version=version,
+        description=module.DESCRIPTION,
+        upgrade=module.upgrade,
+        transactional=getattr(module, "TRANSACTIONAL", True),
+    )
+
+
+def get_migrations() -> List[Migration]:
+    """Every migration of the package, by version."""
+    migrations = []
+    for info in pkgutil.iter_modules(__path__):
+        match = _MODULE_NAME.match(info.name)
+        if match:
+            module = importlib.import_module(f"{__name__}.{info.name}")
+            migrations.append(_load(module, int(match.group(1))))
+    migrations.sort(key=lambda m: m.version)
+    versions = [m.version for m in migrations]
+    if len(set(versions)) != len(versions):
+        raise RuntimeError(f"Duplicate migration versions: {versions}")
+    return migrations
+
+
+def applied_versions(connection: Connection) -> Set[int]:
+    schema_migrations.create(connection, checkfirst=True)
+    return set(connection.execute(select(schema_migrations.c.version)).scalars())
+
+
+def current_version(engine: Engine) -> int:
+    """Highest applied version (0 for a database that was never migrated)."""
+    with engine.begin() as connection:
+        return max(applied_versions(connection), default=0)
+
+
+def _lock(connection: Connection) -> None:
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_ID})
+
+
+def _apply(connection: Connection, migration: Migration) -> bool:
+    """Runs the migration and records it, unless it was already applied."""
+    # Re-checked under the lock: another worker may have applied it
+    if migration.version in applied_versions(connection):
+        return False
+    migration.upgrade(connection)
+    connection.execute(
+        insert(schema_migrations).values(
+            version=migration.version,
+            description=migration.description,
+            applied_at=datetime.now(timezone.utc),
+        )
+    )
+    return True
+
+
+def _apply_in_transaction(engine: Engine, migration: Migration) -> bool:
+    with engine.begin() as connection:
+        _lock(connection)
+        return _apply(connection, migration)
+
+
+def _apply_autocommit(engine: Engine, migration: Migration) -> bool:
+    with engine.connect() as connection:
+        connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+        postgresql = connection.dialect.name == "postgresql"
+        if postgresql:
+            connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_ID})
+        try:
+            return _apply(connection, migration)
+        finally:
+            if postgresql:
+                connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_ID})
+
+
+def migrate(engine: Engine, target: Optional[int] = None) -> List[Migration]:
+    """Applies the pending migrations (up to `target`). Returns the ones applied."""
+    applied: List[Migration] = []
+    for migration in get_migrations():
+        if target is not None and migration.version > target:
+            break
+        apply = _apply_in_transaction if migration.transactional else _apply_autocommit
+        try:
+            if not apply(engine, migration):
+                continue
+        except IntegrityError:
+            # SQLite has no advisory lock: a concurrent worker recorded it first
+            continue
+        applied.append(migration)
+    return applied
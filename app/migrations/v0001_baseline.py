@@ -0,0 +1,74 @@
+"""
+Baseline: the schema from before versioned migrations existed (users,
+sessions and interruptions with their single-column indexes).
+
+The tables are spelled out here rather than taken from `app.models`, so
+this version means the same schema forever; later changes go in later
+migrations. `checkfirst` skips the tables a database already has.
+"""
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+)
+from sqlalchemy.engine import Connection
+
+DESCRIPTION = "Baseline schema"
+
+metadata = MetaData()
+
+Table(
+    "user",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(100), nullable=False),
+    Column("email", String(255), nullable=False),
+    Column("hashed_password", String, nullable=False),
+    Column("is_active", Boolean, nullable=False),
+    Column("is_superuser", Boolean, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Index("ix_user_name", "name"),
+    Index("ix_user_email", "email", unique=True),
+)
+
+Table(
+    "session",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", Integer, ForeignKey("user.id"), nullable=False),
+    Column("start_time", DateTime, nullable=False),
+    Column("end_time", DateTime),
+    Column("created_at", DateTime, nullable=False),
+    Index("ix_session_user_id", "user_id"),
+    Index("ix_session_start_time", "start_time"),
+    Index("ix_session_end_time", "end_time"),
+)
+
+Table(
+    "interruption",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("session_id", Integer, ForeignKey("session.id"), nullable=False),
+    Column("user_id", Integer, ForeignKey("user.id"), nullable=False),
+    Column("type", String(50), nullable=False),
+    Column("description", String(500), nullable=False),
+    Column("start_time", DateTime, nullable=False),
+    Column("end_time", DateTime, nullable=False),
+    Column("duration", Integer, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Index("ix_interruption_session_id", "session_id"),
+    Index("ix_interruption_user_id", "user_id"),
+    Index("ix_interruption_type", "type"),
+    Index("ix_interruption_start_time", "start_time"),
+    Index("ix_interruption_end_time", "end_time"),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    metadata.create_all(connection)
@@ -0,0 +1,46 @@
+"""
+Composite indexes for the hot queries:
+
+- (user_id, start_time) on session and interruption: every stats and list
+  query filters one user's rows from a start time;
+- (user_id) WHERE end_time IS NULL on session: the active session lookup
+  of start_session.
+
+They make the single-column user_id indexes redundant (user_id is their
+prefix), so those are dropped to save a write per insert.
+
+On PostgreSQL the indexes are built and dropped CONCURRENTLY, so the
+sessions and interruptions tables keep taking writes meanwhile. That
+cannot run inside a transaction, hence TRANSACTIONAL = False. A build
+that failed halfway leaves an INVALID index behind; it is dropped and
+rebuilt on the next run.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+DESCRIPTION = "Composite (user_id, start_time) indexes and active session partial index"
+
+# Applied in autocommit mode (see app/migrations/__init__.py)
+TRANSACTIONAL = False
+
+CREATE_INDEXES = {
+    "ix_session_user_id_start_time": "ON session (user_id, start_time)",
+    "ix_interruption_user_id_start_time": "ON interruption (user_id, start_time)",
+    "ix_session_user_id_active": "ON session (user_id) WHERE end_time IS NULL",
+}
+DROP_INDEXES = ["ix_session_user_id", "ix_interruption_user_id"]
+
+_INVALID_INDEX = text(
+    "SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid"
+    " WHERE pg_class.relname = :name AND NOT pg_index.indisvalid"
+)
+
+
+def upgrade(connection: Connection) -> None:
+    concurrently = " CONCURRENTLY" if connection.dialect.name == "postgresql" else ""
+    for name, definition in CREATE_INDEXES.items():
+        if concurrently and connection.execute(_INVALID_INDEX, {"name": name}).first():
+            connection.execute(text(f"DROP INDEX{concurrently} IF EXISTS {name}"))
+        connection.execute(text(f"CREATE INDEX{concurrently} IF NOT EXISTS {name} {definition}"))
+    for name in DROP_INDEXES:
+        connection.execute(text(f"DROP INDEX{concurrently} IF EXISTS {name}"))
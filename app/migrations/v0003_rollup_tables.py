@@ -0,0 +1,70 @@
+"""
+Tables added before versioned migrations existed, which the baseline
+leaves out: the hourly rollups (`hourly_rollup`, `hourly_type_rollup`) and
+the per-user write counter behind the ETags (`user_data_version`).
+
+Databases created with `create_all` back then already have them;
+`checkfirst` skips those.
+"""
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    UniqueConstraint,
+)
+from sqlalchemy.engine import Connection
+
+DESCRIPTION = "Hourly rollup and user data version tables"
+
+NEW_TABLES = ("hourly_rollup", "hourly_type_rollup", "user_data_version")
+
+metadata = MetaData()
+
+# Only referenced by the foreign keys below; created by v0001
+Table("user", metadata, Column("id", Integer, primary_key=True))
+
+Table(
+    "hourly_rollup",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", Integer, ForeignKey("user.id"), nullable=False),
+    Column("bucket_start", DateTime, nullable=False),
+    Column("work_seconds", Float, nullable=False),
+    Column("sessions_started", Integer, nullable=False),
+    Column("session_seconds", Float, nullable=False),
+    Column("interruptions", Integer, nullable=False),
+    Column("lost_seconds", Integer, nullable=False),
+    UniqueConstraint("user_id", "bucket_start"),
+    Index("ix_hourly_rollup_user_id", "user_id"),
+    Index("ix_hourly_rollup_bucket_start", "bucket_start"),
+)
+
+Table(
+    "hourly_type_rollup",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", Integer, ForeignKey("user.id"), nullable=False),
+    Column("bucket_start", DateTime, nullable=False),
+    Column("type", String(50), nullable=False),
+    Column("interruptions", Integer, nullable=False),
+    UniqueConstraint("user_id", "bucket_start", "type"),
+    Index("ix_hourly_type_rollup_user_id", "user_id"),
+    Index("ix_hourly_type_rollup_bucket_start", "bucket_start"),
+)
+
+Table(
+    "user_data_version",
+    metadata,
+    Column("user_id", Integer, ForeignKey("user.id"), primary_key=True, autoincrement=False),
+    Column("version", Integer, nullable=False),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    metadata.create_all(connection, tables=[metadata.tables[name] for name in NEW_TABLES])
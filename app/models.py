@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional
 
+from sqlalchemy import Index, UniqueConstraint, text
 from sqlmodel import SQLModel, Field, Relationship
 
 
@@ -25,8 +26,20 @@ class Session(SQLModel, table=True):
     """
     Bloque de trabajo de un usuario.
     """
+    # Índices de las consultas calientes (ver app/migrations/v0002_composite_indexes.py):
+    # rango de un usuario por start_time y su sesión activa (end_time IS NULL)
+    __table_args__ = (
+        Index("ix_session_user_id_start_time", "user_id", "start_time"),
+        Index(
+            "ix_session_user_id_active",
+            "user_id",
+            sqlite_where=text("end_time IS NULL"),
+            postgresql_where=text("end_time IS NULL"),
+        ),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="user.id", index=True)
+    user_id: int = Field(foreign_key="user.id")
 
     start_time: datetime = Field(index=True)
     end_time: Optional[datetime] = Field(default=None, index=True)
@@ -41,10 +54,12 @@ class Interruption(SQLModel, table=True):
     """
     Interrupción concreta durante una sesión de trabajo.
     """
+    __table_args__ = (Index("ix_interruption_user_id_start_time", "user_id", "start_time"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
 
     session_id: int = Field(foreign_key="session.id", index=True)
-    user_id: int = Field(foreign_key="user.id", index=True)
+    user_id: int = Field(foreign_key="user.id")
 
     # El tipo real lo restringiremos en los schemas con un Enum
     type: str = Field(index=True, max_length=50, description="Tipo de interrupción")
@@ -62,3 +77,50 @@ class Interruption(SQLModel, table=True):
     # Relaciones
     session: Optional[Session] = Relationship(back_populates="interruptions")
     user: Optional[User] = Relationship(back_populates="interruptions")
+
+
+class HourlyRollup(SQLModel, table=True):
+    """
+    Agregado de actividad de un usuario en una hora UTC (bucket).
+    Se mantiene al escribir sesiones e interrupciones (ver app/core/rollups.py).
+    """
+    __tablename__ = "hourly_rollup"
+    __table_args__ = (UniqueConstraint("user_id", "bucket_start"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id", index=True)
+    bucket_start: datetime = Field(index=True, description="Inicio de la hora UTC")
+
+    # Tiempo de sesiones terminadas que cae dentro de esta hora
+    work_seconds: float = Field(default=0.0)
+    # Sesiones iniciadas en esta hora y duración total de las ya terminadas
+    sessions_started: int = Field(default=0)
+    session_seconds: float = Field(default=0.0)
+
+    interruptions: int = Field(default=0)
+    lost_seconds: int = Field(default=0)
+
+
+class HourlyTypeRollup(SQLModel, table=True):
+    """
+    Número de interrupciones de un tipo en una hora UTC (bucket).
+    """
+    __tablename__ = "hourly_type_rollup"
+    __table_args__ = (UniqueConstraint("user_id", "bucket_start", "type"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id", index=True)
+    bucket_start: datetime = Field(index=True, description="Inicio de la hora UTC")
+    type: str = Field(max_length=50)
+    interruptions: int = Field(default=0)
+
+
+class UserDataVersion(SQLModel, table=True):
+    """
+    Contador de escrituras de un usuario (sesiones, interrupciones, rollups).
+    Cambia con cada escritura y se usa para los ETag de las respuestas.
+    """
+    __tablename__ = "user_data_version"
+
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    version: int = Field(default=0)
@@ -1,26 +1,39 @@
 from datetime import timedelta
 from typing import Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlmodel import Session, select
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
-from app.core.security import create_access_token, get_password_hash, verify_password
+from app.core.profiling import ProfiledRoute
+from app.core.security import create_access_token, get_password_hash_async, verify_and_update_password_async
+from app.core.users import get_user_by_email, save_user
 from app.db import get_session
 from app.models import User
 from app.schemas import Token, UserCreate, UserRead
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
+
+# The handlers are async so that hashing (awaited on the hashing pool) does
+# not hold a threadpool thread; their short queries still run in the threadpool.
 
 @router.post("/login/access-token", response_model=Token)
-def login_access_token(
+async def login_access_token(
     session: Session = Depends(get_session), form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests
     """
-    user = session.exec(select(User).where(User.email == form_data.username)).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = await run_in_threadpool(get_user_by_email, session, form_data.username)
+    if not user:
+        raise HTTPException(status_code=400, detail="Incorrect email or password")
+    valid, new_hash = await verify_and_update_password_async(form_data.password, user.hashed_password)
+    if not valid:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
+    if new_hash:
+        # Hash made with older Argon2 parameters: upgrade it transparently
+        user.hashed_password = new_hash
+        await run_in_threadpool(save_user, session, user)
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     
@@ -34,7 +47,7 @@ def login_access_token(
     }
 
 @router.post("/register", response_model=UserRead)
-def register_user(
+async def register_user(
     *,
     session: Session = Depends(get_session),
     user_in: UserCreate,
@@ -42,15 +55,13 @@ def register_user(
     """
     Create new user without the need to be logged in
     """
-    user = session.exec(select(User).where(User.email == user_in.email)).first()
+    user = await run_in_threadpool(get_user_by_email, session, user_in.email)
     if user:
         raise HTTPException(
             status_code=400,
             detail="The user with this email already exists in the system",
         )
     
-    user_create = User.model_validate(user_in, update={"hashed_password": get_password_hash(user_in.password)})
-    session.add(user_create)
-    session.commit()
-    session.refresh(user_create)
-    return user_create
+    hashed_password = await get_password_hash_async(user_in.password)
+    user_create = User.model_validate(user_in, update={"hashed_password": hashed_password})
+    return await run_in_threadpool(save_user, session, user_create)
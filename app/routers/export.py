@@ -0,0 +1,151 @@
+"""
+Full-history export for the data warehouse, streamed as NDJSON or CSV.
+
+Rows are read with `yield_per` (a server-side cursor on PostgreSQL) and
+written out one batch at a time, so memory stays flat whatever the number
+of rows. Only plain columns are selected: no ORM objects, no identity map.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, Iterator, Optional, Sequence
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session as DBSession, select
+
+from app.core.deps import get_current_active_superuser, get_current_user, get_read_session
+from app.core.pagination import as_utc
+from app.core.profiling import ProfiledRoute
+from app.models import Interruption, Session as WorkSession, User
+
+router = APIRouter(prefix="/export", tags=["export"], route_class=ProfiledRoute)
+
+# Rows fetched (and written) per batch
+EXPORT_BATCH_SIZE = 1000
+
+SESSION_COLUMNS = (
+    WorkSession.id,
+    WorkSession.user_id,
+    WorkSession.start_time,
+    WorkSession.end_time,
+    WorkSession.created_at,
+)
+INTERRUPTION_COLUMNS = (
+    Interruption.id,
+    Interruption.session_id,
+    Interruption.user_id,
+    Interruption.type,
+    Interruption.description,
+    Interruption.start_time,
+    Interruption.end_time,
+    Interruption.duration,
+    Interruption.created_at,
+)
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+MEDIA_TYPES = {ExportFormat.ndjson: "application/x-ndjson", ExportFormat.csv: "text/csv"}
+
+SINCE_QUERY = Query(None, description="Rows started at or after this time.")
+UNTIL_QUERY = Query(None, description="Rows started before this time.")
+ALL_USERS_QUERY = Query(False, description="Export every user's rows (superusers only).")
+
+def export_query(
+    model: Any,
+    columns: Sequence[Any],
+    user_id: Optional[int],
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    """Rows of one user (or every user if user_id is None), in id order."""
+    query = select(*columns)
+    if user_id is not None:
+        query = query.where(model.user_id == user_id)
+    if since is not None:
+        query = query.where(model.start_time >= as_utc(since))
+    if until is not None:
+        query = query.where(model.start_time < as_utc(until))
+    return query.order_by(model.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+def stream_export(db: DBSession, query, export_format: ExportFormat) -> Iterator[str]:
+    """Yields the rows of `query` as NDJSON lines or CSV (with a header), one chunk per batch."""
+    result = db.exec(query)
+    names = list(result.keys())
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if export_format == ExportFormat.csv:
+        writer.writerow(names)
+    for batch in result.partitions():
+        if export_format == ExportFormat.csv:
+            writer.writerows(
+                [value.isoformat() if isinstance(value, datetime) else value for value in row] for row in batch
+            )
+        else:
+            for row in batch:
+                buffer.write(json.dumps(dict(zip(names, row)), default=_json_default))
+                buffer.write("\n")
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def _export_response(
+    name: str,
+    model: Any,
+    columns: Sequence[Any],
+    export_format: ExportFormat,
+    since: Optional[datetime],
+    until: Optional[datetime],
+    all_users: bool,
+    db: DBSession,
+    current_user: User,
+) -> StreamingResponse:
+    if all_users:
+        get_current_active_superuser(current_user)
+    query = export_query(model, columns, None if all_users else current_user.id, since, until)
+    return StreamingResponse(
+        stream_export(db, query, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{export_format.value}"'},
+    )
+
+@router.get("/sessions")
+def export_sessions(
+    format: ExportFormat = Query(ExportFormat.ndjson),
+    since: Optional[datetime] = SINCE_QUERY,
+    until: Optional[datetime] = UNTIL_QUERY,
+    all_users: bool = ALL_USERS_QUERY,
+    db: DBSession = Depends(get_read_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Stream the sessions of the current user (or of every user) as NDJSON or CSV.
+    """
+    return _export_response("sessions", WorkSession, SESSION_COLUMNS, format, since, until, all_users, db, current_user)
+
+@router.get("/interruptions")
+def export_interruptions(
+    format: ExportFormat = Query(ExportFormat.ndjson),
+    since: Optional[datetime] = SINCE_QUERY,
+    until: Optional[datetime] = UNTIL_QUERY,
+    all_users: bool = ALL_USERS_QUERY,
+    db: DBSession = Depends(get_read_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Stream the interruptions of the current user (or of every user) as NDJSON or CSV.
+    """
+    return _export_response(
+        "interruptions", Interruption, INTERRUPTION_COLUMNS, format, since, until, all_users, db, current_user
+    )
@@ -1,13 +1,33 @@
-from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import ValidationError
+from sqlalchemy import insert
 from sqlmodel import Session as DBSession, select
 
-from app.core.deps import get_current_user
+from app.core.cache import stats_cache
+from app.core.config import settings
+from app.core.data_version import bump_data_version
+from app.core.deps import get_current_user, get_read_session
+from app.core.pagination import (
+    CURSOR_QUERY,
+    FIELDS_QUERY,
+    LIMIT_QUERY,
+    as_utc,
+    keyset_page,
+    parse_fields,
+    projected_response,
+    select_columns,
+    set_next_cursor,
+)
+from app.core.profiling import ProfiledRoute
+from app.core.rollups import record_interruption, record_interruptions
 from app.db import get_session
 from app.models import Interruption, Session as WorkSession, User
-from app.schemas import InterruptionCreate, InterruptionRead
+from app.schemas import BulkInterruptionResult, BulkItemResult, InterruptionCreate, InterruptionRead
 
-router = APIRouter(prefix="/interruptions", tags=["interruptions"])
+router = APIRouter(prefix="/interruptions", tags=["interruptions"], route_class=ProfiledRoute)
 
 @router.post("/", response_model=InterruptionRead, status_code=status.HTTP_201_CREATED)
 def create_interruption(
@@ -62,35 +82,224 @@ def create_interruption(
     )
 
     db.add(interruption)
+    bump_data_version(db, current_user.id)
+    record_interruption(db, interruption)
     db.commit()
     db.refresh(interruption)
+    stats_cache.invalidate_user(current_user.id)
 
     return interruption
 
-@router.get("/session/{session_id}", response_model=list[InterruptionRead])
-def get_interruptions_for_session(
-    session_id: int,
-    db: DBSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
-):
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+def _validation_detail(error: ValidationError) -> List[Dict[str, Any]]:
+    return [{"loc": list(e["loc"]), "msg": e["msg"]} for e in error.errors()]
+
+async def _bulk_items(request: Request) -> List[Union[InterruptionCreate, BulkItemResult]]:
     """
-    List all interruptions for a given session.
+    Parses the bulk body (a JSON array, or NDJSON: one object per line).
+    Items that are not valid InterruptionCreate come back as a 422 result.
     """
-    session = db.get(WorkSession, session_id)
-    if not session:
+    body = await request.body()
+    content_type = request.headers.get("content-type", "").split(";", 1)[0].strip()
+    if content_type in NDJSON_TYPES:
+        raw_items: List[Any] = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                raw_items.append(json.loads(line))
+            except ValueError:
+                raw_items.append(ValueError("Invalid JSON line"))
+    else:
+        try:
+            raw_items = json.loads(body)
+        except ValueError:
+            raw_items = None
+        if not isinstance(raw_items, list):
+            raise HTTPException(
+                status_code=422,
+                detail="Expected a JSON array of interruptions (or an NDJSON body)",
+            )
+
+    if len(raw_items) > settings.INTERRUPTIONS_BULK_MAX_ITEMS:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Session not found",
+            status_code=413,
+            detail=f"At most {settings.INTERRUPTIONS_BULK_MAX_ITEMS} interruptions per request",
         )
-    
-    if session.user_id != current_user.id:
+
+    items: List[Union[InterruptionCreate, BulkItemResult]] = []
+    for index, raw in enumerate(raw_items):
+        if isinstance(raw, ValueError):
+            items.append(BulkItemResult(index=index, status=422, detail=str(raw)))
+            continue
+        try:
+            items.append(InterruptionCreate.model_validate(raw))
+        except ValidationError as e:
+            items.append(
+                BulkItemResult(index=index, status=422, detail=_validation_detail(e))
+            )
+    return items
+
+def _insert_rows(db: DBSession, rows: List[Dict[str, Any]], user_id: int, created_at: datetime) -> List[int]:
+    """
+    Inserts the rows and returns their ids in the same order. PostgreSQL
+    returns them with RETURNING in batched multi-row INSERTs; sorted RETURNING
+    degrades to one INSERT per row on SQLite, so there the ids (ascending in
+    insert order) are read back by the batch's created_at after one
+    executemany.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        ids = db.exec(
+            insert(Interruption).returning(Interruption.id, sort_by_parameter_order=True),
+            params=rows,
+        ).scalars().all()
+    else:
+        db.exec(insert(Interruption), params=rows)
+        ids = db.exec(
+            select(Interruption.id)
+            .where(Interruption.user_id == user_id, Interruption.created_at == created_at)
+            .order_by(Interruption.id)
+        ).all()
+    if len(ids) != len(rows):
+        db.rollback()
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Could not match the inserted interruptions with their ids",
         )
+    return list(ids)
+
+@router.post(
+    "/bulk",
+    response_model=BulkInterruptionResult,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {"type": "array", "items": {"$ref": "#/components/schemas/InterruptionCreate"}}
+                },
+                "application/x-ndjson": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+def create_interruptions_bulk(
+    items: List[Union[InterruptionCreate, BulkItemResult]] = Depends(_bulk_items),
+    db: DBSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Register many interruptions at once (offline sync): a JSON array or an
+    NDJSON stream of InterruptionCreate. Each item gets the status
+    POST /interruptions/ would have returned for it; the valid ones are
+    inserted together in one transaction.
+    """
+    # One query for every distinct session of the batch
+    session_ids = {item.session_id for item in items if isinstance(item, InterruptionCreate)}
+    work_sessions = {}
+    if session_ids:
+        work_sessions = {
+            row.id: row
+            for row in db.exec(
+                select(WorkSession.id, WorkSession.user_id, WorkSession.end_time).where(
+                    WorkSession.id.in_(session_ids)
+                )
+            )
+        }
+
+    results: List[BulkItemResult] = []
+    rows: List[Dict[str, Any]] = []
+    row_results: List[BulkItemResult] = []
+    created_at = datetime.now(timezone.utc)
+    for index, item in enumerate(items):
+        if isinstance(item, BulkItemResult):
+            results.append(item)
+            continue
+
+        work_session = work_sessions.get(item.session_id)
+        if work_session is None:
+            error = (status.HTTP_404_NOT_FOUND, "Session not found")
+        elif work_session.user_id != current_user.id:
+            error = (status.HTTP_403_FORBIDDEN, "Not enough permissions")
+        elif work_session.end_time is not None:
+            error = (status.HTTP_400_BAD_REQUEST, "Cannot add interruptions to a finished session")
+        else:
+            error = None
+        if error:
+            results.append(BulkItemResult(index=index, status=error[0], detail=error[1]))
+            continue
+
+        rows.append({
+            "session_id": item.session_id,
+            "user_id": current_user.id,
+            "type": item.type.value,
+            "description": item.description,
+            "start_time": item.start_time,
+            "end_time": item.end_time,
+            "duration": int((item.end_time - item.start_time).total_seconds()),
+            "created_at": created_at,
+        })
+        result = BulkItemResult(index=index, status=status.HTTP_201_CREATED)
+        row_results.append(result)
+        results.append(result)
+
+    if rows:
+        ids = _insert_rows(db, rows, current_user.id, created_at)
+        for result, interruption_id in zip(row_results, ids):
+            result.id = interruption_id
+        bump_data_version(db, current_user.id)
+        record_interruptions(db, current_user.id, (Interruption(**row) for row in rows))
+        db.commit()
+        stats_cache.invalidate_user(current_user.id)
 
-    interruptions = db.exec(
-        select(Interruption).where(Interruption.session_id == session_id)
-    ).all()
+    return BulkInterruptionResult(created=len(rows), failed=len(results) - len(rows), results=results)
+
+@router.get("/session/{session_id}", response_model=list[InterruptionRead])
+def get_interruptions_for_session(
+    session_id: int,
+    request: Request,
+    response: Response,
+    since: datetime | None = Query(default=None, description="Interruptions started at or after this time."),
+    until: datetime | None = Query(default=None, description="Interruptions started before this time."),
+    limit: int = LIMIT_QUERY,
+    cursor: str | None = CURSOR_QUERY,
+    fields: str | None = FIELDS_QUERY,
+    db: DBSession = Depends(get_read_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    List the interruptions of a session in chronological order, one page at
+    a time: the next page is requested with the `X-Next-Cursor` response header.
+    """
+    projection = parse_fields(fields, InterruptionRead)
+    key = (Interruption.start_time, Interruption.id)
+    columns = select_columns(Interruption, projection, key) if projection else [Interruption]
+    # Interruptions carry their session's user_id, so ownership is part of
+    # the query; the session itself is only looked up when nothing matched
+    query = select(*columns).where(
+        Interruption.session_id == session_id,
+        Interruption.user_id == current_user.id,
+    )
+    if since is not None:
+        query = query.where(Interruption.start_time >= as_utc(since))
+    if until is not None:
+        query = query.where(Interruption.start_time < as_utc(until))
 
+    interruptions, next_cursor = keyset_page(db, query, key, limit, cursor)
+    if not interruptions:
+        session = db.get(WorkSession, session_id)
+        if not session:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Session not found",
+            )
+        if session.user_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions",
+            )
+    set_next_cursor(request, response, next_cursor)
+    if projection:
+        return projected_response(response, interruptions, projection)
     return interruptions
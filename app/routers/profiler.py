@@ -0,0 +1,37 @@
+import asyncio
+from enum import Enum
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.core.deps import get_current_active_superuser
+from app.core.profiling import ProfiledRoute
+from app.core.sampler import PROCESS_INTERVAL_SECONDS, ProfilerBusy, StackSampler
+
+router = APIRouter(
+    prefix="/profiler",
+    tags=["profiler"],
+    route_class=ProfiledRoute,
+    dependencies=[Depends(get_current_active_superuser)],
+)
+
+class ProfileFormat(str, Enum):
+    collapsed = "collapsed"
+    speedscope = "speedscope"
+
+@router.get("/process")
+async def profile_process(
+    seconds: float = Query(10, gt=0, le=120, description="How long to sample"),
+    interval_ms: float = Query(PROCESS_INTERVAL_SECONDS * 1000, ge=1, le=100, description="Sampling interval"),
+    format: ProfileFormat = Query(ProfileFormat.collapsed),
+    include_idle: bool = Query(False, description="Also count threads waiting for work"),
+):
+    """
+    Samples the stacks of every thread of this worker for `seconds` and
+    returns them as collapsed stacks or speedscope JSON. Only for superusers.
+    """
+    try:
+        with StackSampler(interval_ms / 1000, include_idle=include_idle) as sampler:
+            await asyncio.sleep(seconds)
+    except ProfilerBusy as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
+    return sampler.response(format.value, f"process, {seconds:g} s")
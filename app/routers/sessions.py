@@ -1,13 +1,90 @@
+from collections import defaultdict
 from datetime import datetime, date, time, timezone
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from enum import Enum
+from typing import Sequence
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import func
 from sqlmodel import Session as DBSession, select
 
-from app.core.deps import get_current_user
+from app.core.cache import stats_cache
+from app.core.data_version import bump_data_version, get_data_version
+from app.core.deps import get_current_user, get_read_session
+from app.core.etag import conditional_response, weak_etag
+from app.core.pagination import (
+    CURSOR_QUERY,
+    FIELDS_QUERY,
+    LIMIT_QUERY,
+    as_utc,
+    keyset_page,
+    parse_fields,
+    projected_response,
+    select_columns,
+    set_next_cursor,
+)
+from app.core.profiling import ProfiledRoute
+from app.core.rollups import record_session_ended, record_session_started
 from app.db import get_session
-from app.models import Session as WorkSession, User
-from app.schemas import SessionStart, SessionRead
+from app.models import Interruption, Session as WorkSession, User
+from app.schemas import SessionStart, SessionRead, SessionWithInterruptions
 
-router = APIRouter(prefix="/sessions", tags=["sessions"])
+router = APIRouter(prefix="/sessions", tags=["sessions"], route_class=ProfiledRoute)
+
+class SessionInclude(str, Enum):
+    interruptions = "interruptions"
+
+INCLUDE_QUERY = Query(
+    None,
+    description="`interruptions` embeds each session's interruptions, their count and lost seconds.",
+)
+
+def embed_interruptions(db: DBSession, sessions: Sequence[WorkSession]) -> list[SessionWithInterruptions]:
+    """
+    The sessions with their interruptions, loaded for all of them in one IN
+    query; the per-session count and lost seconds come from window
+    aggregates of that same query.
+    """
+    ids = [work_session.id for work_session in sessions]
+    if not ids:
+        return []
+    per_session = dict(partition_by=Interruption.session_id)
+    rows = db.exec(
+        select(
+            Interruption,
+            func.count().over(**per_session),
+            func.sum(Interruption.duration).over(**per_session),
+        )
+        .where(Interruption.session_id.in_(ids))
+        .order_by(Interruption.session_id, Interruption.start_time, Interruption.id)
+    ).all()
+    interruptions = defaultdict(list)
+    totals = {}
+    for interruption, count, lost_seconds in rows:
+        interruptions[interruption.session_id].append(interruption)
+        totals[interruption.session_id] = (count, lost_seconds)
+
+    embedded = []
+    for work_session in sessions:
+        count, lost_seconds = totals.get(work_session.id, (0, 0))
+        embedded.append(SessionWithInterruptions.model_validate(
+            {
+                **work_session.model_dump(),
+                "interruption_count": count,
+                "lost_seconds": lost_seconds,
+                "interruptions": interruptions[work_session.id],
+            },
+            from_attributes=True,
+        ))
+    return embedded
+
+def _embedded_response(response: Response, content) -> JSONResponse:
+    """
+    Sends SessionWithInterruptions bypassing the endpoint's response_model:
+    a SessionRead | SessionWithInterruptions union would make every plain
+    response lazy-load the interruptions relationship of each session.
+    """
+    return JSONResponse(jsonable_encoder(content), headers=dict(response.headers))
 
 @router.post("/start", response_model=SessionRead, status_code=status.HTTP_201_CREATED)
 def start_session(
@@ -40,8 +117,11 @@ def start_session(
     )
 
     db.add(new_session)
+    bump_data_version(db, current_user.id)
+    record_session_started(db, new_session)
     db.commit()
     db.refresh(new_session)
+    stats_cache.invalidate_user(current_user.id)
 
     return new_session
 
@@ -75,24 +155,51 @@ def end_session(
 
     work_session.end_time = datetime.now(timezone.utc)
     db.add(work_session)
+    bump_data_version(db, current_user.id)
+    record_session_ended(db, work_session)
     db.commit()
     db.refresh(work_session)
+    stats_cache.invalidate_user(current_user.id)
 
     return work_session
 
 @router.get("/", response_model=list[SessionRead])
 def get_my_sessions(
+    request: Request,
+    response: Response,
     day: date | None = Query(
         default=None,
         description="Filter by day (YYYY-MM-DD).",
     ),
-    db: DBSession = Depends(get_session),
+    since: datetime | None = Query(default=None, description="Sessions started at or after this time."),
+    until: datetime | None = Query(default=None, description="Sessions started before this time."),
+    limit: int = LIMIT_QUERY,
+    cursor: str | None = CURSOR_QUERY,
+    fields: str | None = FIELDS_QUERY,
+    include: SessionInclude | None = INCLUDE_QUERY,
+    db: DBSession = Depends(get_read_session),
     current_user: User = Depends(get_current_user),
 ):
     """
-    Get all sessions for the current user.
+    Get the sessions of the current user, newest first, one page at a time:
+    the next page is requested with the `X-Next-Cursor` response header.
     """
-    query = select(WorkSession).where(WorkSession.user_id == current_user.id)
+    projection = parse_fields(fields, SessionRead)
+    if projection and include:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="fields cannot be combined with include",
+        )
+    etag = weak_etag(
+        "sessions", current_user.id, get_data_version(db, current_user.id), request.url.query
+    )
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    key = (WorkSession.start_time, WorkSession.id)
+    columns = select_columns(WorkSession, projection, key) if projection else [WorkSession]
+    query = select(*columns).where(WorkSession.user_id == current_user.id)
 
     if day is not None:
         day_start = datetime.combine(day, time.min)
@@ -101,14 +208,24 @@ def get_my_sessions(
             WorkSession.start_time >= day_start,
             WorkSession.start_time <= day_end,
         )
-
-    query = query.order_by(WorkSession.start_time.desc())
-    sessions = db.exec(query).all()
+    if since is not None:
+        query = query.where(WorkSession.start_time >= as_utc(since))
+    if until is not None:
+        query = query.where(WorkSession.start_time < as_utc(until))
+
+    sessions, next_cursor = keyset_page(db, query, key, limit, cursor, descending=True)
+    set_next_cursor(request, response, next_cursor)
+    if projection:
+        return projected_response(response, sessions, projection)
+    if include == SessionInclude.interruptions:
+        return _embedded_response(response, embed_interruptions(db, sessions))
     return sessions
 
 @router.get("/{session_id}", response_model=SessionRead)
 def get_session_by_id(
     session_id: int,
+    response: Response,
+    include: SessionInclude | None = INCLUDE_QUERY,
     db: DBSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
@@ -126,4 +243,6 @@ def get_session_by_id(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions",
         )
+    if include == SessionInclude.interruptions:
+        return _embedded_response(response, embed_interruptions(db, [work_session])[0])
     return work_session
@@ -1,18 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlmodel import Session as DBSession
 
-from app.core.deps import get_current_user
-from app.db import get_session
+from app.core.cache import stats_cache
+from app.core.config import settings
+from app.core.data_version import get_data_version
+from app.core.deps import get_current_active_superuser, get_current_user, get_read_session
+from app.core.etag import conditional_response, weak_etag
+from app.core.profiling import ProfiledRoute
 from app.models import User
-from app.core.stats_logic import (
-    get_summary_stats,
-    get_interruption_type_stats,
-    get_productive_hours_stats,
-    get_peak_distraction_hour,
-    get_weekly_pattern,
-)
+from app.core.stats_backends import get_stats_backend
 
-router = APIRouter(prefix="/stats", tags=["stats"])
+router = APIRouter(prefix="/stats", tags=["stats"], route_class=ProfiledRoute)
 
 def _parse_range_days(range_str: str) -> int:
     """
@@ -38,73 +38,164 @@ def _parse_range_days(range_str: str) -> int:
         )
     return days
 
+def _stats_etag(request: Request, user_id: int, data_version: int) -> str:
+    """
+    The stats ETag changes with every write of the user and with every
+    cache time slot (the date range moves with time).
+    """
+    return weak_etag(
+        "stats",
+        user_id,
+        data_version,
+        settings.STATS_BACKEND,
+        request.url.path,
+        request.url.query,
+        stats_cache.time_bucket(),
+    )
+
+def _not_modified(request: Request, response: Response, user_id: int, data_version: int) -> Optional[Response]:
+    """
+    Conditional GET for stats: 304 response if the client's copy is current.
+    """
+    return conditional_response(request, response, _stats_etag(request, user_id, data_version))
+
+def _cached_stats(
+    request: Request,
+    response: Response,
+    function_name: str,
+    user_id: int,
+    db: DBSession,
+    range_days: int,
+):
+    """
+    Conditional GET + stats cache + configured backend, for one stats function.
+    The data version read for the ETag is also part of the cache key, so a
+    result computed before a write is never served with a newer ETag.
+    """
+    data_version = get_data_version(db, user_id)
+    not_modified = _not_modified(request, response, user_id, data_version)
+    if not_modified:
+        return not_modified
+    backend = get_stats_backend()
+    return stats_cache.get_or_compute(
+        user_id,
+        f"{settings.STATS_BACKEND}.{function_name}",
+        range_days,
+        data_version,
+        lambda: getattr(backend, function_name)(user_id=user_id, db=db, range_days=range_days),
+    )
+
 @router.get("/summary")
 def stats_summary(
+    request: Request,
+    response: Response,
     range: str = Query("7d", description="Range of days, e.g. '7d', '30d'"),
-    db: DBSession = Depends(get_session),
+    db: DBSession = Depends(get_read_session),
     current_user: User = Depends(get_current_user),
 ):
     """
     General stats summary for the current user.
     """
     range_days = _parse_range_days(range)
-    return get_summary_stats(user_id=current_user.id, db=db, range_days=range_days)
+    return _cached_stats(request, response, "get_summary_stats", current_user.id, db, range_days)
 
 @router.get("/interruption-types")
 def stats_interruption_types(
+    request: Request,
+    response: Response,
     range: str = Query("7d", description="Range of days, e.g. '7d', '30d'"),
-    db: DBSession = Depends(get_session),
+    db: DBSession = Depends(get_read_session),
     current_user: User = Depends(get_current_user),
 ):
     """
     Interruption stats by type.
     """
     range_days = _parse_range_days(range)
-    return get_interruption_type_stats(user_id=current_user.id, db=db, range_days=range_days)
+    return _cached_stats(request, response, "get_interruption_type_stats", current_user.id, db, range_days)
 
 @router.get("/productive-hours")
 def stats_productive_hours(
+    request: Request,
+    response: Response,
     range: str = Query("7d", description="Range of days, e.g. '7d', '30d'"),
-    db: DBSession = Depends(get_session),
+    db: DBSession = Depends(get_read_session),
     current_user: User = Depends(get_current_user),
 ):
     """
     Hourly stats: total work, interruptions, interruptions per effective hour.
     """
     range_days = _parse_range_days(range)
-    return get_productive_hours_stats(user_id=current_user.id, db=db, range_days=range_days)
+    return _cached_stats(request, response, "get_productive_hours_stats", current_user.id, db, range_days)
 
 @router.get("/peak-distraction-time")
 def stats_peak_distraction_time(
+    request: Request,
+    response: Response,
     range: str = Query("7d", description="Range of days, e.g. '7d', '30d'"),
-    db: DBSession = Depends(get_session),
+    db: DBSession = Depends(get_read_session),
     current_user: User = Depends(get_current_user),
 ):
     """
     Hour of day with most interruptions.
     """
     range_days = _parse_range_days(range)
-    return get_peak_distraction_hour(user_id=current_user.id, db=db, range_days=range_days)
+    return _cached_stats(request, response, "get_peak_distraction_hour", current_user.id, db, range_days)
 
 @router.get("/weekly-pattern")
 def stats_weekly_pattern(
+    request: Request,
+    response: Response,
     range: str = Query("7d", description="Range of days, e.g. '7d', '30d'"),
-    db: DBSession = Depends(get_session),
+    db: DBSession = Depends(get_read_session),
     current_user: User = Depends(get_current_user),
 ):
     """
     Weekly work pattern.
     """
     range_days = _parse_range_days(range)
-    return get_weekly_pattern(user_id=current_user.id, db=db, range_days=range_days)
+    return _cached_stats(request, response, "get_weekly_pattern", current_user.id, db, range_days)
+
+@router.get("/dashboard")
+def stats_dashboard(
+    request: Request,
+    response: Response,
+    range: str = Query("7d", description="Range of days, e.g. '7d', '30d'"),
+    db: DBSession = Depends(get_read_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Summary, interruption types, productive hours, peak distraction time and
+    weekly pattern in a single response.
+    """
+    range_days = _parse_range_days(range)
+    return _cached_stats(request, response, "get_dashboard_stats", current_user.id, db, range_days)
 
 @router.get("/insights")
 def get_insights(
-    db: DBSession = Depends(get_session),
+    request: Request,
+    response: Response,
+    db: DBSession = Depends(get_read_session),
     current_user: User = Depends(get_current_user),
 ):
     """
     Get AI-generated insights based on user stats.
     """
+    data_version = get_data_version(db, current_user.id)
+    not_modified = _not_modified(request, response, current_user.id, data_version)
+    if not_modified:
+        return not_modified
     from app.core.stats_logic import generate_ai_insights
-    return generate_ai_insights(user_id=current_user.id, db=db)
+    return stats_cache.get_or_compute(
+        current_user.id,
+        "insights",
+        None,
+        data_version,
+        lambda: generate_ai_insights(user_id=current_user.id, db=db),
+    )
+
+@router.get("/cache", dependencies=[Depends(get_current_active_superuser)])
+def stats_cache_info():
+    """
+    Stats cache counters (hits, misses, entries). Only for superusers.
+    """
+    return stats_cache.info()
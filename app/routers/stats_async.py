@@ -0,0 +1,154 @@
+"""
+Async version of the stats router, mounted instead of `stats` when
+DB_ASYNC is enabled. Same paths, ETags, cache keys and responses; the
+database work is awaited on the async engine, so slow stats queries do not
+hold threads of the Starlette threadpool.
+"""
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core import stats_async
+from app.core.cache import stats_cache
+from app.core.config import settings
+from app.core.data_version import get_data_version_async
+from app.core.deps import get_current_active_superuser_async, get_current_user_async, get_read_session_async
+from app.core.profiling import ProfiledRoute
+from app.models import User
+from app.routers.stats import _not_modified, _parse_range_days
+
+router = APIRouter(prefix="/stats", tags=["stats"], route_class=ProfiledRoute)
+
+RANGE_QUERY = Query("7d", description="Range of days, e.g. '7d', '30d'")
+
+
+async def _cached_stats(
+    request: Request,
+    response: Response,
+    function_name: str,
+    range_str: str,
+    db: AsyncSession,
+    user: User,
+):
+    """
+    Conditional GET + stats cache + configured backend, for one stats function.
+    """
+    range_days = _parse_range_days(range_str)
+    data_version = await get_data_version_async(db, user.id)
+    not_modified = _not_modified(request, response, user.id, data_version)
+    if not_modified:
+        return not_modified
+    return await stats_cache.get_or_compute_async(
+        user.id,
+        f"{settings.STATS_BACKEND}.{function_name}",
+        range_days,
+        data_version,
+        lambda: stats_async.compute_stats(function_name, user.id, db, range_days),
+    )
+
+@router.get("/summary")
+async def stats_summary(
+    request: Request,
+    response: Response,
+    range: str = RANGE_QUERY,
+    db: AsyncSession = Depends(get_read_session_async),
+    current_user: User = Depends(get_current_user_async),
+):
+    """
+    General stats summary for the current user.
+    """
+    return await _cached_stats(request, response, "get_summary_stats", range, db, current_user)
+
+@router.get("/interruption-types")
+async def stats_interruption_types(
+    request: Request,
+    response: Response,
+    range: str = RANGE_QUERY,
+    db: AsyncSession = Depends(get_read_session_async),
+    current_user: User = Depends(get_current_user_async),
+):
+    """
+    Interruption stats by type.
+    """
+    return await _cached_stats(request, response, "get_interruption_type_stats", range, db, current_user)
+
+@router.get("/productive-hours")
+async def stats_productive_hours(
+    request: Request,
+    response: Response,
+    range: str = RANGE_QUERY,
+    db: AsyncSession = Depends(get_read_session_async),
+    current_user: User = Depends(get_current_user_async),
+):
+    """
+    Hourly stats: total work, interruptions, interruptions per effective hour.
+    """
+    return await _cached_stats(request, response, "get_productive_hours_stats", range, db, current_user)
+
+@router.get("/peak-distraction-time")
+async def stats_peak_distraction_time(
+    request: Request,
+    response: Response,
+    range: str = RANGE_QUERY,
+    db: AsyncSession = Depends(get_read_session_async),
+    current_user: User = Depends(get_current_user_async),
+):
+    """
+    Hour of day with most interruptions.
+    """
+    return await _cached_stats(request, response, "get_peak_distraction_hour", range, db, current_user)
+
+@router.get("/weekly-pattern")
+async def stats_weekly_pattern(
+    request: Request,
+    response: Response,
+    range: str = RANGE_QUERY,
+    db: AsyncSession = Depends(get_read_session_async),
+    current_user: User = Depends(get_current_user_async),
+):
+    """
+    Weekly work pattern.
+    """
+    return await _cached_stats(request, response, "get_weekly_pattern", range, db, current_user)
+
+@router.get("/dashboard")
+async def stats_dashboard(
+    request: Request,
+    response: Response,
+    range: str = RANGE_QUERY,
+    db: AsyncSession = Depends(get_read_session_async),
+    current_user: User = Depends(get_current_user_async),
+):
+    """
+    Summary, interruption types, productive hours, peak distraction time and
+    weekly pattern in a single response.
+    """
+    return await _cached_stats(request, response, "get_dashboard_stats", range, db, current_user)
+
+@router.get("/insights")
+async def get_insights(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_session_async),
+    current_user: User = Depends(get_current_user_async),
+):
+    """
+    Get AI-generated insights based on user stats.
+    """
+    data_version = await get_data_version_async(db, current_user.id)
+    not_modified = _not_modified(request, response, current_user.id, data_version)
+    if not_modified:
+        return not_modified
+    return await stats_cache.get_or_compute_async(
+        current_user.id,
+        "insights",
+        None,
+        data_version,
+        lambda: stats_async.generate_ai_insights(current_user.id, db),
+    )
+
+@router.get("/cache", dependencies=[Depends(get_current_active_superuser_async)])
+async def stats_cache_info():
+    """
+    Stats cache counters (hits, misses, entries). Only for superusers.
+    """
+    return stats_cache.info()
@@ -1,14 +1,28 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlmodel import Session, select
+from starlette.concurrency import run_in_threadpool
 
-from app.core.deps import get_current_active_superuser, get_current_user
-from app.core.security import get_password_hash
+from app.core.auth_cache import auth_cache
+from app.core.deps import get_current_active_superuser, get_current_user, get_read_session
+from app.core.pagination import (
+    CURSOR_QUERY,
+    FIELDS_QUERY,
+    LIMIT_QUERY,
+    keyset_page,
+    parse_fields,
+    projected_response,
+    select_columns,
+    set_next_cursor,
+)
+from app.core.profiling import ProfiledRoute
+from app.core.security import get_password_hash_async
+from app.core.users import get_user_by_email, save_user
 from app.db import get_session
 from app.models import User
-from app.schemas import UserCreate, UserRead, UserUpdate
+from app.schemas import UserCreate, UserRead
 
-router = APIRouter(prefix="/users", tags=["users"])
+router = APIRouter(prefix="/users", tags=["users"], route_class=ProfiledRoute)
 
 @router.get("/me", response_model=UserRead)
 def read_user_me(
@@ -21,18 +35,33 @@ def read_user_me(
 
 @router.get("/", response_model=List[UserRead], dependencies=[Depends(get_current_active_superuser)])
 def read_users(
-    skip: int = 0,
-    limit: int = 100,
-    session: Session = Depends(get_session),
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0, deprecated=True, description="Offset; use `cursor` instead"),
+    limit: int = LIMIT_QUERY,
+    cursor: Optional[str] = CURSOR_QUERY,
+    fields: Optional[str] = FIELDS_QUERY,
+    session: Session = Depends(get_read_session),
 ):
     """
-    Retrieve users. Only for superusers.
+    Retrieve users by id, one page at a time (next page: `X-Next-Cursor`
+    response header). Only for superusers. `skip` only applies to the first
+    page: the cursor of the next ones already points past the skipped rows.
     """
-    users = session.exec(select(User).offset(skip).limit(limit)).all()
+    projection = parse_fields(fields, UserRead)
+    key = (User.id,)
+    columns = select_columns(User, projection, key) if projection else [User]
+    query = select(*columns)
+    if not cursor:
+        query = query.offset(skip)
+    users, next_cursor = keyset_page(session, query, key, limit, cursor)
+    set_next_cursor(request, response, next_cursor)
+    if projection:
+        return projected_response(response, users, projection)
     return users
 
 @router.post("/", response_model=UserRead, dependencies=[Depends(get_current_active_superuser)])
-def create_user(
+async def create_user(
     *,
     session: Session = Depends(get_session),
     user_in: UserCreate,
@@ -40,17 +69,23 @@ def create_user(
     """
     Create new user. Only for superusers.
     """
-    user = session.exec(select(User).where(User.email == user_in.email)).first()
+    # Same flow as /auth/register: Argon2 runs on the bounded hashing pool
+    user = await run_in_threadpool(get_user_by_email, session, user_in.email)
     if user:
         raise HTTPException(
             status_code=400,
             detail="The user with this email already exists in the system",
         )
-    user = User.model_validate(user_in, update={"hashed_password": get_password_hash(user_in.password)})
-    session.add(user)
-    session.commit()
-    session.refresh(user)
-    return user
+    hashed_password = await get_password_hash_async(user_in.password)
+    user = User.model_validate(user_in, update={"hashed_password": hashed_password})
+    return await run_in_threadpool(save_user, session, user)
+
+@router.get("/auth-cache", dependencies=[Depends(get_current_active_superuser)])
+def auth_cache_info():
+    """
+    Auth cache counters (tokens and users: hits, misses, entries). Only for superusers.
+    """
+    return auth_cache.info()
 
 @router.get("/{user_id}", response_model=UserRead, dependencies=[Depends(get_current_active_superuser)])
 def read_user_by_id(
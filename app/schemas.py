@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Optional, Annotated, ClassVar
+from typing import Any, List, Optional, Annotated, ClassVar
 
 from pydantic import (
     BaseModel,
@@ -162,3 +162,29 @@ class InterruptionRead(BaseModel):
 
     model_config: ClassVar[ConfigDict] = ConfigDict(from_attributes=True)
 
+
+class SessionWithInterruptions(SessionRead):
+    """
+    Sesión con sus interrupciones embebidas (`include=interruptions`).
+    interruption_count y lost_seconds se agregan en SQL.
+    """
+    interruption_count: int
+    lost_seconds: int
+    interruptions: List[InterruptionRead]
+
+
+class BulkItemResult(BaseModel):
+    """
+    Resultado de un elemento de POST /interruptions/bulk: `status` es el
+    código que habría devuelto POST /interruptions/ para ese elemento.
+    """
+    index: int
+    status: int
+    id: Optional[int] = None
+    detail: Optional[Any] = None
+
+
+class BulkInterruptionResult(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkItemResult]
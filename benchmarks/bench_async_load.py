@@ -0,0 +1,161 @@
+"""
+Load test: sync stats router (threadpool) vs async stats router (DB_ASYNC).
+
+    python -m benchmarks.bench_async_load [--requests 1000] [--concurrency 400] [--latency-ms 100]
+
+Every database statement gets `--latency-ms` of simulated network latency
+(a blocking sleep for the sync driver, an awaited one for aiosqlite), the
+stats cache is disabled and `--concurrency` clients hit /stats/summary at
+once. "peak in DB" is the maximum number of statements waiting on the
+database at the same time: the sync router cannot exceed the threadpool
+size (40 by default), the async one is only bounded by the clients.
+aiosqlite still runs each connection on its own thread, so on SQLite the
+throughput gain is bounded by the GIL; asyncpg has no such threads.
+
+Only STATS_BACKEND=python is measured: it is the backend whose queries the
+async router awaits. The other backends run in worker threads on a sync
+session, which this benchmark does not cover.
+"""
+import argparse
+import asyncio
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import event
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.cache import NullCacheBackend, stats_cache
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db import create_async_db_engine, get_async_session, get_session
+from app.routers import stats, stats_async
+from benchmarks.common import make_engine, print_table, seed_user_activity
+
+
+class InFlight:
+    """Thread-safe counter of statements currently waiting on the database."""
+
+    def __init__(self):
+        self.current = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def enter(self) -> None:
+        with self._lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def leave(self) -> None:
+        with self._lock:
+            self.current -= 1
+
+
+async def run_clients(app: FastAPI, token: str, requests: int, concurrency: int):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(
+                    f"{settings.API_V1_STR}/stats/summary?range=30d",
+                    headers={"Authorization": f"Bearer {token}"},
+                )
+                response.raise_for_status()
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+    return elapsed, latencies
+
+
+def sync_app(url: str, latency: float, in_flight: InFlight, pool_size: int) -> FastAPI:
+    engine = make_engine(url, pool_size=pool_size)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def slow_database(*args, **kwargs):
+        in_flight.enter()
+        time.sleep(latency)
+        in_flight.leave()
+
+    def override_get_session():
+        with Session(engine) as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(stats.router, prefix=settings.API_V1_STR)
+    app.dependency_overrides[get_session] = override_get_session
+    return app
+
+
+def async_app(url: str, latency: float, in_flight: InFlight, pool_size: int) -> FastAPI:
+    import aiosqlite
+
+    original_execute = aiosqlite.Cursor.execute
+
+    async def slow_execute(self, sql, parameters=None):
+        in_flight.enter()
+        await asyncio.sleep(latency)
+        in_flight.leave()
+        return await original_execute(self, sql, parameters)
+
+    aiosqlite.Cursor.execute = slow_execute
+    engine = create_async_db_engine(url, pool_size=pool_size)
+
+    async def override_get_async_session():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(stats_async.router, prefix=settings.API_V1_STR)
+    app.dependency_overrides[get_async_session] = override_get_async_session
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=400)
+    parser.add_argument("--latency-ms", type=float, default=100)
+    parser.add_argument("--sessions", type=int, default=20)
+    args = parser.parse_args()
+
+    url = f"sqlite:///{Path(tempfile.mkdtemp()) / 'load.db'}"
+    with Session(make_engine(url)) as db:
+        user_id = seed_user_activity(db, sessions=args.sessions)
+    token = create_access_token(subject=user_id)
+    stats_cache.backend = NullCacheBackend()
+    settings.STATS_BACKEND = "python"
+
+    rows = []
+    for name, build in [("sync (threadpool)", sync_app), ("async (DB_ASYNC)", async_app)]:
+        in_flight = InFlight()
+        # Enough connections for every client: the pool is not what is measured
+        app = build(url, args.latency_ms / 1000, in_flight, pool_size=args.concurrency)
+        elapsed, latencies = asyncio.run(run_clients(app, token, args.requests, args.concurrency))
+        latencies.sort()
+        rows.append([
+            name,
+            f"{args.requests / elapsed:.0f}",
+            f"{statistics.median(latencies):.0f}",
+            f"{latencies[int(len(latencies) * 0.95) - 1]:.0f}",
+            in_flight.peak,
+        ])
+
+    print(
+        f"{args.requests} requests, {args.concurrency} concurrent clients, "
+        f"{args.latency_ms:.0f} ms simulated latency per statement\n"
+    )
+    print_table(["router", "req/s", "p50 ms", "p95 ms", "peak in DB"], rows)
+
+
+if __name__ == "__main__":
+    main()
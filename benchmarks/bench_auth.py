@@ -0,0 +1,59 @@
+"""
+Authentication cost per request: get_current_user with the auth cache off vs on.
+
+    python -m benchmarks.bench_auth [--requests 5000] [--repeat 3]
+
+Each simulated request opens its own Session (as `get_session` does) and
+resolves the bearer token to the user. Reports the best time per request
+and the SQL statements issued per request.
+"""
+import argparse
+
+from sqlmodel import Session
+
+from app.core.auth_cache import auth_cache
+from app.core.deps import get_current_user
+from app.core.security import create_access_token
+from app.models import User
+from benchmarks.common import QueryCounter, best_of, make_engine, print_table
+
+
+def run_requests(engine, token: str, requests: int) -> None:
+    for _ in range(requests):
+        with Session(engine) as session:
+            get_current_user(session=session, token=token)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--database-url", default="sqlite://")
+    args = parser.parse_args()
+
+    engine = make_engine(args.database_url)
+    with Session(engine) as db:
+        user = User(name="Bench", email="bench-auth@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        token = create_access_token(subject=user.id)
+
+    configured_ttl = auth_cache.ttl_seconds
+    rows = []
+    for label, ttl in [("off", 0), ("on", configured_ttl or 30)]:
+        auth_cache.ttl_seconds = ttl
+        auth_cache.clear()
+        run_requests(engine, token, 1)  # warm-up (fills the cache when on)
+        with QueryCounter(engine) as counter:
+            run_requests(engine, token, args.requests)
+        ms = best_of(args.repeat, lambda: run_requests(engine, token, args.requests))
+        rows.append([label, f"{ms * 1000 / args.requests:.1f}", f"{counter.count / args.requests:.2f}"])
+    auth_cache.ttl_seconds = configured_ttl
+
+    print(f"get_current_user, {args.requests} requests, best of {args.repeat}\n")
+    print_table(["cache", "us/request", "queries/request"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Interruption ingestion: one POST /interruptions/ per item vs POST /interruptions/bulk.
+
+    python -m benchmarks.bench_bulk_interruptions [--items 1000] [--batch-sizes 50,250,1000]
+
+Replays what an offline client does when it syncs `--items` interruptions
+against a SQLite file, through the real routers (auth, validation,
+rollups, data version). Reports items/s and SQL statements per item.
+"""
+import argparse
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db import create_db_engine, get_session
+from app.models import Session as WorkSession, User
+from app.routers import interruptions
+from benchmarks.common import INTERRUPTION_TYPES, QueryCounter, print_table, timer
+
+
+def make_items(session_id: int, count: int) -> List[dict]:
+    start = datetime.now(timezone.utc) - timedelta(hours=20)
+    items = []
+    for i in range(count):
+        it_start = start + timedelta(seconds=60 * i)
+        items.append({
+            "session_id": session_id,
+            "type": INTERRUPTION_TYPES[i % len(INTERRUPTION_TYPES)],
+            "description": "offline sync",
+            "start_time": it_start.isoformat(),
+            "end_time": (it_start + timedelta(seconds=30)).isoformat(),
+        })
+    return items
+
+
+def setup(directory: Path, name: str):
+    engine = create_db_engine(f"sqlite:///{directory / name}.db")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as db:
+        user = User(name="Bench", email="bench-bulk@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        work_session = WorkSession(user_id=user.id, start_time=datetime.now(timezone.utc) - timedelta(days=1))
+        db.add(work_session)
+        db.commit()
+        user_id, session_id = user.id, work_session.id
+
+    def override_get_session():
+        with Session(engine) as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(interruptions.router, prefix=settings.API_V1_STR)
+    app.dependency_overrides[get_session] = override_get_session
+    client = TestClient(app, headers={"Authorization": f"Bearer {create_access_token(subject=user_id)}"})
+    return engine, client, session_id
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--batch-sizes", default="50,250,1000")
+    args = parser.parse_args()
+
+    directory = Path(tempfile.mkdtemp())
+    rows = []
+
+    engine, client, session_id = setup(directory, "single")
+    items = make_items(session_id, args.items)
+    with QueryCounter(engine) as counter, timer() as t:
+        for item in items:
+            client.post(f"{settings.API_V1_STR}/interruptions/", json=item).raise_for_status()
+    rows.append(["single", args.items, f"{args.items / (t['ms'] / 1000):.0f}", f"{counter.count / args.items:.2f}"])
+
+    for batch_size in (int(b) for b in args.batch_sizes.split(",")):
+        engine, client, session_id = setup(directory, f"bulk-{batch_size}")
+        items = make_items(session_id, args.items)
+        with QueryCounter(engine) as counter, timer() as t:
+            for offset in range(0, len(items), batch_size):
+                response = client.post(f"{settings.API_V1_STR}/interruptions/bulk", json=items[offset:offset + batch_size])
+                response.raise_for_status()
+                assert response.json()["failed"] == 0
+        rows.append([f"bulk x{batch_size}", args.items, f"{args.items / (t['ms'] / 1000):.0f}", f"{counter.count / args.items:.2f}"])
+
+    print(f"{args.items} interruptions into a SQLite file\n")
+    print_table(["path", "items", "items/s", "queries/item"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Concurrent interruption writes on a SQLite file: driver defaults vs the
+tuned engine of app/db.py (WAL, synchronous=NORMAL, busy_timeout, ...).
+
+    python -m benchmarks.bench_concurrent_writes [--writers 8] [--writes 100] [--readers 4]
+
+Each write does what POST /interruptions does in one transaction (insert,
+rollup update, data version bump, commit) while reader threads keep
+computing the dashboard of the same user.
+"""
+import argparse
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core.data_version import bump_data_version
+from app.core.rollups import record_interruption
+from app.core.stats_logic import get_dashboard_stats
+from app.db import create_db_engine
+from app.models import Interruption, Session as WorkSession
+from benchmarks.common import print_table, seed_user_activity
+
+
+def run(engine, writers: int, writes: int, readers: int):
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as db:
+        user_id = seed_user_activity(db, sessions=200)
+        work_session = WorkSession(user_id=user_id, start_time=datetime.now(timezone.utc) - timedelta(hours=1))
+        db.add(work_session)
+        db.commit()
+        session_id = work_session.id
+
+    latencies = []
+    errors = 0
+    reads = 0
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def writer():
+        nonlocal errors
+        for _ in range(writes):
+            start = time.perf_counter()
+            try:
+                with Session(engine) as db:
+                    now = datetime.now(timezone.utc)
+                    interruption = Interruption(
+                        session_id=session_id,
+                        user_id=user_id,
+                        type="digital",
+                        description="bench",
+                        start_time=now,
+                        end_time=now + timedelta(seconds=30),
+                        duration=30,
+                    )
+                    db.add(interruption)
+                    record_interruption(db, interruption)
+                    bump_data_version(db, user_id)
+                    db.commit()
+            except OperationalError:
+                with lock:
+                    errors += 1
+                continue
+            with lock:
+                latencies.append((time.perf_counter() - start) * 1000)
+
+    def reader():
+        nonlocal reads
+        while not done.is_set():
+            try:
+                with Session(engine) as db:
+                    get_dashboard_stats(user_id, db, 7)
+                with lock:
+                    reads += 1
+            except OperationalError:
+                pass
+
+    reader_threads = [threading.Thread(target=reader) for _ in range(readers)]
+    writer_threads = [threading.Thread(target=writer) for _ in range(writers)]
+    for thread in reader_threads:
+        thread.start()
+    start = time.perf_counter()
+    for thread in writer_threads:
+        thread.start()
+    for thread in writer_threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    done.set()
+    for thread in reader_threads:
+        thread.join()
+    engine.dispose()
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else float("nan")
+    return [
+        f"{len(latencies) / elapsed:.0f}",
+        f"{statistics.median(latencies) if latencies else float('nan'):.1f}",
+        f"{p95:.1f}",
+        errors,
+        f"{reads / elapsed:.1f}",
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=100)
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+
+    directory = Path(tempfile.mkdtemp())
+    profiles = [
+        # What app/db.py did before: no pragmas, driver defaults
+        ("defaults", lambda url: create_engine(url, connect_args={"check_same_thread": False})),
+        ("tuned", create_db_engine),
+    ]
+    rows = []
+    for name, build in profiles:
+        engine = build(f"sqlite:///{directory / f'{name}.db'}")
+        rows.append([name] + run(engine, args.writers, args.writes, args.readers))
+
+    print(f"{args.writers} writers x {args.writes} writes, {args.readers} dashboard readers\n")
+    print_table(["engine", "writes/s", "p50 ms", "p95 ms", "errors", "reads/s"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Dashboard page load: five separate /stats/* requests vs one /stats/dashboard.
+
+    python -m benchmarks.bench_dashboard [--sessions 2000] [--repeat 5]
+
+The stats cache is disabled, so every repeat computes the stats instead of
+timing a cache hit.
+"""
+import argparse
+import logging
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.cache import NullCacheBackend, stats_cache
+from app.core.security import create_access_token
+from app.db import get_session
+from app.main import app
+from benchmarks.common import QueryCounter, best_of, make_engine, print_table, seed_user_activity
+
+SEPARATE_URLS = [
+    "/api/v1/stats/summary",
+    "/api/v1/stats/interruption-types",
+    "/api/v1/stats/productive-hours",
+    "/api/v1/stats/peak-distraction-time",
+    "/api/v1/stats/weekly-pattern",
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--range", default="30d")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = make_engine()
+    with Session(engine) as db:
+        user_id = seed_user_activity(db, sessions=args.sessions)
+
+    def override_get_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    stats_cache.backend = NullCacheBackend()
+    headers = {"Authorization": f"Bearer {create_access_token(subject=user_id)}"}
+
+    with TestClient(app) as client:
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+
+        def load_separately():
+            for url in SEPARATE_URLS:
+                client.get(f"{url}?range={args.range}", headers=headers).raise_for_status()
+
+        def load_dashboard():
+            client.get(f"/api/v1/stats/dashboard?range={args.range}", headers=headers).raise_for_status()
+
+        rows = []
+        for name, fn, requests in [("5 endpoints", load_separately, 5), ("/stats/dashboard", load_dashboard, 1)]:
+            with QueryCounter(engine) as counter:
+                fn()
+            rows.append([name, requests, counter.count, f"{best_of(args.repeat, fn):.1f}"])
+
+    app.dependency_overrides.clear()
+    print(f"{args.sessions} sessions, {args.sessions * 4} interruptions, range={args.range}\n")
+    print_table(["page load", "requests", "queries", "best ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Export memory: streamed NDJSON (GET /export/interruptions) vs materializing every row.
+
+    python -m benchmarks.bench_export [--rows 1000000] [--budget-mb 64]
+
+Seeds `--rows` interruptions in a SQLite file, then exports them in a fresh
+child process per mode and reports the peak RSS growth over the child's
+baseline (after imports). Exits with status 1 if the streamed export grows
+by more than `--budget-mb`.
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlmodel import Session, select
+
+from app.models import Interruption
+from app.routers.export import INTERRUPTION_COLUMNS, ExportFormat, export_query, stream_export
+from benchmarks.common import make_engine, print_table, seed_user_activity
+
+INTERRUPTIONS_PER_SESSION = 4
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def child(url: str, mode: str) -> None:
+    engine = make_engine(url)
+    baseline = _peak_rss_mb()
+    start = time.perf_counter()
+    exported = 0
+    with Session(engine) as db:
+        if mode == "stream":
+            query = export_query(Interruption, INTERRUPTION_COLUMNS, None)
+            for chunk in stream_export(db, query, ExportFormat.ndjson):
+                exported += len(chunk)
+        else:
+            rows = db.exec(select(Interruption)).all()
+            exported = len(json.dumps([row.model_dump(mode="json") for row in rows]))
+    print(json.dumps({
+        "seconds": time.perf_counter() - start,
+        "mb": exported / 1024 / 1024,
+        "rss_growth_mb": _peak_rss_mb() - baseline,
+    }))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--budget-mb", type=float, default=64)
+    parser.add_argument("--skip-materialized", action="store_true")
+    parser.add_argument("--child", choices=["stream", "materialized"], help=argparse.SUPPRESS)
+    parser.add_argument("--database-url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.database_url, args.child)
+        return
+
+    url = f"sqlite:///{Path(tempfile.mkdtemp()) / 'export.db'}"
+    start = time.perf_counter()
+    with Session(make_engine(url)) as db:
+        seed_user_activity(
+            db,
+            sessions=args.rows // INTERRUPTIONS_PER_SESSION,
+            interruptions_per_session=INTERRUPTIONS_PER_SESSION,
+            days=365,
+        )
+    print(f"Seeded {args.rows} interruptions in {time.perf_counter() - start:.0f}s\n")
+
+    modes = ["stream"] if args.skip_materialized else ["stream", "materialized"]
+    rows = []
+    results = {}
+    for mode in modes:
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_export", "--child", mode, "--database-url", url],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        results[mode] = json.loads(output.strip().splitlines()[-1])
+        rows.append([
+            mode,
+            f"{results[mode]['mb']:.0f}",
+            f"{results[mode]['seconds']:.1f}",
+            f"{results[mode]['rss_growth_mb']:.0f}",
+        ])
+    print_table(["export", "output MB", "seconds", "peak RSS growth MB"], rows)
+
+    growth = results["stream"]["rss_growth_mb"]
+    verdict = "within" if growth <= args.budget_mb else "OVER"
+    print(f"\nstream: {growth:.0f} MB growth, {verdict} the {args.budget_mb:.0f} MB budget")
+    if growth > args.budget_mb:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""
+HTTP load test of the real app: uvicorn workers driven by scripted user journeys.
+
+    python -m benchmarks.bench_http_load [--workers 4] [--clients 64] [--duration 30]
+        [--users 64] [--history 200] [--interruptions 3] [--database-url URL] [--no-attribution]
+
+Seeds a fresh SQLite file (or `--database-url`) with `--users` users and
+`--history` past sessions each (`benchmarks.datagen`), starts
+`uvicorn app.main:app --workers N` on a free localhost port against it and
+runs `--clients` virtual users for `--duration` seconds. Each one repeats
+the journey of a real visit, as its own user:
+
+    log in -> start a session -> post `--interruptions` interruptions
+    -> end the session -> load the dashboard
+
+The full stack is exercised: uvicorn, the middlewares (metrics, slowapi,
+CORS), authentication, pydantic, Argon2 and the database. The first
+`--warmup` seconds are left out of the figures.
+
+Reports, per step, throughput and latency percentiles, then where the time
+went. The server runs with REQUEST_PROFILING, so every response carries a
+Server-Timing header (app/core/profiling.py) splitting it into:
+
+- outside: client latency minus the server's total, i.e. HTTP parsing and
+  waiting for a busy worker's event loop
+- deps+io: dependencies (authentication, DB session) and serialization
+- db / fetch: SQL statements and reading their rows
+- app: the endpoint's own Python (for the login, the Argon2 hashing)
+
+plus the CPU used by the uvicorn processes and by this load generator
+(from /proc, Linux only): workers near 100% each are CPU bound, a load
+generator near 100% means the numbers are the client's limit.
+`--no-attribution` runs the server without the profiling hooks.
+"""
+import argparse
+import asyncio
+import os
+import re
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import update
+from sqlmodel import Session
+
+from app.core.security import get_password_hash
+from app.db import create_db_engine
+from app.migrations import migrate
+from app.models import User
+from benchmarks.common import print_table, timer
+from benchmarks.datagen import generate_activity
+
+PASSWORD = "load-test-password"
+STEPS = ["login", "start session", "interruption", "end session", "dashboard"]
+API = "/api/v1"
+TIMING_PATTERN = re.compile(r'(\w+);dur=([\d.]+)')
+
+# (step, seconds since start, latency ms, status, Server-Timing {name: ms})
+Sample = Tuple[str, float, float, int, Dict[str, float]]
+
+
+def seed(database_url: str, users: int, history: int) -> List[str]:
+    """Creates the users (all with PASSWORD) and their past activity. Returns their emails."""
+    engine = create_db_engine(database_url)
+    migrate(engine)
+    with Session(engine) as db:
+        user_ids = generate_activity(db, users=users, sessions_per_user=history, open_session_fraction=0)
+        db.exec(update(User).where(User.id.in_(user_ids)).values(hashed_password=get_password_hash(PASSWORD)))
+        db.commit()
+        emails = [db.get(User, user_id).email for user_id in user_ids]
+    engine.dispose()
+    return emails
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(database_url: str, workers: int, port: int, attribution: bool, log: Path) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "REQUEST_PROFILING": str(attribution).lower(),
+        "SLOW_REQUEST_MS": "0",
+    }
+    command = [
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+    ]
+    return subprocess.Popen(
+        command, env=env, stdout=log.open("wb"), stderr=subprocess.STDOUT, start_new_session=True
+    )
+
+
+def wait_until_up(base_url: str, server: subprocess.Popen, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("uvicorn exited during startup")
+        try:
+            if httpx.get(f"{base_url}/healthz", timeout=1).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"uvicorn did not answer within {timeout:.0f}s")
+
+
+def server_cpu_seconds(pid: int) -> Optional[float]:
+    """User + system CPU of the uvicorn process and its workers, from /proc."""
+    if not os.path.exists(f"/proc/{pid}/stat"):
+        return None
+    ticks = 0
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        try:
+            fields = Path(entry.path, "stat").read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        # Fields after the command name: state, ppid, ... utime (12), stime (13)
+        if int(entry.name) == pid or int(fields[1]) == pid:
+            ticks += int(fields[11]) + int(fields[12])
+    return ticks / os.sysconf("SC_CLK_TCK")
+
+
+async def journey(client: httpx.AsyncClient, email: str, interruptions: int, record) -> None:
+    async def step(name: str, method: str, url: str, **kwargs) -> httpx.Response:
+        start = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        timings = {key: float(dur) for key, dur in TIMING_PATTERN.findall(response.headers.get("server-timing", ""))}
+        record(name, (time.perf_counter() - start) * 1000, response.status_code, timings)
+        return response
+
+    login = await step("login", "POST", f"{API}/login/access-token", data={"username": email, "password": PASSWORD})
+    if login.status_code != 200:
+        return
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    started = await step("start session", "POST", f"{API}/sessions/start", json={}, headers=headers)
+    if started.status_code != 201:
+        return
+    session_id = started.json()["id"]
+    for i in range(interruptions):
+        begin = datetime.now(timezone.utc)
+        await step("interruption", "POST", f"{API}/interruptions/", headers=headers, json={
+            "session_id": session_id,
+            "type": ("digital", "external", "internal", "other")[i % 4],
+            "description": "Load test",
+            "start_time": begin.isoformat(),
+            "end_time": (begin + timedelta(seconds=30)).isoformat(),
+        })
+    await step("end session", "POST", f"{API}/sessions/{session_id}/end", headers=headers)
+    await step("dashboard", "GET", f"{API}/stats/dashboard", params={"range": "7d"}, headers=headers)
+
+
+async def drive(base_url: str, emails: List[str], clients: int, duration: float, interruptions: int) -> List[Sample]:
+    samples: List[Sample] = []
+    start = time.perf_counter()
+    deadline = start + duration
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+
+        async def virtual_user(email: str) -> None:
+            def record(name, ms, status, timings):
+                samples.append((name, time.perf_counter() - start, ms, status, timings))
+
+            # Journeys are never cut short: a session left open would fail the next start
+            while time.perf_counter() < deadline:
+                await journey(client, email, interruptions, record)
+
+        await asyncio.gather(*(virtual_user(emails[i]) for i in range(clients)))
+    return samples
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    return values[min(len(values) - 1, max(0, round(pct / 100 * len(values)) - 1))]
+
+
+def report(samples: List[Sample], warmup: float, elapsed: float, attribution: bool) -> None:
+    measured = [sample for sample in samples if sample[1] >= warmup]
+    window = max(elapsed - warmup, 1e-9)
+    by_step: Dict[str, List[Sample]] = defaultdict(list)
+    for sample in measured:
+        by_step[sample[0]].append(sample)
+
+    rows = []
+    for name in STEPS + ["all"]:
+        step_samples = measured if name == "all" else by_step.get(name, [])
+        if not step_samples:
+            continue
+        latencies = sorted(sample[2] for sample in step_samples)
+        errors = sum(1 for sample in step_samples if sample[3] >= 400)
+        rows.append([
+            name, len(step_samples), errors, f"{len(step_samples) / window:.1f}",
+            f"{percentile(latencies, 50):.1f}", f"{percentile(latencies, 95):.1f}",
+            f"{percentile(latencies, 99):.1f}", f"{latencies[-1]:.1f}",
+        ])
+    print(f"\nThroughput and latency over {window:.1f}s (ms)\n")
+    print_table(["step", "requests", "errors", "req/s", "p50", "p95", "p99", "max"], rows)
+
+    if not attribution:
+        return
+    rows = []
+    server_ms = {}
+    for name in STEPS:
+        timed = [sample for sample in by_step.get(name, []) if "total" in sample[4]]
+        if not timed:
+            continue
+        parts = {
+            "outside": statistics.mean(max(ms - t["total"], 0) for _, _, ms, _, t in timed),
+            "deps+io": statistics.mean(max(t["total"] - t["handler"], 0) for _, _, _, _, t in timed),
+            "db": statistics.mean(t["db"] for _, _, _, _, t in timed),
+            "fetch": statistics.mean(t["fetch"] for _, _, _, _, t in timed),
+            "app": statistics.mean(t["app"] for _, _, _, _, t in timed),
+        }
+        server_ms[name] = sum(t["total"] for _, _, _, _, t in timed)
+        mean_latency = statistics.mean(ms for _, _, ms, _, _ in timed)
+        bottleneck = max(parts, key=parts.get)
+        rows.append([
+            name, f"{mean_latency:.1f}", *(f"{value:.1f}" for value in parts.values()),
+            f"{bottleneck} ({parts[bottleneck] / mean_latency * 100:.0f}%)",
+        ])
+    print("\nWhere the time goes: mean ms per request\n")
+    print_table(["step", "latency", "outside", "deps+io", "db", "fetch", "app", "bottleneck"], rows)
+    total_server = sum(server_ms.values())
+    if total_server:
+        shares = ", ".join(f"{name} {ms / total_server * 100:.0f}%" for name, ms in server_ms.items())
+        print(f"\nServer time by step: {shares}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--users", type=int, help="defaults to --clients; each client needs its own user")
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--warmup", type=float, default=3)
+    parser.add_argument("--history", type=int, default=200, help="past sessions per user")
+    parser.add_argument("--interruptions", type=int, default=3, help="interruptions posted per journey")
+    parser.add_argument("--database-url", help="defaults to a SQLite file in a temporary directory")
+    parser.add_argument("--no-attribution", dest="attribution", action="store_false")
+    args = parser.parse_args()
+    users = args.users or args.clients
+    if users < args.clients:
+        parser.error("--users must be at least --clients: a user can only have one active session")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite:///{Path(tmp) / 'load.db'}"
+        with timer() as seeding:
+            emails = seed(database_url, users, args.history)
+        print(f"Seeded {users} users x {args.history} sessions in {seeding['ms'] / 1000:.1f}s", file=sys.stderr)
+
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        log = Path(tmp) / "uvicorn.log"
+        server = start_server(database_url, args.workers, port, args.attribution, log)
+        try:
+            wait_until_up(base_url, server)
+            cpu_before = server_cpu_seconds(server.pid)
+            client_cpu_before = time.process_time()
+            start = time.perf_counter()
+            samples = asyncio.run(drive(base_url, emails, args.clients, args.duration, args.interruptions))
+            elapsed = time.perf_counter() - start
+            cpu_after = server_cpu_seconds(server.pid)
+            client_cpu = (time.process_time() - client_cpu_before) / elapsed * 100
+        except RuntimeError:
+            print(log.read_text(), file=sys.stderr)
+            raise
+        finally:
+            os.killpg(server.pid, signal.SIGTERM)
+            server.wait(timeout=30)
+
+    print(f"\n{args.workers} uvicorn workers, {args.clients} clients, {args.interruptions} interruptions per journey")
+    report(samples, args.warmup, elapsed, args.attribution)
+    if cpu_before is not None and cpu_after is not None:
+        server_cpu = (cpu_after - cpu_before) / elapsed * 100
+        print(f"\nCPU: uvicorn {server_cpu:.0f}% ({server_cpu / args.workers:.0f}% per worker), "
+              f"load generator {client_cpu:.0f}% (100% = one core, {os.cpu_count()} cores)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Access-log cost: request latency with the previous synchronous handlers vs the queued pipeline.
+
+    python -m benchmarks.bench_logging [--requests 3000] [--concurrency 50] [--io-delay-ms 0 1]
+
+Calls the ASGI app directly on GET /healthz, `--concurrency` requests at a
+time, and writes one access-log line per request from the event loop, as
+uvicorn does. Modes:
+
+- none: no logging handlers, the reference
+- sync: the previous `setup_logging` (a FileHandler and a stdout
+  StreamHandler, written in the caller's thread)
+- queued: the current one (app/core/logging_config.py)
+
+stdout goes to a file, and `--io-delay-ms` adds that much time to each of
+its flushes: a slow disk, a full pipe or a container log driver under
+pressure. With synchronous handlers that time is spent inside the event
+loop, by every request in flight; with the queue it is spent by the writer
+thread. "dropped" counts the lines the queue had no room for.
+"""
+import os
+
+# Logging is what is measured; the rest of the instrumentation stays off
+os.environ["METRICS_ENABLED"] = "false"
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from app.core import logging_config
+from app.core.config import settings
+from app.main import app
+from benchmarks.bench_metrics import call
+from benchmarks.common import print_table
+
+ACCESS = logging.getLogger("uvicorn.access")
+
+
+class SlowStream:
+    """A file whose every flush takes `delay` seconds more."""
+
+    def __init__(self, path: Path, delay: float):
+        self.file = path.open("a")
+        self.delay = delay
+
+    def write(self, text: str) -> int:
+        return self.file.write(text)
+
+    def flush(self) -> None:
+        self.file.flush()
+        if self.delay:
+            time.sleep(self.delay)
+
+
+def sync_handlers(log_dir: Path) -> Callable[[], int]:
+    """The previous setup_logging: FileHandler + StreamHandler, no queue."""
+    formatter = logging.Formatter(logging_config.TEXT_FORMAT)
+    file_handler = logging.FileHandler(log_dir / "hyperfocus.log")
+    stream_handler = logging.StreamHandler(sys.stdout)
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+    ACCESS.handlers = [stream_handler, file_handler]
+    ACCESS.propagate = False
+
+    def teardown() -> int:
+        ACCESS.handlers = []
+        file_handler.close()
+        return 0
+
+    return teardown
+
+
+def queued_handlers(log_dir: Path) -> Callable[[], int]:
+    settings.LOG_DIR = str(log_dir)
+    handler = logging_config.setup_logging()
+
+    def teardown() -> int:
+        logging_config.shutdown_logging()
+        return handler.dropped
+
+    return teardown
+
+
+def no_handlers(log_dir: Path) -> Callable[[], int]:
+    ACCESS.handlers = [logging.NullHandler()]
+    ACCESS.propagate = False
+    return lambda: 0
+
+
+MODES = {"none": no_handlers, "sync": sync_handlers, "queued": queued_handlers}
+
+
+async def run(requests: int, concurrency: int) -> List[float]:
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            status = await call(app, "/healthz", b"", [])
+            ACCESS.info('%s - "%s %s HTTP/%s" %d', "127.0.0.1:50000", "GET", "/healthz", "1.1", status)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def measure(mode: str, args, delay: float, tmp: Path) -> Dict[str, float]:
+    log_dir = tmp / f"{mode}-{delay}"
+    log_dir.mkdir()
+    stdout = sys.stdout
+    sys.stdout = SlowStream(log_dir / "console.log", delay)
+    teardown = MODES[mode](log_dir)
+    try:
+        asyncio.run(run(args.requests // 10, args.concurrency))
+        latencies = asyncio.run(run(args.requests, args.concurrency))
+    finally:
+        dropped = teardown()
+        sys.stdout.file.close()
+        sys.stdout = stdout
+    elapsed = latencies.pop()
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": statistics.median(latencies),
+        "p99": latencies[int(len(latencies) * 0.99) - 1],
+        "dropped": dropped,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--io-delay-ms", type=float, nargs="+", default=[0, 1])
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for delay_ms in args.io_delay_ms:
+            for mode in MODES:
+                result = measure(mode, args, delay_ms / 1000, Path(tmp))
+                rows.append([
+                    f"{delay_ms:g}", mode, f"{result['rps']:.0f}", f"{result['p50']:.2f}",
+                    f"{result['p99']:.2f}", result["dropped"],
+                ])
+
+    print(f"GET /healthz, {args.requests} requests, {args.concurrency} concurrent, one access-log line each\n")
+    print_table(["io delay ms", "logging", "req/s", "p50 ms", "p99 ms", "dropped"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Login storm: Argon2 inline in the sync handler vs the hashing pool.
+
+    python -m benchmarks.bench_login_storm [--logins 200] [--concurrency 100] [--probes 4]
+
+`--concurrency` clients log in at once while `--probes` clients keep
+calling GET /users/me (a sync endpoint served by the Starlette threadpool).
+"inline" is the previous login handler, which ran Argon2 on a threadpool
+thread; "pool" is the current one (app/core/hashing.py). Reports the login
+outcome (200 / 503) and the latency the other endpoint sees meanwhile.
+"""
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, List
+
+import httpx
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlmodel import Session, select
+
+from app.core import hashing
+from app.core.config import settings
+from app.core.hashing import HashingPool
+from app.core.security import create_access_token, get_password_hash, verify_password
+from app.db import get_session
+from app.models import User
+from app.routers import auth, users
+from benchmarks.common import make_engine, print_table
+
+PASSWORD = "storm-password"
+
+
+def inline_login(
+    session: Session = Depends(get_session), form_data: OAuth2PasswordRequestForm = Depends()
+) -> Any:
+    """The login handler before the hashing pool (sync, Argon2 inline)."""
+    user = session.exec(select(User).where(User.email == form_data.username)).first()
+    if not user or not verify_password(form_data.password, user.hashed_password):
+        raise HTTPException(status_code=400, detail="Incorrect email or password")
+    return {"access_token": create_access_token(subject=user.id), "token_type": "bearer"}
+
+
+def build_app(engine, inline: bool) -> FastAPI:
+    def override_get_session():
+        with Session(engine) as session:
+            yield session
+
+    app = FastAPI()
+    if inline:
+        app.post(f"{settings.API_V1_STR}/login/access-token")(inline_login)
+    else:
+        app.include_router(auth.router, prefix=settings.API_V1_STR)
+    app.include_router(users.router, prefix=settings.API_V1_STR)
+    app.dependency_overrides[get_session] = override_get_session
+    return app
+
+
+async def storm(app: FastAPI, emails: List[str], token: str, concurrency: int, probes: int):
+    statuses: List[int] = []
+    login_ms: List[float] = []
+    probe_ms: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        done = asyncio.Event()
+
+        async def login(email: str):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post(
+                    f"{settings.API_V1_STR}/login/access-token",
+                    data={"username": email, "password": PASSWORD},
+                )
+                login_ms.append((time.perf_counter() - start) * 1000)
+                statuses.append(response.status_code)
+
+        async def probe():
+            while not done.is_set():
+                start = time.perf_counter()
+                response = await client.get(
+                    f"{settings.API_V1_STR}/users/me", headers={"Authorization": f"Bearer {token}"}
+                )
+                response.raise_for_status()
+                probe_ms.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.01)
+
+        probers = [asyncio.create_task(probe()) for _ in range(probes)]
+        start = time.perf_counter()
+        await asyncio.gather(*(login(email) for email in emails))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await asyncio.gather(*probers)
+    return elapsed, statuses, login_ms, probe_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--probes", type=int, default=4)
+    args = parser.parse_args()
+
+    # Enough connections for every client: the pool is not what is measured
+    engine = make_engine(
+        f"sqlite:///{Path(tempfile.mkdtemp()) / 'storm.db'}", pool_size=args.concurrency + args.probes
+    )
+    hashed_password = get_password_hash(PASSWORD)
+    emails = [f"storm-{i}@example.com" for i in range(args.logins)]
+    with Session(engine) as db:
+        for email in emails:
+            db.add(User(name="Storm", email=email, hashed_password=hashed_password))
+        db.commit()
+        token = create_access_token(subject=db.exec(select(User.id)).first())
+
+    rows = []
+    for name, inline in [("inline", True), ("pool", False)]:
+        pool = HashingPool(settings.PASSWORD_HASH_EXECUTOR, settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE_SIZE)
+        hashing.hashing_pool = pool
+        try:
+            elapsed, statuses, login_ms, probe_ms = asyncio.run(
+                storm(build_app(engine, inline), emails, token, args.concurrency, args.probes)
+            )
+        finally:
+            pool.shutdown()
+        probe_ms.sort()
+        rows.append([
+            name,
+            f"{elapsed:.1f}",
+            statuses.count(200),
+            statuses.count(503),
+            f"{statistics.median(login_ms):.0f}",
+            len(probe_ms),
+            f"{statistics.median(probe_ms):.0f}",
+            f"{probe_ms[int(len(probe_ms) * 0.95) - 1]:.0f}",
+            f"{probe_ms[-1]:.0f}",
+        ])
+
+    print(
+        f"{args.logins} logins, {args.concurrency} concurrent, {args.probes} GET /users/me probes; "
+        f"pool: {settings.PASSWORD_HASH_EXECUTOR} x{settings.PASSWORD_HASH_WORKERS}, "
+        f"queue {settings.PASSWORD_HASH_QUEUE_SIZE}\n"
+    )
+    print_table(
+        ["login", "storm s", "200", "503", "login p50 ms", "probes", "probe p50 ms", "probe p95 ms", "probe max ms"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Metrics overhead: requests served with and without the /metrics instrumentation.
+
+    python -m benchmarks.bench_metrics [--requests 200] [--rounds 9] [--budget-pct 2]
+
+Calls the ASGI app directly (no HTTP client in the way) on a health check,
+a session listing and a stats endpoint, alternating rounds with the
+instrumentation on (MetricsMiddleware + engine events) and off, and reports
+the median round of each.
+
+Sync endpoints hop to the threadpool several times per request, so those
+end-to-end timings move by several percent from run to run, more than the
+instrumentation costs. The budget is therefore checked on the measured cost
+of the instrumentation itself: the middleware around an app that does
+nothing, plus the engine events per SQL statement times the statements each
+route issued (read back from the metrics). Exits with status 1 if that
+exceeds `--budget-pct` of a database endpoint's time.
+"""
+import os
+
+# The instrumented app is built below; the imported one stays bare.
+# Stats are recomputed on every call so the endpoint does its queries.
+os.environ["METRICS_ENABLED"] = "false"
+os.environ["STATS_CACHE_BACKEND"] = "none"
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+from sqlmodel import Session
+
+from app.core.metrics import (
+    DB_QUERIES,
+    HTTP_REQUESTS,
+    MetricsMiddleware,
+    instrument_engines,
+    metrics,
+    uninstrument_engines,
+)
+from app.core.security import create_access_token
+from app.db import get_session
+from app.main import app
+from benchmarks.common import make_engine, print_table, seed_user_activity
+
+ENDPOINTS = [
+    ("/healthz", b""),
+    ("/api/v1/sessions/", b"limit=20"),
+    ("/api/v1/stats/summary", b"range=7d"),
+]
+
+
+async def call(asgi_app, path: str, query: bytes, headers) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query,
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await asgi_app(scope, receive, send)
+    return status
+
+
+async def run_round(asgi_app, path: str, query: bytes, headers, requests: int) -> float:
+    """Microseconds per request."""
+    start = time.perf_counter()
+    for _ in range(requests):
+        status = await call(asgi_app, path, query, headers)
+    assert status == 200, f"{path} answered {status}"
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+async def end_to_end(args, headers):
+    instrumented = MetricsMiddleware(app)
+    results = {}
+    for path, query in ENDPOINTS:
+        rounds = {"off": [], "on": []}
+        await run_round(app, path, query, headers, args.requests // 10)
+        for i in range(args.rounds):
+            # Alternating which mode goes first cancels out any drift within a round
+            for mode in ("off", "on") if i % 2 == 0 else ("on", "off"):
+                (instrument_engines if mode == "on" else uninstrument_engines)()
+                asgi_app = instrumented if mode == "on" else app
+                rounds[mode].append(await run_round(asgi_app, path, query, headers, args.requests))
+        uninstrument_engines()
+        results[path] = {mode: statistics.median(values) for mode, values in rounds.items()}
+    return results
+
+
+async def instrumentation_cost(engine, statements: int, requests: int = 10_000) -> float:
+    """
+    Microseconds the instrumentation adds to a request running `statements`
+    SQL statements inline (no threadpool, so the timing is stable).
+    """
+
+    class Route:
+        path = "/noop"
+
+    async def discard(message):
+        pass
+
+    with engine.connect() as connection:
+
+        async def handler(scope, receive, send):
+            scope["route"] = Route
+            for _ in range(statements):
+                connection.exec_driver_sql("SELECT 1").close()
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        apps = {"off": handler, "on": MetricsMiddleware(handler)}
+        best = {"off": float("inf"), "on": float("inf")}
+        for _ in range(5):
+            for mode, asgi_app in apps.items():
+                (instrument_engines if mode == "on" else uninstrument_engines)()
+                start = time.perf_counter()
+                for _ in range(requests):
+                    await asgi_app({"type": "http", "method": "GET"}, None, discard)
+                best[mode] = min(best[mode], (time.perf_counter() - start) / requests * 1e6)
+        uninstrument_engines()
+    return best["on"] - best["off"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=9)
+    parser.add_argument("--budget-pct", type=float, default=2)
+    args = parser.parse_args()
+
+    engine = make_engine()
+    with Session(engine) as db:
+        user_id = seed_user_activity(db, sessions=200, interruptions_per_session=4)
+
+    def bench_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = bench_session
+    headers = [(b"authorization", f"Bearer {create_access_token(subject=user_id)}".encode())]
+
+    metrics.clear()
+    results = asyncio.run(end_to_end(args, headers))
+    values, _ = metrics.collect()
+    per_request = asyncio.run(instrumentation_cost(engine, 0))
+    per_statement = (asyncio.run(instrumentation_cost(engine, 10)) - per_request) / 10
+
+    rows = []
+    worst = 0.0
+    for path, _ in ENDPOINTS:
+        off, on = results[path]["off"], results[path]["on"]
+        requests = sum(v for (name, labels), v in values.items() if name == HTTP_REQUESTS and labels[1] == path)
+        statements = values.get((DB_QUERIES, (path,)), 0) / requests
+        cost = per_request + statements * per_statement
+        overhead = cost / off * 100
+        if path != "/healthz":
+            worst = max(worst, overhead)
+        rows.append([
+            path, f"{off:.0f}", f"{on:.0f}", f"{(on - off) / off * 100:+.1f}%",
+            f"{statements:.0f}", f"{cost:.1f}", f"{overhead:.2f}%",
+        ])
+    print_table(
+        ["endpoint", "off µs/req", "on µs/req", "measured", "SQL/req", "instr. µs/req", "overhead"], rows
+    )
+
+    print(f"\ninstrumentation: {per_request:.1f} µs per request + {per_statement:.1f} µs per SQL statement")
+    verdict = "within" if worst <= args.budget_pct else "OVER"
+    print(f"worst overhead on database endpoints: {worst:.2f}%, {verdict} the {args.budget_pct:.0f}% budget")
+    if worst > args.budget_pct:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
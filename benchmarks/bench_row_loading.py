@@ -0,0 +1,79 @@
+"""
+Stats row loading: full ORM objects vs the column-only tuples of stats_logic.
+
+    python -m benchmarks.bench_row_loading [--sessions 20000] [--repeat 3]
+
+Reports the best load time and the peak memory allocated while loading the
+sessions and interruptions of the range (tracemalloc).
+"""
+import argparse
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from sqlmodel import Session, select
+
+from app.core.stats_logic import _get_interruptions_in_range, _get_sessions_in_range
+from app.models import Interruption, Session as WorkSession
+from benchmarks.common import best_of, make_engine, print_table, seed_user_activity
+
+
+def load_orm(db: Session, user_id: int, since: datetime, now: datetime):
+    """The previous loaders: whole SQLModel objects."""
+    sessions = db.exec(
+        select(WorkSession).where(WorkSession.user_id == user_id, WorkSession.start_time >= since)
+    ).all()
+    interruptions = db.exec(
+        select(Interruption).where(Interruption.user_id == user_id, Interruption.start_time >= since)
+    ).all()
+    return sessions, interruptions
+
+
+def load_columns(db: Session, user_id: int, since: datetime, now: datetime):
+    return (
+        _get_sessions_in_range(user_id, db, since, now),
+        _get_interruptions_in_range(user_id, db, since),
+    )
+
+
+def peak_kib(engine, loader, user_id: int, since: datetime, now: datetime) -> float:
+    # Fresh session so the identity map starts empty
+    with Session(engine) as db:
+        tracemalloc.start()
+        loader(db, user_id, since, now)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20000)
+    parser.add_argument("--range-days", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = make_engine()
+    with Session(engine) as db:
+        user_id = seed_user_activity(db, sessions=args.sessions, days=args.range_days)
+
+    now = datetime.now(timezone.utc)
+    since = now - timedelta(days=args.range_days)
+
+    rows = []
+    for name, loader in [("ORM objects", load_orm), ("column tuples", load_columns)]:
+        def run():
+            with Session(engine) as db:
+                loader(db, user_id, since, now)
+
+        rows.append([
+            name,
+            f"{best_of(args.repeat, run):.1f}",
+            f"{peak_kib(engine, loader, user_id, since, now):,.0f}",
+        ])
+
+    print(f"{args.sessions} sessions, {args.sessions * 4} interruptions, range={args.range_days}d\n")
+    print_table(["loader", "best ms", "peak KiB"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Stats backends over growing datasets: dashboard computed by each engine.
+
+    python -m benchmarks.bench_stats_engines [--rows 10000 100000 1000000] [--repeat 3]
+
+`rows` counts sessions plus interruptions (one session every five rows).
+The numpy engine is skipped when numpy is not installed.
+"""
+import argparse
+
+from sqlmodel import Session
+
+from app.core.stats_backends import STATS_BACKENDS
+from app.core.stats_numpy import np
+from benchmarks.common import best_of, make_engine, print_table, seed_user_activity, timer
+
+INTERRUPTIONS_PER_SESSION = 4
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--range-days", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--backends", nargs="+", default=["python", "sql", "numpy"])
+    args = parser.parse_args()
+
+    backends = [name for name in args.backends if name != "numpy" or np is not None]
+    rows = []
+    for total_rows in args.rows:
+        sessions = total_rows // (INTERRUPTIONS_PER_SESSION + 1)
+        engine = make_engine()
+        with Session(engine) as db, timer() as seeding:
+            user_id = seed_user_activity(
+                db, sessions=sessions, interruptions_per_session=INTERRUPTIONS_PER_SESSION, days=args.range_days
+            )
+
+        row = [total_rows, f"{seeding['ms'] / 1000:.1f}s"]
+        for name in backends:
+            backend = STATS_BACKENDS[name]
+            with Session(engine) as db:
+                ms = best_of(args.repeat, lambda: backend.get_dashboard_stats(user_id, db, args.range_days))
+            row.append(f"{ms:.1f}")
+        rows.append(row)
+        engine.dispose()
+
+    print(f"Dashboard over {args.range_days} days, best of {args.repeat} (ms)\n")
+    print_table(["rows", "seed"] + backends, rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Shared helpers for the benchmark scripts (run them with `python -m benchmarks.<name>`).
+"""
+import random
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterator, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.models import Interruption, Session as WorkSession, User
+
+INTERRUPTION_TYPES = ["external", "digital", "internal", "other"]
+
+
+def make_engine(url: str = "sqlite://", **engine_kwargs) -> Engine:
+    """In-memory SQLite by default (one shared connection), or any database URL."""
+    if url == "sqlite://":
+        engine = create_engine(url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    elif url.startswith("sqlite"):
+        engine = create_engine(url, connect_args={"check_same_thread": False}, **engine_kwargs)
+    else:
+        engine = create_engine(url, **engine_kwargs)
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+def seed_user_activity(
+    db: Session,
+    sessions: int,
+    interruptions_per_session: int = 4,
+    days: int = 30,
+    seed: int = 42,
+) -> int:
+    """
+    Creates a user with `sessions` finished sessions spread over the last `days`
+    days, each with `interruptions_per_session` interruptions. Returns the user id.
+    """
+    rng = random.Random(seed)
+    user = User(name="Bench", email=f"bench-{seed}-{sessions}@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+
+    now = datetime.now(timezone.utc)
+    session_rows: List[Dict] = []
+    for _ in range(sessions):
+        start = now - timedelta(seconds=rng.randint(3600, days * 86400))
+        session_rows.append(
+            {"user_id": user.id, "start_time": start, "end_time": start + timedelta(minutes=rng.randint(10, 240))}
+        )
+    db.bulk_insert_mappings(WorkSession, session_rows, return_defaults=True)
+
+    interruption_rows: List[Dict] = []
+    for row in session_rows:
+        for _ in range(interruptions_per_session):
+            start = row["start_time"] + timedelta(minutes=rng.randint(0, 9))
+            duration = rng.randint(10, 600)
+            interruption_rows.append({
+                "session_id": row["id"],
+                "user_id": user.id,
+                "type": rng.choice(INTERRUPTION_TYPES),
+                "description": "benchmark",
+                "start_time": start,
+                "end_time": start + timedelta(seconds=duration),
+                "duration": duration,
+            })
+    db.bulk_insert_mappings(Interruption, interruption_rows)
+    db.commit()
+    return user.id
+
+
+class QueryCounter:
+    """Counts the SQL statements executed on an engine while active."""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, *args, **kwargs) -> None:
+        self.count += 1
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+@contextmanager
+def timer() -> Iterator[Dict[str, float]]:
+    """Measures the wall time of the block in milliseconds (result["ms"])."""
+    result = {"ms": 0.0}
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result["ms"] = (time.perf_counter() - start) * 1000
+
+
+def best_of(repeat: int, fn: Callable[[], object]) -> float:
+    """Runs fn `repeat` times and returns the best wall time in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        with timer() as t:
+            fn()
+        best = min(best, t["ms"])
+    return best
+
+
+def print_table(headers: List[str], rows: List[List[object]]) -> None:
+    widths = [max(len(str(x)) for x in [h] + [r[i] for r in rows]) for i, h in enumerate(headers)]
+    print("  ".join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in rows:
+        print("  ".join(str(x).ljust(w) for x, w in zip(row, widths)))
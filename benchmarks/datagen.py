@@ -0,0 +1,206 @@
+"""
+Seeded synthetic activity: users with realistic sessions and interruptions.
+
+    python -m benchmarks.datagen --database-url sqlite:///./bench.db --rows 100000 [--users 5]
+
+Each user gets habits of their own, drawn from the seed: a usual start hour,
+how much they work on weekends, session lengths and which interruption
+types they suffer most. Sessions are mostly on weekdays around that hour and
+last 10 min to 5 h (log-normal); a fraction run past midnight for one or two
+days, and some users have a session still running. Interruptions fall
+inside their session, more of them in longer sessions, lasting 5 s to 1 h.
+
+The same seed and volumes always produce the same rows (relative to now).
+Rows are inserted in batches, so a million of them fit in flat memory.
+"""
+import argparse
+import itertools
+import math
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional
+
+from sqlmodel import Session
+
+from app.models import Interruption, Session as WorkSession, User
+from benchmarks.common import INTERRUPTION_TYPES, make_engine, timer
+
+DESCRIPTIONS = {
+    "external": ["Doorbell", "Colleague at the desk", "Phone call", "Delivery"],
+    "digital": ["Slack ping", "Email notification", "Social media", "News tab"],
+    "internal": ["Lost focus", "Daydreaming", "Hungry", "Checked the time"],
+    "other": ["Coffee", "Meeting ran over", "Pet", "Noise outside"],
+}
+
+# Mean minutes of a regular session (log-normal, median 60 min)
+MEAN_SESSION_MINUTES = 60 * math.exp(0.6 ** 2 / 2)
+MAX_WORKED_MINUTES = 300
+BATCH_SIZE = 5_000
+
+
+def sessions_for_rows(rows: int, interruptions_per_session: float) -> int:
+    """Sessions to generate so that sessions plus interruptions total about `rows`."""
+    return max(1, round(rows / (1 + interruptions_per_session)))
+
+
+def _poisson(rng: random.Random, mean: float) -> int:
+    if mean > 30:
+        return max(0, round(rng.gauss(mean, math.sqrt(mean))))
+    # Knuth
+    limit, count, product = math.exp(-mean), 0, rng.random()
+    while product > limit:
+        count += 1
+        product *= rng.random()
+    return count
+
+
+class _Habits:
+    """How one user works, drawn once per user."""
+
+    def __init__(self, rng: random.Random):
+        self.start_hour = min(max(rng.gauss(9, 1.5), 6), 13)
+        self.weekend_ratio = rng.uniform(0.05, 0.4)
+        self.length_scale = rng.uniform(0.7, 1.3)
+        self.type_weights = [rng.random() ** 2 + 0.05 for _ in INTERRUPTION_TYPES]
+
+
+def _session_spans(
+    rng: random.Random,
+    habits: _Habits,
+    count: int,
+    days: int,
+    now: datetime,
+    multi_day_fraction: float,
+    has_open_session: bool,
+) -> Iterator[tuple]:
+    """(start, end) of `count` sessions; end is None for the one still running."""
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    for i in range(count):
+        if has_open_session and i == count - 1:
+            yield now - timedelta(minutes=rng.uniform(5, 240)), None
+            continue
+        while True:
+            day = today - timedelta(days=rng.randrange(days))
+            if day.weekday() < 5 or rng.random() < habits.weekend_ratio:
+                break
+        if rng.random() < multi_day_fraction:
+            # Left running overnight, over one or two days
+            start = day + timedelta(hours=rng.uniform(16, 23))
+            minutes = rng.uniform(12 * 60, 48 * 60)
+        else:
+            hour = min(max(rng.gauss(habits.start_hour + 3, 3), 0), 23.5)
+            start = day + timedelta(hours=hour)
+            minutes = min(max(rng.lognormvariate(math.log(60 * habits.length_scale), 0.6), 10), MAX_WORKED_MINUTES)
+        end = start + timedelta(minutes=minutes)
+        if end > now:
+            start, end = start - (end - now) - timedelta(minutes=1), now - timedelta(minutes=1)
+        yield start, end
+
+
+def _interruptions(
+    rng: random.Random,
+    habits: _Habits,
+    user_id: int,
+    session_id: int,
+    start: datetime,
+    end: datetime,
+    per_session: float,
+) -> List[Dict]:
+    length = (end - start).total_seconds()
+    # A session left running overnight is not worked (nor interrupted) throughout
+    worked_minutes = min(length / 60, MAX_WORKED_MINUTES)
+    rows = []
+    for _ in range(_poisson(rng, per_session * worked_minutes / MEAN_SESSION_MINUTES)):
+        duration = int(min(max(rng.lognormvariate(math.log(90), 1.0), 5), 3600, length))
+        it_start = start + timedelta(seconds=rng.uniform(0, length - duration))
+        it_type = rng.choices(INTERRUPTION_TYPES, habits.type_weights)[0]
+        rows.append({
+            "session_id": session_id,
+            "user_id": user_id,
+            "type": it_type,
+            "description": rng.choice(DESCRIPTIONS[it_type]),
+            "start_time": it_start,
+            "end_time": it_start + timedelta(seconds=duration),
+            "duration": duration,
+        })
+    return rows
+
+
+def generate_activity(
+    db: Session,
+    users: int = 1,
+    sessions_per_user: int = 100,
+    interruptions_per_session: float = 4,
+    days: int = 30,
+    multi_day_fraction: float = 0.02,
+    open_session_fraction: float = 0.5,
+    seed: int = 42,
+    now: Optional[datetime] = None,
+) -> List[int]:
+    """
+    Creates `users` users, each with about `sessions_per_user` sessions over
+    the last `days` days and `interruptions_per_session` interruptions per
+    session on average. A `multi_day_fraction` of the sessions span
+    midnight; an `open_session_fraction` of the users have one session still
+    running. Returns the user ids.
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+    user_ids = []
+    for index in range(users):
+        habits = _Habits(rng)
+        user = User(name=f"Synthetic {index}", email=f"synthetic-{seed}-{index}@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        user_ids.append(user.id)
+
+        spans = _session_spans(
+            rng, habits, sessions_per_user, days, now, multi_day_fraction, rng.random() < open_session_fraction
+        )
+        while True:
+            batch = [
+                {"user_id": user.id, "start_time": start, "end_time": end}
+                for start, end in itertools.islice(spans, BATCH_SIZE // 4)
+            ]
+            if not batch:
+                break
+            db.bulk_insert_mappings(WorkSession, batch, return_defaults=True)
+            interruption_rows = []
+            for row in batch:
+                interruption_rows.extend(_interruptions(
+                    rng, habits, user.id, row["id"], row["start_time"], row["end_time"] or now,
+                    interruptions_per_session,
+                ))
+            for offset in range(0, len(interruption_rows), BATCH_SIZE):
+                db.bulk_insert_mappings(Interruption, interruption_rows[offset:offset + BATCH_SIZE])
+            db.commit()
+    return user_ids
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite:///./bench.db")
+    parser.add_argument("--rows", type=int, default=100_000, help="sessions plus interruptions, all users")
+    parser.add_argument("--users", type=int, default=1)
+    parser.add_argument("--interruptions-per-session", type=float, default=4)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    sessions = sessions_for_rows(args.rows, args.interruptions_per_session) // args.users
+    engine = make_engine(args.database_url)
+    with Session(engine) as db, timer() as elapsed:
+        user_ids = generate_activity(
+            db,
+            users=args.users,
+            sessions_per_user=sessions,
+            interruptions_per_session=args.interruptions_per_session,
+            days=args.days,
+            seed=args.seed,
+        )
+    print(f"{len(user_ids)} users ({', '.join(map(str, user_ids))}) with {sessions} sessions each "
+          f"in {elapsed['ms'] / 1000:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
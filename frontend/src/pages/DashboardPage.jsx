@@ -36,22 +36,18 @@ export default function DashboardPage() {
     const fetchAllStats = async () => {
       setLoading(true);
       try {
-        const [summaryRes, typesRes, weeklyRes, hoursRes] = await Promise.all([
-          api.get(`/stats/summary?range=${range}`),
-          api.get(`/stats/interruption-types?range=${range}`),
-          api.get(`/stats/weekly-pattern?range=${range}`),
-          api.get(`/stats/productive-hours?range=${range}`)
-        ]);
+        // One request for every panel of the dashboard
+        const { data } = await api.get(`/stats/dashboard?range=${range}`);
 
-        setSummary(summaryRes.data || {});
+        setSummary(data?.summary || {});
         
         // Extract and transform data
-        const typesData = typesRes.data?.counts || {};
+        const typesData = data?.interruption_types?.counts || {};
         const mappedTypes = Object.entries(typesData).map(([name, value]) => ({ name, value }));
         setInterruptionTypes(mappedTypes);
 
-        setWeeklyPattern(Array.isArray(weeklyRes.data?.days) ? weeklyRes.data.days : []);
-        setProductiveHours(Array.isArray(hoursRes.data?.hours) ? hoursRes.data.hours : []);
+        setWeeklyPattern(Array.isArray(data?.weekly_pattern?.days) ? data.weekly_pattern.days : []);
+        setProductiveHours(Array.isArray(data?.productive_hours?.hours) ? data.productive_hours.hours : []);
       } catch (error) {
         console.error("Failed to fetch stats", error);
       } finally {
@@ -4,10 +4,15 @@ import { Button, Card } from '../components/ui';
 import { Play, Calendar, Clock, X, Zap } from 'lucide-react';
 import { FocusTimer } from '../components/features';
 
+// Sessions per page (the API paginates with the X-Next-Cursor header)
+const PAGE_SIZE = 50;
+
 export default function SessionsPage() {
   const [sessions, setSessions] = useState([]);
   const [activeSession, setActiveSession] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   
   // Timer State
   const [showStartModal, setShowStartModal] = useState(false);
@@ -15,8 +20,10 @@ export default function SessionsPage() {
 
   const fetchSessions = async () => {
     try {
-      const response = await api.get('/sessions/');
+      // Newest first: an active session is always on the first page
+      const response = await api.get('/sessions/', { params: { limit: PAGE_SIZE } });
       setSessions(response.data);
+      setNextCursor(response.headers['x-next-cursor'] || null);
       
       const active = response.data.find(s => !s.end_time);
       setActiveSession(active || null);
@@ -41,6 +48,20 @@ export default function SessionsPage() {
     fetchSessions();
   }, []);
 
+  const loadMoreSessions = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const response = await api.get('/sessions/', { params: { limit: PAGE_SIZE, cursor: nextCursor } });
+      setSessions((current) => [...current, ...response.data]);
+      setNextCursor(response.headers['x-next-cursor'] || null);
+    } catch (error) {
+      console.error("Failed to fetch more sessions", error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleStartSession = async (durationMinutes) => {
     try {
       const response = await api.post('/sessions/start', {
@@ -165,6 +186,14 @@ export default function SessionsPage() {
           </Card>
         ))}
         
+        {nextCursor && (
+          <div style={{ textAlign: 'center' }}>
+            <Button onClick={loadMoreSessions} disabled={loadingMore}>
+              {loadingMore ? 'Loading...' : 'Load more'}
+            </Button>
+          </div>
+        )}
+
         {!loading && sessions.length === 0 && !activeSession && (
           <div style={{ textAlign: 'center', padding: '1rem', color: 'var(--text-secondary)' }}>
             No past sessions found.
@@ -1,3 +1,4 @@
+import os
 from datetime import datetime, timezone
 from typing import Generator
 
@@ -6,7 +7,12 @@ from fastapi.testclient import TestClient
 from sqlmodel import SQLModel, create_engine, Session
 from sqlalchemy.pool import StaticPool
 
+# /metrics está desactivado por defecto; los tests lo montan (la app se configura al importarla)
+os.environ.setdefault("METRICS_ENABLED", "true")
+
 from app.main import app
+from app.core.auth_cache import auth_cache
+from app.core.cache import stats_cache
 from app.db import get_session
 from app.models import User
 from app.core.security import get_password_hash, create_access_token
@@ -24,6 +30,8 @@ engine_test = create_engine(
 @pytest.fixture(name="db_session")
 def db_session_fixture():
     SQLModel.metadata.create_all(engine_test)
+    # Los ids se reutilizan entre tests: la caché de autenticación empieza vacía
+    auth_cache.clear()
     with Session(engine_test) as session:
         yield session
     SQLModel.metadata.drop_all(engine_test)
@@ -48,6 +56,8 @@ def client_fixture(db_session: Session):
         return db_session
 
     app.dependency_overrides[get_session] = override_get_session
+    # Cada test empieza con la caché de estadísticas vacía
+    stats_cache.clear()
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
@@ -0,0 +1,115 @@
+import time
+
+from sqlalchemy import event, update
+from sqlmodel import Session
+
+from app.core.auth_cache import AuthCache, TTLCache, auth_cache
+from app.models import User
+from tests.conftest import engine_test
+
+
+def _count_queries(client, db_session: Session, path: str):
+    # Sin objetos en el identity map, cualquier acceso a la BD se ve como query
+    db_session.expunge_all()
+    statements = []
+
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine_test, "before_cursor_execute", _record)
+    try:
+        response = client.get(path)
+    finally:
+        event.remove(engine_test, "before_cursor_execute", _record)
+    return response, statements
+
+
+def test_cached_user_needs_no_query(auth_client, db_session: Session, sample_user: User):
+    first, first_queries = _count_queries(auth_client, db_session, "/api/v1/users/me")
+    second, second_queries = _count_queries(auth_client, db_session, "/api/v1/users/me")
+
+    assert first.status_code == second.status_code == 200
+    assert second.json() == first.json()
+    assert len(first_queries) == 1
+    assert second_queries == []
+    assert auth_cache.info()["users"]["hits"] == 1
+    assert auth_cache.info()["tokens"]["hits"] >= 1
+
+
+def test_deactivating_user_invalidates_cache(auth_client, db_session: Session, sample_user: User):
+    assert auth_client.get("/api/v1/users/me").status_code == 200
+
+    sample_user.is_active = False
+    db_session.add(sample_user)
+    db_session.commit()
+
+    response = auth_client.get("/api/v1/users/me")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Inactive user"
+
+
+def test_promoting_to_superuser_invalidates_cache(auth_client, db_session: Session, sample_user: User):
+    assert auth_client.get("/api/v1/users/auth-cache").status_code == 400
+
+    sample_user.is_superuser = True
+    db_session.add(sample_user)
+    db_session.commit()
+
+    response = auth_client.get("/api/v1/users/auth-cache")
+    assert response.status_code == 200
+    assert set(response.json()) == {"ttl_seconds", "tokens", "users"}
+
+
+def test_user_is_invalidated_on_commit_not_on_flush(db_session: Session, sample_user: User):
+    auth_cache.set_user(sample_user)
+
+    sample_user.is_active = False
+    db_session.add(sample_user)
+    db_session.flush()
+    # Antes del commit otra petición aún lee la fila antigua: la entrada debe seguir
+    assert auth_cache.get_user(sample_user.id) is not None
+
+    db_session.commit()
+    assert auth_cache.get_user(sample_user.id) is None
+
+
+def test_bulk_update_clears_cached_users_on_commit(db_session: Session, sample_user: User):
+    auth_cache.set_user(sample_user)
+
+    db_session.exec(update(User).where(User.id == sample_user.id).values(is_superuser=True))
+    assert auth_cache.get_user(sample_user.id) is not None
+    db_session.commit()
+
+    assert auth_cache.get_user(sample_user.id) is None
+
+
+def test_token_cache_never_outlives_token():
+    cache = AuthCache(ttl_seconds=30, max_entries=8)
+
+    cache.set_token_subject("expired", "1", time.time() - 1)
+    cache.set_token_subject("valid", "2", time.time() + 60)
+
+    assert cache.get_token_subject("expired") is None
+    assert cache.get_token_subject("valid") == "2"
+
+
+def test_ttl_cache_is_bounded_lru():
+    cache = TTLCache(max_entries=2)
+    cache.set("a", 1, ttl=30)
+    cache.set("b", 2, ttl=30)
+    cache.get("a")
+    cache.set("c", 3, ttl=30)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.info()["entries"] == 2
+
+
+def test_zero_ttl_disables_cache(sample_user: User):
+    cache = AuthCache(ttl_seconds=0, max_entries=8)
+    cache.set_user(sample_user)
+    cache.set_token_subject("token", "1", time.time() + 60)
+
+    assert cache.get_user(sample_user.id) is None
+    assert cache.get_token_subject("token") is None
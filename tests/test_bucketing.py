@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from hypothesis import given, strategies as st
+
+from app.core.bucketing import HOUR_US, bucket_overlaps, cyclic_overlap, hour_of_day_overlap, weekday_overlap
+from app.core.stats_logic import _add_work_by_hour, _add_work_by_weekday
+
+MICROSECOND = timedelta(microseconds=1)
+
+
+def _loop_by_hour(start: datetime, end: datetime):
+    """Implementación anterior (recorre hora a hora), en microsegundos."""
+    totals = [0] * 24
+    current = start
+    while current < end:
+        next_hour = current.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        chunk_end = min(end, next_hour)
+        totals[current.hour] += (chunk_end - current) // MICROSECOND
+        current = chunk_end
+    return totals
+
+
+def _loop_by_absolute_hour(start_us: int, end_us: int):
+    """Implementación anterior de los rollups (recorre hora a hora)."""
+    chunks = []
+    current = start_us
+    while current < end_us:
+        bucket = current - current % HOUR_US
+        chunk_end = min(end_us, bucket + HOUR_US)
+        chunks.append((bucket, chunk_end - current))
+        current = chunk_end
+    return chunks
+
+
+def _loop_by_weekday(start: datetime, end: datetime):
+    """Implementación anterior (recorre día a día), en microsegundos."""
+    totals = [0] * 7
+    current = start
+    while current < end:
+        next_day = current.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        chunk_end = min(end, next_day)
+        totals[current.weekday()] += (chunk_end - current) // MICROSECOND
+        current = chunk_end
+    return totals
+
+
+instants = st.datetimes(
+    min_value=datetime(1990, 1, 1),
+    max_value=datetime(2100, 1, 1),
+    timezones=st.sampled_from([timezone.utc, timezone(timedelta(hours=-5)), timezone(timedelta(hours=5, minutes=30))]),
+)
+durations = st.one_of(
+    st.timedeltas(min_value=timedelta(0), max_value=timedelta(hours=3)),
+    st.timedeltas(min_value=timedelta(0), max_value=timedelta(days=40)),
+)
+
+
+@given(instants, durations)
+def test_hour_overlap_matches_loop(start, duration):
+    end = start + duration
+    assert hour_of_day_overlap(start, end) == _loop_by_hour(start, end)
+
+
+@given(instants, durations)
+def test_weekday_overlap_matches_loop(start, duration):
+    end = start + duration
+    assert weekday_overlap(start, end) == _loop_by_weekday(start, end)
+
+
+@given(st.integers(min_value=0, max_value=10**15), st.integers(min_value=-HOUR_US, max_value=50 * HOUR_US))
+def test_bucket_overlaps_matches_loop(start_us, length_us):
+    assert list(bucket_overlaps(start_us, start_us + length_us, HOUR_US)) == _loop_by_absolute_hour(
+        start_us, start_us + length_us
+    )
+
+
+@given(instants, durations)
+def test_overlap_conserves_duration(start, duration):
+    total = duration // MICROSECOND
+    assert sum(hour_of_day_overlap(start, start + duration)) == total
+    assert sum(weekday_overlap(start, start + duration)) == total
+
+
+@given(instants, durations)
+def test_stats_helpers_match_loop(start, duration):
+    end = start + duration
+    hours_data = {h: {"work_seconds": 0} for h in range(24)}
+    weekly_data = {d: {"work_seconds": 0} for d in range(7)}
+
+    _add_work_by_hour(hours_data, start, end)
+    _add_work_by_weekday(weekly_data, start, end)
+
+    assert [hours_data[h]["work_seconds"] for h in range(24)] == pytest.approx(
+        [us / 1_000_000 for us in _loop_by_hour(start, end)]
+    )
+    assert [weekly_data[d]["work_seconds"] for d in range(7)] == pytest.approx(
+        [us / 1_000_000 for us in _loop_by_weekday(start, end)]
+    )
+
+
+def test_empty_or_inverted_interval():
+    start = datetime(2024, 5, 6, 10, tzinfo=timezone.utc)
+    assert hour_of_day_overlap(start, start) == [0] * 24
+    assert weekday_overlap(start, start - timedelta(hours=1)) == [0] * 7
+
+
+def test_week_long_session_is_spread_evenly():
+    # Una sesión olvidada abierta una semana exacta: 7h por hora del día, 1 día por día de semana
+    start = datetime(2024, 5, 6, 9, 15, tzinfo=timezone.utc)
+    end = start + timedelta(days=7)
+    assert hour_of_day_overlap(start, end) == [7 * HOUR_US] * 24
+    assert weekday_overlap(start, end) == [24 * HOUR_US] * 7
+
+
+def test_cyclic_overlap_wraps_around():
+    # 23:30 -> 01:30 en buckets horarios
+    start = 23 * HOUR_US + HOUR_US // 2
+    totals = cyclic_overlap(start, start + 2 * HOUR_US, HOUR_US, 24)
+    assert totals[23] == HOUR_US // 2
+    assert totals[0] == HOUR_US
+    assert totals[1] == HOUR_US // 2
+    assert sum(totals) == 2 * HOUR_US
@@ -0,0 +1,48 @@
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.engine_config import engine_options
+from app.db import create_db_engine
+
+
+def test_sqlite_pragmas_applied_on_connect(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'tuned.db'}")
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        # NORMAL = 1
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == settings.SQLITE_BUSY_TIMEOUT_MS
+        assert conn.execute(text("PRAGMA cache_size")).scalar() == settings.SQLITE_CACHE_SIZE
+    engine.dispose()
+
+
+def test_tuning_can_be_disabled(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DB_TUNING", False)
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'default.db'}")
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "delete"
+    engine.dispose()
+    assert engine_options("postgresql://u:p@db/hf") == {}
+
+
+def test_postgresql_pool_and_statement_timeout():
+    options = engine_options("postgresql://u:p@db/hf")
+    assert options["pool_size"] == settings.DB_POOL_SIZE
+    assert options["max_overflow"] == settings.DB_MAX_OVERFLOW
+    assert options["pool_recycle"] == settings.DB_POOL_RECYCLE_SECONDS
+    assert options["pool_pre_ping"] is True
+    assert options["connect_args"] == {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+
+    async_options = engine_options("postgresql+asyncpg://u:p@db/hf")
+    assert async_options["connect_args"] == {
+        "server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+    }
+
+
+def test_postgresql_engine_uses_pool_settings():
+    # create_engine no conecta hasta el primer uso
+    engine = create_db_engine("postgresql://u:p@localhost:1/hf")
+    assert engine.pool.size() == settings.DB_POOL_SIZE
+    assert engine.pool._max_overflow == settings.DB_MAX_OVERFLOW
+    assert engine.pool._recycle == settings.DB_POOL_RECYCLE_SECONDS
+    engine.dispose()
@@ -0,0 +1,105 @@
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlmodel import Session, SQLModel
+
+from app.core.data_version import bump_data_version, get_data_version
+from app.db import create_db_engine
+from app.models import User
+from tests.test_stats_sql_parity import POSTGRES_URL
+
+
+def test_stats_response_has_etag(auth_client):
+    response = auth_client.get("/api/v1/stats/summary?range=7d")
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith('W/"')
+    assert "no-cache" in response.headers["cache-control"]
+
+
+def test_stats_if_none_match_returns_304(auth_client):
+    etag = auth_client.get("/api/v1/stats/dashboard?range=7d").headers["etag"]
+
+    response = auth_client.get("/api/v1/stats/dashboard?range=7d", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    # Otro rango es otro recurso
+    other = auth_client.get("/api/v1/stats/dashboard?range=30d", headers={"If-None-Match": etag})
+    assert other.status_code == 200
+
+
+def test_write_changes_etag(auth_client):
+    etag = auth_client.get("/api/v1/stats/summary?range=7d").headers["etag"]
+
+    start = datetime.now(timezone.utc) - timedelta(hours=1)
+    assert auth_client.post("/api/v1/sessions/start", json={"start_time": start.isoformat()}).status_code == 201
+
+    response = auth_client.get("/api/v1/stats/summary?range=7d", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_session_listing_conditional_get(auth_client, db_session: Session, sample_user: User):
+    auth_client.post("/api/v1/sessions/start", json={})
+    first = auth_client.get("/api/v1/sessions/")
+    assert first.status_code == 200
+    assert len(first.json()) == 1
+
+    cached = auth_client.get("/api/v1/sessions/", headers={"If-None-Match": first.headers["etag"]})
+    assert cached.status_code == 304
+
+    session_id = first.json()[0]["id"]
+    auth_client.post(f"/api/v1/sessions/{session_id}/end")
+    changed = auth_client.get("/api/v1/sessions/", headers={"If-None-Match": first.headers["etag"]})
+    assert changed.status_code == 200
+    assert changed.json()[0]["end_time"] is not None
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        # Base de datos en fichero: cada hilo tiene su propia conexión y transacción
+        pytest.param(None, id="sqlite"),
+        pytest.param(
+            POSTGRES_URL,
+            id="postgresql",
+            marks=pytest.mark.skipif(not POSTGRES_URL, reason="HYPERFOCUS_TEST_POSTGRES_URL not set"),
+        ),
+    ],
+)
+def test_concurrent_first_bumps_create_one_version_row(tmp_path, url):
+    engine = create_db_engine(url or f"sqlite:///{tmp_path / 'versions.db'}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as db:
+        user = User(name="bump", email="bump@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+
+    writers = 8
+    barrier = threading.Barrier(writers)
+    errors = []
+
+    def write():
+        try:
+            with Session(engine) as db:
+                barrier.wait()
+                bump_data_version(db, user_id)
+                db.commit()
+        except Exception as exc:  # pragma: no cover - lo que se comprueba es que no ocurra
+            errors.append(exc)
+
+    threads = [threading.Thread(target=write) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Ninguno choca con la clave primaria al crear la fila y no se pierde ningún incremento
+    assert errors == []
+    with Session(engine) as db:
+        assert get_data_version(db, user_id) == writers
+    SQLModel.metadata.drop_all(engine)
+    engine.dispose()
@@ -0,0 +1,126 @@
+import csv
+import io
+import json
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert
+from sqlmodel import Session
+
+from app.core.security import create_access_token
+from app.models import Interruption, Session as WorkSession, User
+from app.routers.export import INTERRUPTION_COLUMNS, ExportFormat, export_query, stream_export
+
+BASE = datetime(2025, 3, 1, 9, 0, tzinfo=timezone.utc)
+
+
+def _seed(db: Session, user_id: int, sessions: int, interruptions_per_session: int = 2) -> None:
+    for i in range(sessions):
+        start = BASE + timedelta(days=i)
+        work_session = WorkSession(user_id=user_id, start_time=start, end_time=start + timedelta(hours=1))
+        db.add(work_session)
+        db.commit()
+        for j in range(interruptions_per_session):
+            it_start = start + timedelta(minutes=10 * j)
+            db.add(Interruption(
+                session_id=work_session.id,
+                user_id=user_id,
+                type="digital",
+                description="export, \"quoted\"",
+                start_time=it_start,
+                end_time=it_start + timedelta(minutes=1),
+                duration=60,
+            ))
+    db.commit()
+
+
+def _other_user(db: Session, **kwargs) -> User:
+    user = User(name="Other", email=f"other-{len(kwargs)}@example.com", hashed_password="x", **kwargs)
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_export_sessions_ndjson_only_own_rows(auth_client, db_session: Session, sample_user: User):
+    _seed(db_session, sample_user.id, 3)
+    _seed(db_session, _other_user(db_session).id, 2)
+
+    response = auth_client.get("/api/v1/export/sessions")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert 'filename="sessions.ndjson"' in response.headers["content-disposition"]
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 3
+    assert {row["user_id"] for row in rows} == {sample_user.id}
+    assert set(rows[0]) == {"id", "user_id", "start_time", "end_time", "created_at"}
+
+
+def test_export_interruptions_csv_with_range(auth_client, db_session: Session, sample_user: User):
+    _seed(db_session, sample_user.id, 4)
+
+    response = auth_client.get(
+        "/api/v1/export/interruptions",
+        params={"format": "csv", "since": (BASE + timedelta(days=1)).isoformat(), "until": (BASE + timedelta(days=3)).isoformat()},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 4
+    assert rows[0]["description"] == 'export, "quoted"'
+    assert [int(row["id"]) for row in rows] == sorted(int(row["id"]) for row in rows)
+
+
+def test_export_all_users_requires_superuser(client, db_session: Session, sample_user: User):
+    _seed(db_session, sample_user.id, 2)
+    admin = _other_user(db_session, is_superuser=True)
+    _seed(db_session, admin.id, 1)
+
+    as_user = {"Authorization": f"Bearer {create_access_token(subject=sample_user.id)}"}
+    as_admin = {"Authorization": f"Bearer {create_access_token(subject=admin.id)}"}
+
+    assert client.get("/api/v1/export/sessions?all_users=true", headers=as_user).status_code == 400
+    response = client.get("/api/v1/export/sessions?all_users=true", headers=as_admin)
+    assert {json.loads(line)["user_id"] for line in response.text.splitlines()} == {sample_user.id, admin.id}
+
+
+def test_export_memory_stays_flat(db_session: Session, sample_user: User):
+    user_id = sample_user.id
+    work_session = WorkSession(user_id=user_id, start_time=BASE)
+    db_session.add(work_session)
+    db_session.commit()
+    rows = 40_000
+    db_session.exec(
+        insert(Interruption),
+        params=[
+            {
+                "session_id": work_session.id,
+                "user_id": user_id,
+                "type": "digital",
+                "description": "x" * 40,
+                "start_time": BASE + timedelta(seconds=i),
+                "end_time": BASE + timedelta(seconds=i + 30),
+                "duration": 30,
+                "created_at": BASE,
+            }
+            for i in range(rows)
+        ],
+    )
+    db_session.commit()
+    db_session.expunge_all()
+
+    query = export_query(Interruption, INTERRUPTION_COLUMNS, user_id)
+    tracemalloc.start()
+    exported_bytes = 0
+    lines = 0
+    for chunk in stream_export(db_session, query, ExportFormat.ndjson):
+        exported_bytes += len(chunk)
+        lines += chunk.count("\n")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert lines == rows
+    # La salida completa no cabe en el presupuesto: solo se tiene un lote en memoria
+    assert exported_bytes > 8 * 1024 * 1024
+    assert peak < 3 * 1024 * 1024
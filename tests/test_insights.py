@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlmodel import Session
+
+from app.core.insights import ANALYZERS, InsightContext, run_insights
+from app.core.stats_logic import generate_ai_insights, get_interruption_type_stats, get_weekly_pattern
+from app.models import Session as WorkSession, Interruption, User
+from tests.test_stats_dashboard import _QueryCounter
+
+
+def _last_weekday(weekday: int) -> datetime:
+    """Medianoche UTC del último `weekday` (0=lunes) anterior a hoy."""
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    days_back = (today.weekday() - weekday) % 7 or 7
+    return today - timedelta(days=days_back)
+
+
+def _add_session(db: Session, user_id: int, start: datetime, hours: float, interruptions: int = 0, it_type: str = "digital"):
+    session = WorkSession(user_id=user_id, start_time=start, end_time=start + timedelta(hours=hours))
+    db.add(session)
+    db.commit()
+    db.refresh(session)
+    for i in range(interruptions):
+        it_start = start + timedelta(minutes=5 * i + 1)
+        db.add(
+            Interruption(
+                session_id=session.id,
+                user_id=user_id,
+                type=it_type,
+                description="insights",
+                start_time=it_start,
+                end_time=it_start + timedelta(minutes=2),
+                duration=120,
+            )
+        )
+    db.commit()
+
+
+def test_no_data_returns_fallback(db_session: Session, sample_user: User):
+    insights = generate_ai_insights(sample_user.id, db_session)
+
+    assert [i["title"] for i in insights] == ["Gathering Data 📊"]
+
+
+def test_rules_produce_expected_insights(db_session: Session, sample_user: User):
+    # Sábado: 4h por la mañana con 6 interrupciones digitales
+    _add_session(db_session, sample_user.id, _last_weekday(5) + timedelta(hours=8), hours=4, interruptions=6)
+    # Otra sesión de mañana hace 20 días (sólo cuenta para la ventana de 30d)
+    twenty_days_ago = datetime.now(timezone.utc).replace(hour=8, minute=0, second=0, microsecond=0) - timedelta(days=20)
+    _add_session(db_session, sample_user.id, twenty_days_ago, hours=1)
+
+    titles = [i["title"] for i in generate_ai_insights(sample_user.id, db_session)]
+
+    assert "Morning Person 🌅" in titles
+    assert "Distraction Alert: digital ⚠️" in titles
+    assert "Sat is your Power Day ⚡" in titles
+    assert "Weekend Warrior 🛡️" in titles
+
+
+def test_sub_windows_match_the_stats_functions(db_session: Session, sample_user: User):
+    now = datetime.now(timezone.utc)
+    for days_ago in (2, 9, 16, 25):
+        _add_session(db_session, sample_user.id, now - timedelta(days=days_ago), hours=2, interruptions=3)
+
+    context = InsightContext.load(sample_user.id, db_session)
+
+    assert context.interruption_types(7)["counts"] == get_interruption_type_stats(
+        sample_user.id, db_session, range_days=7
+    )["counts"]
+    assert [d["work_seconds"] for d in context.weekly_pattern(14)["days"]] == [
+        d["work_seconds"] for d in get_weekly_pattern(sample_user.id, db_session, range_days=14)["days"]
+    ]
+
+
+def test_rows_are_loaded_once(db_session: Session, sample_user: User):
+    user_id = sample_user.id
+    _add_session(db_session, user_id, datetime.now(timezone.utc) - timedelta(days=3), hours=2, interruptions=6)
+
+    with _QueryCounter() as counter:
+        run_insights(user_id, db_session)
+
+    # Una consulta de sesiones y otra de interrupciones
+    assert counter.count == 2
+
+
+def test_each_analyzer_is_timed(db_session: Session, sample_user: User):
+    report = run_insights(sample_user.id, db_session)
+
+    assert set(report.timings) == {"load", *(name for name, _ in ANALYZERS)}
+    assert all(ms >= 0 for ms in report.timings.values())
+
+
+def test_custom_analyzers(db_session: Session, sample_user: User):
+    def always(context):
+        return {"type": "info", "title": f"{len(context.sessions)} sessions", "description": "", "score": 1}
+
+    report = run_insights(sample_user.id, db_session, analyzers=[("always", always)])
+
+    assert [i["title"] for i in report.insights] == ["0 sessions"]
+    assert set(report.timings) == {"load", "always"}
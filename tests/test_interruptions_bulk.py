@@ -0,0 +1,159 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event
+from sqlmodel import Session, select
+
+from app.core import stats_logic, stats_rollup
+from app.routers import interruptions as interruptions_router
+from app.models import HourlyRollup, Interruption, Session as WorkSession, User
+from tests.conftest import engine_test
+
+BULK_URL = "/api/v1/interruptions/bulk"
+
+
+def _item(session_id: int, minutes_ago: int, it_type: str = "digital") -> dict:
+    start = datetime.now(timezone.utc) - timedelta(minutes=minutes_ago)
+    return {
+        "session_id": session_id,
+        "type": it_type,
+        "description": "offline",
+        "start_time": start.isoformat(),
+        "end_time": (start + timedelta(minutes=2)).isoformat(),
+    }
+
+
+def _start_session(auth_client) -> int:
+    response = auth_client.post("/api/v1/sessions/start", json={})
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_bulk_json_array_creates_all(auth_client, db_session: Session, sample_user: User):
+    session_id = _start_session(auth_client)
+    items = [_item(session_id, minutes) for minutes in (50, 40, 30, 20)]
+
+    response = auth_client.post(BULK_URL, json=items)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 4 and data["failed"] == 0
+    ids = [r["id"] for r in data["results"]]
+    assert [r["status"] for r in data["results"]] == [201] * 4
+
+    rows = db_session.exec(select(Interruption).where(Interruption.session_id == session_id)).all()
+    assert sorted(ids) == sorted(row.id for row in rows)
+    by_id = {row.id: row for row in rows}
+    # Los ids vuelven en el orden de los elementos enviados
+    assert [by_id[i].start_time.replace(tzinfo=timezone.utc).isoformat() for i in ids] == [
+        item["start_time"] for item in items
+    ]
+    assert all(row.duration == 120 and row.user_id == sample_user.id for row in rows)
+
+
+def test_bulk_ndjson_reports_per_item_errors(auth_client, db_session: Session, sample_user: User):
+    session_id = _start_session(auth_client)
+    other = User(name="Other", email="other-bulk@example.com", hashed_password="x")
+    db_session.add(other)
+    db_session.commit()
+    other_session = WorkSession(user_id=other.id, start_time=datetime.now(timezone.utc))
+    finished = WorkSession(
+        user_id=sample_user.id,
+        start_time=datetime.now(timezone.utc) - timedelta(hours=2),
+        end_time=datetime.now(timezone.utc) - timedelta(hours=1),
+    )
+    db_session.add_all([other_session, finished])
+    db_session.commit()
+
+    invalid = _item(session_id, 10)
+    invalid["end_time"] = invalid["start_time"]
+    lines = [
+        json.dumps(_item(session_id, 30)),
+        json.dumps(_item(other_session.id, 30)),
+        json.dumps(_item(finished.id, 30)),
+        json.dumps(_item(999999, 30)),
+        json.dumps(invalid),
+        "{not json",
+        "",
+        json.dumps(_item(session_id, 20, "external")),
+    ]
+    response = auth_client.post(
+        BULK_URL, content="\n".join(lines), headers={"Content-Type": "application/x-ndjson"}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [r["status"] for r in data["results"]] == [201, 403, 400, 404, 422, 422, 201]
+    assert [r["index"] for r in data["results"]] == list(range(7))
+    assert data["created"] == 2 and data["failed"] == 5
+    assert db_session.exec(select(Interruption)).all().__len__() == 2
+
+
+def test_bulk_single_insert_statement(auth_client, db_session: Session, sample_user: User):
+    session_id = _start_session(auth_client)
+    items = [_item(session_id, minutes) for minutes in range(100, 0, -1)]
+
+    inserts = []
+
+    def _record(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("INSERT INTO INTERRUPTION"):
+            inserts.append(statement)
+
+    event.listen(engine_test, "before_cursor_execute", _record)
+    try:
+        response = auth_client.post(BULK_URL, json=items)
+    finally:
+        event.remove(engine_test, "before_cursor_execute", _record)
+
+    assert response.json()["created"] == 100
+    assert len(inserts) == 1
+
+
+def test_bulk_fails_when_ids_cannot_be_matched(auth_client, db_session: Session, sample_user: User, monkeypatch):
+    session_id = _start_session(auth_client)
+    created_at = datetime.now(timezone.utc)
+
+    class _FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return created_at
+
+    # Otra interrupción del usuario con el mismo created_at: la relectura de ids no cuadraría
+    db_session.add(Interruption(
+        session_id=session_id,
+        user_id=sample_user.id,
+        type="digital",
+        description="same instant",
+        start_time=created_at,
+        end_time=created_at + timedelta(minutes=1),
+        duration=60,
+        created_at=created_at,
+    ))
+    db_session.commit()
+    monkeypatch.setattr(interruptions_router, "datetime", _FrozenDatetime)
+
+    response = auth_client.post(BULK_URL, json=[_item(session_id, 30), _item(session_id, 20)])
+
+    assert response.status_code == 500
+    assert len(db_session.exec(select(Interruption)).all()) == 1
+
+
+def test_bulk_keeps_rollups_and_stats_consistent(auth_client, db_session: Session, sample_user: User):
+    session_id = _start_session(auth_client)
+    items = [_item(session_id, minutes, it_type) for minutes, it_type in [(90, "digital"), (70, "external"), (10, "digital")]]
+
+    assert auth_client.post(BULK_URL, json=items).json()["created"] == 3
+
+    assert sum(r.interruptions for r in db_session.exec(select(HourlyRollup)).all()) == 3
+    expected = stats_logic.get_interruption_type_stats(sample_user.id, db_session, 7)
+    assert stats_rollup.get_interruption_type_stats(sample_user.id, db_session, 7) == expected
+    assert auth_client.get("/api/v1/stats/summary?range=7d").json()["total_interruptions"] == 3
+
+
+def test_bulk_rejects_non_array_and_oversized(auth_client, monkeypatch):
+    from app.core.config import settings
+
+    assert auth_client.post(BULK_URL, json={"session_id": 1}).status_code == 422
+
+    monkeypatch.setattr(settings, "INTERRUPTIONS_BULK_MAX_ITEMS", 2)
+    assert auth_client.post(BULK_URL, json=[{}, {}, {}]).status_code == 413
@@ -0,0 +1,124 @@
+import io
+import json
+import logging
+import threading
+
+import pytest
+
+from app.core.config import settings
+from app.core.logging_config import DroppingQueueHandler, setup_logging, shutdown_logging
+from app.core.metrics import LOG_DROPPED, metrics
+
+
+class _BlockedStdout(io.StringIO):
+    """stdout que no avanza hasta que se libera (disco lento, pipe lleno)."""
+
+    def __init__(self):
+        super().__init__()
+        self.writing = threading.Event()
+        self.released = threading.Event()
+
+    def write(self, text):
+        self.writing.set()
+        self.released.wait(5)
+        return super().write(text)
+
+
+@pytest.fixture(name="log_dir")
+def log_dir_fixture(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "LOG_DIR", str(tmp_path))
+    yield tmp_path
+    shutdown_logging()
+
+
+def _lines(log_dir):
+    return (log_dir / "hyperfocus.log").read_text().splitlines()
+
+
+def test_setup_is_idempotent_and_flushes_on_shutdown(log_dir):
+    setup_logging()
+    handler = setup_logging()
+
+    root_handlers = [h for h in logging.getLogger().handlers if isinstance(h, DroppingQueueHandler)]
+    assert root_handlers == [handler]
+    assert logging.getLogger("uvicorn.access").handlers == [handler]
+
+    logging.getLogger("uvicorn.access").info('%s - "GET %s HTTP/1.1" %d', "127.0.0.1:1", "/healthz", 200)
+    shutdown_logging()
+
+    (line,) = _lines(log_dir)
+    assert line.endswith('uvicorn.access - INFO - 127.0.0.1:1 - "GET /healthz HTTP/1.1" 200')
+    assert handler not in logging.getLogger().handlers
+
+
+def test_shutdown_restores_the_access_logger(log_dir):
+    access = logging.getLogger("uvicorn.access")
+    original = logging.NullHandler()
+    previous = (access.handlers, access.propagate)
+    access.handlers, access.propagate = [original], True
+    try:
+        setup_logging()
+        setup_logging()
+        assert access.propagate is False
+
+        shutdown_logging()
+
+        # Como lo dejó uvicorn, aunque setup_logging() se llamase dos veces
+        assert access.handlers == [original]
+        assert access.propagate is True
+    finally:
+        access.handlers, access.propagate = previous
+
+
+def test_full_queue_drops_and_reports(log_dir, monkeypatch):
+    stdout = _BlockedStdout()
+    monkeypatch.setattr("sys.stdout", stdout)
+    monkeypatch.setattr(settings, "LOG_QUEUE_SIZE", 2)
+    metrics.clear()
+    handler = setup_logging()
+    logger = logging.getLogger("tests.flood")
+    logger.warning("before the flood")
+    assert stdout.writing.wait(5)
+
+    for i in range(10):
+        logger.warning("record %d", i)
+
+    # El hilo escritor está bloqueado y en la cola caben 2: el resto se descarta sin esperar
+    assert handler.dropped == 8
+    assert metrics.collect()[0][(LOG_DROPPED, ())] == 8
+    stdout.released.set()
+    shutdown_logging()
+
+    messages = [line.split(" - ", 3)[3] for line in _lines(log_dir)]
+    assert messages == ["before the flood", "Log queue full: 8 records dropped", "record 0", "record 1"]
+
+
+def test_json_format(log_dir, monkeypatch):
+    monkeypatch.setattr(settings, "LOG_FORMAT", "json")
+    setup_logging()
+    logger = logging.getLogger("tests.json")
+
+    logger.info("user %s logged in", 7, extra={"user_id": 7})
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        logger.exception("failed")
+    shutdown_logging()
+
+    first, second = (json.loads(line) for line in _lines(log_dir))
+    assert first["message"] == "user 7 logged in"
+    assert (first["level"], first["logger"], first["user_id"]) == ("INFO", "tests.json", 7)
+    assert "ZeroDivisionError" in second["exception"]
+
+
+def test_size_rotation(log_dir, monkeypatch):
+    monkeypatch.setattr(settings, "LOG_MAX_BYTES", 500)
+    monkeypatch.setattr(settings, "LOG_BACKUP_COUNT", 2)
+    setup_logging()
+
+    for i in range(50):
+        logging.getLogger("tests.rotation").info("line %03d", i)
+    shutdown_logging()
+
+    assert sorted(path.name for path in log_dir.iterdir()) == ["hyperfocus.log", "hyperfocus.log.1", "hyperfocus.log.2"]
+    assert _lines(log_dir)[-1].endswith("line 049")
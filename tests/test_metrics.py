@@ -0,0 +1,105 @@
+import asyncio
+import threading
+from datetime import datetime, timezone
+
+from sqlmodel import Session
+
+from app.core.config import Settings, settings
+from app.core.hashing import HashingPool
+from app.core.metrics import MetricsRegistry, metrics
+from app.models import Session as WorkSession, User
+
+
+def _samples(text: str) -> dict:
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def test_registry_sums_thread_shards_and_renders_histograms():
+    registry = MetricsRegistry()
+    requests = registry.counter("demo_total", "Demo.", ("path",))
+    latency = registry.histogram("demo_seconds", "Demo.", buckets=(0.1, 1.0))
+
+    def work():
+        for _ in range(1000):
+            registry.add(requests, ('/a"b',))
+        registry.observe(latency, (), 0.5)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    registry.observe(latency, (), 0.05)
+
+    text = registry.render()
+    samples = _samples(text)
+    assert "# TYPE demo_seconds histogram" in text
+    # Las comillas de las etiquetas se escapan
+    assert samples['demo_total{path="/a\\"b"}'] == 4000
+    assert samples['demo_seconds_bucket{le="0.1"}'] == 1
+    assert samples['demo_seconds_bucket{le="1"}'] == 5
+    assert samples['demo_seconds_bucket{le="+Inf"}'] == 5
+    assert samples["demo_seconds_count"] == 5
+    assert samples["demo_seconds_sum"] == 2.05
+
+
+def test_metrics_endpoint_reports_route_templates_and_db_queries(
+    auth_client, db_session: Session, sample_user: User, monkeypatch
+):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+    work_session = WorkSession(user_id=sample_user.id, start_time=datetime.now(timezone.utc))
+    db_session.add(work_session)
+    db_session.commit()
+    metrics.clear()
+
+    auth_client.get(f"/api/v1/sessions/{work_session.id}")
+    auth_client.get("/api/v1/sessions/999999")
+    auth_client.get("/does-not-exist")
+    response = auth_client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples = _samples(response.text)
+    route = "/api/v1/sessions/{session_id}"
+    assert samples[f'hyperfocus_http_requests_total{{method="GET",route="{route}",status="200"}}'] == 1
+    assert samples[f'hyperfocus_http_requests_total{{method="GET",route="{route}",status="404"}}'] == 1
+    assert samples['hyperfocus_http_requests_total{method="GET",route="unmatched",status="404"}'] == 1
+    assert samples[f'hyperfocus_http_request_duration_seconds_count{{method="GET",route="{route}"}}'] == 2
+    # Los endpoints síncronos corren en el threadpool: las consultas se atribuyen igualmente a la ruta
+    assert samples[f'hyperfocus_db_queries_total{{route="{route}"}}'] >= 2
+    assert samples[f'hyperfocus_db_query_seconds_total{{route="{route}"}}'] > 0
+    # Solo la petición a /metrics sigue en curso
+    assert samples['hyperfocus_http_requests_in_flight{method="GET"}'] == 1
+
+
+def test_metrics_endpoint_requires_the_token(client, monkeypatch):
+    # Sin token configurado nadie puede leerlas
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer "}).status_code == 401
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).status_code == 200
+
+
+def test_metrics_are_disabled_by_default():
+    assert Settings.model_fields["METRICS_ENABLED"].default is False
+
+
+def test_hashing_time_is_recorded():
+    metrics.clear()
+    pool = HashingPool("thread", workers=1, queue_size=1)
+    try:
+        assert asyncio.run(pool.run(sum, [1, 2])) == 3
+    finally:
+        pool.shutdown()
+
+    samples = _samples(metrics.render())
+    assert samples["hyperfocus_password_hash_duration_seconds_count"] == 1
+    assert samples["hyperfocus_password_hash_wait_seconds_count"] == 1
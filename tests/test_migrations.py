@@ -0,0 +1,197 @@
+import importlib
+import re
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, inspect, text
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.core.rollups import rebuild_rollups
+from app.migrations import current_version, get_migrations, migrate
+from app.models import Interruption, Session as WorkSession, User
+
+STATS_FUNCTIONS = [
+    "get_summary_stats",
+    "get_interruption_type_stats",
+    "get_productive_hours_stats",
+    "get_peak_distraction_hour",
+    "get_weekly_pattern",
+    "get_dashboard_stats",
+]
+STATS_MODULES = ["stats_logic", "stats_sql", "stats_rollup", "stats_numpy"]
+HOT_TABLES = ("session", "interruption", "hourly_rollup", "hourly_type_rollup", "user_data_version")
+NEW_INDEXES = {"ix_session_user_id_start_time", "ix_session_user_id_active", "ix_interruption_user_id_start_time"}
+
+
+def _memory_engine():
+    return create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+
+
+def _index_names(engine, table: str) -> set:
+    return {index["name"] for index in inspect(engine).get_indexes(table)}
+
+
+def _seed(engine) -> int:
+    now = datetime.now(timezone.utc)
+    with Session(engine) as db:
+        user = User(name="Plan", email="plan@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        for day in range(1, 6):
+            start = now - timedelta(days=day, hours=3)
+            work_session = WorkSession(user_id=user.id, start_time=start, end_time=start + timedelta(hours=2))
+            db.add(work_session)
+            db.commit()
+            db.add(Interruption(
+                session_id=work_session.id,
+                user_id=user.id,
+                type="digital",
+                description="plan",
+                start_time=start + timedelta(minutes=20),
+                end_time=start + timedelta(minutes=25),
+                duration=300,
+            ))
+        db.commit()
+        rebuild_rollups(db, user.id)
+        return user.id
+
+
+def test_fresh_database_migrates_to_latest():
+    engine = _memory_engine()
+
+    applied = migrate(engine)
+
+    assert [m.version for m in applied] == [m.version for m in get_migrations()]
+    assert current_version(engine) == get_migrations()[-1].version
+    assert NEW_INDEXES <= _index_names(engine, "session") | _index_names(engine, "interruption")
+    # Segunda pasada: no queda nada pendiente
+    assert migrate(engine) == []
+
+
+def _schema(engine):
+    """Tablas con sus columnas, índices y restricciones únicas, comparables entre bases de datos."""
+    inspector = inspect(engine)
+    return {
+        table: (
+            sorted((c["name"], c["nullable"], str(c["type"])) for c in inspector.get_columns(table)),
+            sorted((i["name"], tuple(i["column_names"]), bool(i["unique"])) for i in inspector.get_indexes(table)),
+            sorted(tuple(u["column_names"]) for u in inspector.get_unique_constraints(table)),
+        )
+        for table in inspector.get_table_names()
+        if table != "schema_migrations"
+    }
+
+
+def test_migrations_produce_the_models_schema():
+    migrated = _memory_engine()
+    migrate(migrated)
+    created = _memory_engine()
+    SQLModel.metadata.create_all(created)
+
+    assert _schema(migrated) == _schema(created)
+
+
+def test_baseline_is_the_schema_before_migrations():
+    engine = _memory_engine()
+
+    migrate(engine, target=1)
+
+    assert set(inspect(engine).get_table_names()) == {"schema_migrations", "user", "session", "interruption"}
+    assert "ix_session_user_id" in _index_names(engine, "session")
+    assert not NEW_INDEXES & (_index_names(engine, "session") | _index_names(engine, "interruption"))
+
+
+def test_postgresql_indexes_are_built_concurrently_outside_a_transaction():
+    class _Recorder:
+        dialect = type("Dialect", (), {"name": "postgresql"})()
+
+        def __init__(self):
+            self.statements = []
+
+        def execute(self, statement, parameters=None):
+            self.statements.append(str(statement))
+            return type("Result", (), {"first": lambda self: None})()
+
+    (migration,) = [m for m in get_migrations() if m.version == 2]
+    connection = _Recorder()
+
+    migration.upgrade(connection)
+
+    ddl = [statement for statement in connection.statements if not statement.startswith("SELECT")]
+    assert migration.transactional is False
+    assert len(ddl) == 5
+    assert all(" CONCURRENTLY " in statement for statement in ddl)
+
+
+def test_existing_database_is_upgraded_in_place():
+    engine = _memory_engine()
+    # Esquema anterior: create_all sin migraciones y con los índices de una sola columna
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as connection:
+        for name in NEW_INDEXES:
+            connection.execute(text(f"DROP INDEX {name}"))
+        connection.execute(text("CREATE INDEX ix_session_user_id ON session (user_id)"))
+        connection.execute(text("CREATE INDEX ix_interruption_user_id ON interruption (user_id)"))
+    user_id = _seed(engine)
+
+    migrate(engine)
+
+    session_indexes = _index_names(engine, "session")
+    interruption_indexes = _index_names(engine, "interruption")
+    assert {"ix_session_user_id_start_time", "ix_session_user_id_active"} <= session_indexes
+    assert "ix_interruption_user_id_start_time" in interruption_indexes
+    assert "ix_session_user_id" not in session_indexes
+    assert "ix_interruption_user_id" not in interruption_indexes
+    with Session(engine) as db:
+        assert len(db.exec(select(WorkSession).where(WorkSession.user_id == user_id)).all()) == 5
+
+
+def _plans(engine, statements):
+    with engine.connect() as connection:
+        for statement, parameters in statements:
+            rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            yield statement, [row[3] for row in rows]
+
+
+def _full_scans(plan):
+    return [step for step in plan if re.match(rf"SCAN ({'|'.join(HOT_TABLES)})\b", step)]
+
+
+@pytest.mark.parametrize("module_name", STATS_MODULES)
+def test_stats_queries_use_indexes(module_name):
+    if module_name == "stats_numpy":
+        pytest.importorskip("numpy")
+    module = importlib.import_module(f"app.core.{module_name}")
+    engine = _memory_engine()
+    migrate(engine)
+    user_id = _seed(engine)
+
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        with Session(engine) as db:
+            for function_name in STATS_FUNCTIONS:
+                getattr(module, function_name)(user_id=user_id, db=db, range_days=30)
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    assert statements
+    for statement, plan in _plans(engine, dict.fromkeys(statements)):
+        assert not _full_scans(plan), f"{statement}\n{plan}"
+        assert any(step.startswith("SEARCH") for step in plan), f"{statement}\n{plan}"
+
+
+def test_active_session_lookup_uses_partial_index():
+    engine = _memory_engine()
+    migrate(engine)
+    query = select(WorkSession).where(WorkSession.user_id == 1, WorkSession.end_time.is_(None))
+    compiled = query.compile(engine)
+
+    (_, plan), = _plans(engine, [(str(compiled), tuple(compiled.params.values()))])
+
+    assert any("ix_session_user_id_active" in step for step in plan), plan
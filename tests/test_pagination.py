@@ -0,0 +1,139 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Session
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.security import create_access_token
+from app.models import Interruption, Session as WorkSession, User
+
+
+def _seed_sessions(db: Session, user_id: int, count: int) -> None:
+    base = datetime(2025, 3, 1, 9, 0, tzinfo=timezone.utc)
+    for i in range(count):
+        # Dos sesiones por hora de inicio: el id desempata
+        start = base + timedelta(hours=i // 2)
+        db.add(WorkSession(user_id=user_id, start_time=start, end_time=start + timedelta(minutes=30)))
+    db.commit()
+
+
+def _all_pages(client, url: str, **params):
+    pages = []
+    cursor = None
+    while True:
+        query = dict(params, **({"cursor": cursor} if cursor else {}))
+        response = client.get(url, params=query)
+        assert response.status_code == 200
+        pages.append(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return pages
+        assert 'rel="next"' in response.headers["Link"]
+
+
+def test_sessions_keyset_pages_cover_everything_once(auth_client, db_session: Session, sample_user: User):
+    _seed_sessions(db_session, sample_user.id, 25)
+
+    pages = _all_pages(auth_client, "/api/v1/sessions/", limit=10)
+
+    assert [len(page) for page in pages] == [10, 10, 5]
+    rows = [row for page in pages for row in page]
+    assert len({row["id"] for row in rows}) == 25
+    keys = [(row["start_time"], row["id"]) for row in rows]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_sessions_cursor_is_stable_when_rows_are_added(auth_client, db_session: Session, sample_user: User):
+    _seed_sessions(db_session, sample_user.id, 6)
+    first = auth_client.get("/api/v1/sessions/", params={"limit": 3})
+    cursor = first.headers["X-Next-Cursor"]
+
+    # Una sesión nueva (más reciente) no desplaza la segunda página
+    db_session.add(WorkSession(user_id=sample_user.id, start_time=datetime.now(timezone.utc)))
+    db_session.commit()
+
+    second = auth_client.get("/api/v1/sessions/", params={"limit": 3, "cursor": cursor})
+    first_ids = {row["id"] for row in first.json()}
+    second_ids = {row["id"] for row in second.json()}
+    assert len(second_ids) == 3 and not first_ids & second_ids
+
+
+def test_sessions_date_range_and_projection(auth_client, db_session: Session, sample_user: User):
+    _seed_sessions(db_session, sample_user.id, 10)
+
+    response = auth_client.get(
+        "/api/v1/sessions/",
+        params={"since": "2025-03-01T10:00:00Z", "until": "2025-03-01T12:00:00Z", "fields": "id,start_time"},
+    )
+
+    assert response.status_code == 200
+    rows = response.json()
+    assert len(rows) == 4
+    assert all(set(row) == {"id", "start_time"} for row in rows)
+    assert "ETag" in response.headers
+
+
+def test_unknown_field_and_bad_cursor_are_rejected(auth_client, sample_user: User):
+    assert auth_client.get("/api/v1/sessions/", params={"fields": "id,hashed_password"}).status_code == 400
+    assert auth_client.get("/api/v1/sessions/", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_interruptions_of_session_paginated(auth_client, db_session: Session, sample_user: User):
+    start = datetime(2025, 3, 1, 9, 0, tzinfo=timezone.utc)
+    work_session = WorkSession(user_id=sample_user.id, start_time=start)
+    db_session.add(work_session)
+    db_session.commit()
+    for i in range(7):
+        it_start = start + timedelta(minutes=i)
+        db_session.add(Interruption(
+            session_id=work_session.id,
+            user_id=sample_user.id,
+            type="digital",
+            description="page",
+            start_time=it_start,
+            end_time=it_start + timedelta(seconds=30),
+            duration=30,
+        ))
+    db_session.commit()
+
+    pages = _all_pages(auth_client, f"/api/v1/interruptions/session/{work_session.id}", limit=3, fields="id")
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    ids = [row["id"] for page in pages for row in page]
+    assert ids == sorted(ids)
+
+
+def test_read_users_keyset(client, db_session: Session):
+    admin = User(name="Admin", email="admin@example.com", hashed_password="x", is_superuser=True)
+    db_session.add(admin)
+    db_session.add_all(User(name=f"U{i}", email=f"u{i}@example.com", hashed_password="x") for i in range(4))
+    db_session.commit()
+    client.headers.update({"Authorization": f"Bearer {create_access_token(subject=admin.id)}"})
+
+    pages = _all_pages(client, "/api/v1/users/", limit=2, fields="id,email")
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [row["email"] for page in pages for row in page][0] == "admin@example.com"
+
+
+def test_read_users_skip_only_applies_to_the_first_page(client, db_session: Session):
+    admin = User(name="Admin", email="admin@example.com", hashed_password="x", is_superuser=True)
+    db_session.add(admin)
+    db_session.add_all(User(name=f"U{i}", email=f"u{i}@example.com", hashed_password="x") for i in range(6))
+    db_session.commit()
+    client.headers.update({"Authorization": f"Bearer {create_access_token(subject=admin.id)}"})
+
+    # El enlace "next" conserva skip=2 junto al cursor: no debe volver a saltarse filas
+    pages = _all_pages(client, "/api/v1/users/", skip=2, limit=2, fields="email")
+
+    emails = [row["email"] for page in pages for row in page]
+    assert emails == [f"u{i}@example.com" for i in range(1, 6)]
+
+
+def test_cursor_round_trip():
+    key = (WorkSession.start_time, WorkSession.id)
+    values = [datetime(2025, 3, 1, 9, 30), 42]
+    assert decode_cursor(encode_cursor(values), key) == values
+    with pytest.raises(HTTPException):
+        decode_cursor(encode_cursor([1]), key)
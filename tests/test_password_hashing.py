@@ -0,0 +1,129 @@
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from passlib.context import CryptContext
+from sqlmodel import Session
+
+from app.core import hashing
+from app.core.config import settings
+from app.core.hashing import HashingBusy, HashingPool
+from app.core.security import get_password_hash, verify_password
+from app.models import User
+
+# Hash con parámetros Argon2 más baratos que los configurados
+OLD_CONTEXT = CryptContext(schemes=["argon2"], argon2__time_cost=1, argon2__memory_cost=8192, argon2__parallelism=1)
+
+
+def _login(client: TestClient, user: User, password: str = "testpassword"):
+    return client.post("/api/v1/login/access-token", data={"username": user.email, "password": password})
+
+
+def _wait_idle(pool: HashingPool) -> None:
+    # Las plazas se liberan en el callback del future, justo después de result()
+    deadline = time.monotonic() + 5
+    while pool.info()["in_flight"] and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+def test_login_rehashes_outdated_hash(client: TestClient, db_session: Session, sample_user: User):
+    sample_user.hashed_password = OLD_CONTEXT.hash("testpassword")
+    db_session.add(sample_user)
+    db_session.commit()
+    old_hash = sample_user.hashed_password
+
+    assert _login(client, sample_user).status_code == 200
+
+    db_session.refresh(sample_user)
+    assert sample_user.hashed_password != old_hash
+    assert f"m={settings.ARGON2_MEMORY_COST},t={settings.ARGON2_TIME_COST}" in sample_user.hashed_password
+    assert verify_password("testpassword", sample_user.hashed_password)
+    assert _login(client, sample_user).status_code == 200
+
+
+def test_wrong_password_does_not_rehash(client: TestClient, db_session: Session, sample_user: User):
+    sample_user.hashed_password = OLD_CONTEXT.hash("testpassword")
+    db_session.add(sample_user)
+    db_session.commit()
+    old_hash = sample_user.hashed_password
+
+    assert _login(client, sample_user, "wrong").status_code == 400
+
+    db_session.expunge_all()
+    assert db_session.get(User, sample_user.id).hashed_password == old_hash
+
+
+def test_saturated_pool_returns_503(client: TestClient, sample_user: User, monkeypatch):
+    pool = HashingPool("thread", workers=1, queue_size=0)
+    monkeypatch.setattr(hashing, "hashing_pool", pool)
+    release = threading.Event()
+    busy = pool.submit(release.wait)
+    try:
+        response = _login(client, sample_user)
+    finally:
+        release.set()
+        busy.result()
+        pool.shutdown()
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)
+    assert pool.info()["rejected"] == 1
+
+
+def test_admin_create_user_uses_the_hashing_pool(auth_client, db_session: Session, sample_user: User, monkeypatch):
+    sample_user.is_superuser = True
+    db_session.add(sample_user)
+    db_session.commit()
+    new_user = {"name": "Nuevo", "email": "nuevo@example.com", "password": "otrapassword"}
+
+    pool = HashingPool("thread", workers=1, queue_size=0)
+    monkeypatch.setattr(hashing, "hashing_pool", pool)
+    release = threading.Event()
+    busy = pool.submit(release.wait)
+    try:
+        saturated = auth_client.post("/api/v1/users/", json=new_user)
+    finally:
+        release.set()
+        busy.result()
+        _wait_idle(pool)
+
+    assert saturated.status_code == 503
+    assert saturated.headers["Retry-After"] == str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)
+
+    created = auth_client.post("/api/v1/users/", json=new_user)
+    _wait_idle(pool)
+    pool.shutdown()
+    assert created.status_code == 200
+    assert created.json()["email"] == "nuevo@example.com"
+    # La tarea que bloqueaba el pool y el hash del usuario creado
+    assert (pool.info()["completed"], pool.info()["rejected"]) == (2, 1)
+
+
+def test_pool_admits_workers_plus_queue():
+    pool = HashingPool("thread", workers=1, queue_size=1)
+    release = threading.Event()
+    try:
+        futures = [pool.submit(release.wait), pool.submit(release.wait)]
+        with pytest.raises(HashingBusy):
+            pool.submit(release.wait)
+        release.set()
+        for future in futures:
+            future.result()
+        _wait_idle(pool)
+        assert pool.submit(lambda: 1).result() == 1
+    finally:
+        release.set()
+        pool.shutdown()
+    _wait_idle(pool)
+    assert pool.info()["in_flight"] == 0
+    assert pool.info()["completed"] == 3
+
+
+def test_process_pool_hashes():
+    pool = HashingPool("process", workers=1, queue_size=0)
+    try:
+        hashed = pool.submit(get_password_hash, "secret").result(timeout=60)
+    finally:
+        pool.shutdown()
+    assert verify_password("secret", hashed)
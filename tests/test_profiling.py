@@ -0,0 +1,111 @@
+import logging
+import re
+import time
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.profiling import ProfiledRoute, ProfilingMiddleware, install_profiling, uninstall_profiling
+from app.db import get_session
+from app.main import app as main_app
+from app.models import Session as WorkSession, User
+
+
+def _timing(response) -> dict:
+    """Server-Timing -> {name: (dur, desc)}"""
+    entries = {}
+    # desc puede contener comas, pero siempre va entre comillas
+    for name, dur, desc in re.findall(r'(\w+);dur=([\d.]+)(?:;desc="([^"]*)")?', response.headers["server-timing"]):
+        entries[name] = (float(dur), desc)
+    return entries
+
+
+@pytest.fixture(name="profiled_client")
+def profiled_client_fixture(monkeypatch, db_session: Session):
+    monkeypatch.setattr(settings, "REQUEST_PROFILING", True)
+    install_profiling()
+    router = APIRouter(route_class=ProfiledRoute)
+
+    @router.get("/sessions")
+    def list_sessions(db: Session = Depends(get_session)):
+        db.exec(select(User)).all()
+        return [s.id for s in db.exec(select(WorkSession)).all()]
+
+    @router.get("/stream")
+    def stream(db: Session = Depends(get_session)):
+        result = db.exec(select(WorkSession.id).execution_options(yield_per=2))
+        return [row for batch in result.partitions() for row in batch]
+
+    @router.get("/slow")
+    def slow(db: Session = Depends(get_session)):
+        db.exec(select(WorkSession.id)).all()
+        time.sleep(0.03)
+        return {}
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(ProfilingMiddleware, slow_request_ms=20)
+    app.dependency_overrides[get_session] = lambda: db_session
+    with TestClient(app) as client:
+        yield client
+    uninstall_profiling()
+
+
+def _add_sessions(db: Session, user_id: int, count: int) -> None:
+    for _ in range(count):
+        db.add(WorkSession(user_id=user_id, start_time=datetime.now(timezone.utc)))
+    db.commit()
+    db.expunge_all()
+
+
+def test_server_timing_reports_queries_rows_and_handler(profiled_client, db_session: Session, sample_user: User):
+    _add_sessions(db_session, sample_user.id, 3)
+
+    timing = _timing(profiled_client.get("/sessions"))
+
+    assert timing["db"][1] == "2 queries"
+    # 1 usuario + 3 sesiones, todas hidratadas por el ORM
+    assert timing["fetch"][1] == "4 rows, 4 objects"
+    assert 0 < timing["db"][0] + timing["fetch"][0] <= timing["handler"][0] <= timing["total"][0]
+    assert timing["app"][0] == pytest.approx(
+        timing["handler"][0] - timing["db"][0] - timing["fetch"][0], abs=0.02
+    )
+
+
+def test_streamed_queries_are_not_buffered(profiled_client, db_session: Session, sample_user: User):
+    _add_sessions(db_session, sample_user.id, 5)
+
+    response = profiled_client.get("/stream")
+
+    assert len(response.json()) == 5
+    assert _timing(response)["fetch"][1] == "0 rows, 0 objects"
+
+
+def test_included_routes_are_timed_once(profiled_client):
+    route = next(r for r in profiled_client.app.routes if getattr(r, "path", "") == "/sessions")
+    assert route.endpoint._profiled
+    assert not getattr(route.endpoint.__wrapped__, "_profiled", False)
+
+
+def test_slow_requests_are_logged_with_their_statements(profiled_client, caplog):
+    with caplog.at_level(logging.WARNING, logger="app.core.profiling"):
+        profiled_client.get("/sessions")
+        profiled_client.get("/slow")
+
+    assert len(caplog.records) == 1
+    message = caplog.records[0].getMessage()
+    assert message.startswith("Slow request GET /slow:")
+    assert re.search(r"ms  SELECT session\.id FROM session", message)
+
+
+def test_disabled_by_default(client):
+    assert not settings.REQUEST_PROFILING
+    assert "server-timing" not in client.get("/healthz").headers
+    # Sin perfilado las rutas conservan su endpoint original
+    route = next(r for r in main_app.routes if getattr(r, "path", "") == "/api/v1/sessions/")
+    assert route.endpoint.__name__ == "get_my_sessions"
+    assert not getattr(route.endpoint, "_profiled", False)
@@ -0,0 +1,91 @@
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel
+
+from app import db as database
+from app.core.cache import stats_cache
+from app.core.security import create_access_token
+from app.db import create_db_engine, get_session
+from app.main import app
+from app.models import Session as WorkSession, User
+
+
+def _replicate(primary_path, replica_path):
+    """Simula la réplica: copia el primario completo sobre el fichero de la réplica."""
+    source = sqlite3.connect(primary_path)
+    target = sqlite3.connect(replica_path)
+    source.backup(target)
+    source.close()
+    target.close()
+
+
+@pytest.fixture(name="replica_setup")
+def replica_setup_fixture(tmp_path, monkeypatch):
+    primary_path = tmp_path / "primary.db"
+    replica_path = tmp_path / "replica.db"
+    primary = create_db_engine(f"sqlite:///{primary_path}")
+    replica = create_db_engine(f"sqlite:///{replica_path}")
+    SQLModel.metadata.create_all(primary)
+
+    with Session(primary) as db:
+        user = User(name="Replica", email="replica@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        user_id = user.id
+    _replicate(primary_path, replica_path)
+
+    def override_get_session():
+        with Session(primary) as session:
+            yield session
+
+    monkeypatch.setattr(database, "read_engine", replica)
+    app.dependency_overrides[get_session] = override_get_session
+    stats_cache.clear()
+    with TestClient(app) as client:
+        client.headers["Authorization"] = f"Bearer {create_access_token(subject=user_id)}"
+        yield client, primary_path, replica_path, replica, user_id
+    app.dependency_overrides.clear()
+    primary.dispose()
+    replica.dispose()
+
+
+def test_reads_fall_back_to_primary_until_replica_catches_up(replica_setup):
+    client, primary_path, replica_path, _, _ = replica_setup
+
+    start = datetime.now(timezone.utc) - timedelta(hours=1)
+    assert client.post("/api/v1/sessions/start", json={"start_time": start.isoformat()}).status_code == 201
+
+    # La réplica todavía no tiene la escritura: se lee del primario
+    assert len(client.get("/api/v1/sessions/").json()) == 1
+    assert client.get("/api/v1/stats/summary?range=7d").json()["total_sessions"] == 1
+
+    _replicate(primary_path, replica_path)
+    assert len(client.get("/api/v1/sessions/").json()) == 1
+
+
+def test_reads_use_replica_when_in_sync(replica_setup):
+    client, _, _, replica, user_id = replica_setup
+
+    # Fila que solo existe en la réplica (misma versión de datos que el primario)
+    with Session(replica) as db:
+        db.add(WorkSession(user_id=user_id, start_time=datetime.now(timezone.utc) - timedelta(hours=2)))
+        db.commit()
+
+    assert len(client.get("/api/v1/sessions/").json()) == 1
+    assert client.get("/api/v1/stats/summary?range=7d").json()["total_sessions"] == 1
+
+
+def test_writes_go_to_primary(replica_setup):
+    client, primary_path, _, replica, _ = replica_setup
+
+    response = client.post("/api/v1/sessions/start", json={})
+    assert response.status_code == 201
+
+    with Session(replica) as db:
+        assert db.get(WorkSession, response.json()["id"]) is None
+    with sqlite3.connect(primary_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM session").fetchone()[0] == 1
@@ -0,0 +1,270 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlmodel import Session, SQLModel, select
+
+from app.core import rollups, stats_logic, stats_rollup
+from app.core.data_version import bump_data_version
+from app.core.rollups import backfill_rollups, rebuild_rollups, record_interruption
+from app.db import create_db_engine
+from app.models import HourlyRollup, HourlyTypeRollup, Interruption, Session as WorkSession, User
+from tests.test_stats_sql_parity import _assert_same
+
+STATS_FUNCTIONS = [
+    "get_summary_stats",
+    "get_interruption_type_stats",
+    "get_productive_hours_stats",
+    "get_peak_distraction_hour",
+    "get_weekly_pattern",
+]
+
+
+def _record_activity(auth_client, tz=timezone.utc):
+    """
+    Crea mediante la API una sesión de ~3h con dos interrupciones y la termina,
+    más una segunda sesión que queda abierta. Las horas se envían con el
+    desplazamiento de `tz`.
+    """
+    start = datetime.now(tz) - timedelta(hours=3, minutes=10)
+    session_id = auth_client.post(
+        "/api/v1/sessions/start", json={"start_time": start.isoformat()}
+    ).json()["id"]
+
+    for minutes, it_type in [(20, "digital"), (95, "external")]:
+        it_start = start + timedelta(minutes=minutes)
+        resp = auth_client.post(
+            "/api/v1/interruptions/",
+            json={
+                "session_id": session_id,
+                "type": it_type,
+                "description": "rollup test",
+                "start_time": it_start.isoformat(),
+                "end_time": (it_start + timedelta(minutes=4)).isoformat(),
+            },
+        )
+        assert resp.status_code == 201
+
+    assert auth_client.post(f"/api/v1/sessions/{session_id}/end").status_code == 200
+    assert auth_client.post("/api/v1/sessions/start", json={}).status_code == 201
+
+
+def _rollup_rows(db: Session, user_id: int):
+    rollups = db.exec(
+        select(HourlyRollup).where(HourlyRollup.user_id == user_id).order_by(HourlyRollup.bucket_start)
+    ).all()
+    types = db.exec(
+        select(HourlyTypeRollup)
+        .where(HourlyTypeRollup.user_id == user_id)
+        .order_by(HourlyTypeRollup.bucket_start, HourlyTypeRollup.type)
+    ).all()
+    return (
+        [
+            (r.bucket_start, r.work_seconds, r.sessions_started, r.session_seconds, r.interruptions, r.lost_seconds)
+            for r in rollups
+        ],
+        [(r.bucket_start, r.type, r.interruptions) for r in types],
+    )
+
+
+def test_writes_maintain_rollups(auth_client, db_session: Session, sample_user: User):
+    _record_activity(auth_client)
+
+    rollups, types = _rollup_rows(db_session, sample_user.id)
+
+    # La sesión de ~3h10m se reparte en 4 buckets horarios
+    assert sum(r[1] for r in rollups) == pytest.approx(3 * 3600 + 600, abs=5)
+    assert sum(r[2] for r in rollups) == 2
+    assert sum(r[4] for r in rollups) == 2
+    assert sum(r[5] for r in rollups) == 2 * 240
+    assert sorted(t[1] for t in types) == ["digital", "external"]
+
+
+def test_rebuild_matches_incremental_rollups(auth_client, db_session: Session, sample_user: User):
+    _record_activity(auth_client)
+    incremental = _rollup_rows(db_session, sample_user.id)
+
+    assert rebuild_rollups(db_session, user_id=sample_user.id) == 1
+    rebuilt = _rollup_rows(db_session, sample_user.id)
+
+    assert rebuilt[1] == incremental[1]
+    assert len(rebuilt[0]) == len(incremental[0])
+    for rebuilt_row, incremental_row in zip(rebuilt[0], incremental[0]):
+        assert rebuilt_row[0] == incremental_row[0]
+        assert rebuilt_row[1:] == pytest.approx(incremental_row[1:])
+
+
+@pytest.mark.parametrize("function_name", STATS_FUNCTIONS)
+def test_rollup_backend_matches_reference(auth_client, db_session: Session, sample_user: User, function_name):
+    _record_activity(auth_client)
+
+    reference = getattr(stats_logic, function_name)(user_id=sample_user.id, db=db_session, range_days=7)
+    candidate = getattr(stats_rollup, function_name)(user_id=sample_user.id, db=db_session, range_days=7)
+
+    _assert_same(reference, candidate)
+
+
+@pytest.mark.parametrize("function_name", STATS_FUNCTIONS)
+def test_rollup_backend_matches_reference_with_offset(
+    auth_client, db_session: Session, sample_user: User, function_name
+):
+    # Se guarda la hora local sin el desplazamiento y las estadísticas la leen como UTC
+    _record_activity(auth_client, tz=timezone(timedelta(hours=2)))
+
+    reference = getattr(stats_logic, function_name)(user_id=sample_user.id, db=db_session, range_days=7)
+    candidate = getattr(stats_rollup, function_name)(user_id=sample_user.id, db=db_session, range_days=7)
+
+    _assert_same(reference, candidate)
+
+
+def test_offset_datetimes_are_bucketed_like_the_stored_value(
+    auth_client, db_session: Session, sample_user: User
+):
+    _record_activity(auth_client, tz=timezone(timedelta(hours=2)))
+    incremental = _rollup_rows(db_session, sample_user.id)
+
+    rebuild_rollups(db_session, user_id=sample_user.id)
+
+    assert _rollup_rows(db_session, sample_user.id)[1] == incremental[1]
+    assert [r[0] for r in _rollup_rows(db_session, sample_user.id)[0]] == [r[0] for r in incremental[0]]
+
+
+def test_rebuild_backfills_rows_written_without_rollups(db_session: Session, sample_user: User):
+    start = (datetime.now(timezone.utc) - timedelta(days=2)).replace(minute=30, second=0, microsecond=0)
+    db_session.add(WorkSession(user_id=sample_user.id, start_time=start, end_time=start + timedelta(hours=1)))
+    db_session.commit()
+
+    rebuild_rollups(db_session)
+    rollups, _ = _rollup_rows(db_session, sample_user.id)
+
+    assert [r[1] for r in rollups] == [1800.0, 1800.0]
+    assert stats_rollup.get_summary_stats(sample_user.id, db_session)["total_time_worked_seconds"] == 3600
+
+
+def test_backfill_rebuilds_users_that_wrote_after_migrating(
+    auth_client, db_session: Session, sample_user: User
+):
+    # Datos anteriores a los rollups, y después una escritura por la API que ya crea rollups
+    start = (datetime.now(timezone.utc) - timedelta(days=2)).replace(minute=30, second=0, microsecond=0)
+    db_session.add(WorkSession(user_id=sample_user.id, start_time=start, end_time=start + timedelta(hours=1)))
+    db_session.commit()
+    _record_activity(auth_client)
+
+    assert backfill_rollups(db_session) == 1
+    for function_name in STATS_FUNCTIONS:
+        _assert_same(
+            getattr(stats_logic, function_name)(user_id=sample_user.id, db=db_session, range_days=7),
+            getattr(stats_rollup, function_name)(user_id=sample_user.id, db=db_session, range_days=7),
+        )
+    # Ya cuadran: una segunda pasada no reconstruye nada
+    assert backfill_rollups(db_session) == 0
+
+
+def test_rebuild_blocks_concurrent_writes(tmp_path, monkeypatch):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'rebuild.db'}")
+    SQLModel.metadata.create_all(engine)
+    start = datetime(2024, 5, 6, 10, 15)
+
+    def interruption_row(user_id: int, session_id: int) -> Interruption:
+        return Interruption(
+            user_id=user_id,
+            session_id=session_id,
+            type="digital",
+            description="rebuild",
+            start_time=start,
+            end_time=start + timedelta(seconds=30),
+            duration=30,
+        )
+
+    with Session(engine) as db:
+        user = User(name="rebuild", email="rebuild@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+        work_session = WorkSession(user_id=user_id, start_time=start, end_time=start + timedelta(minutes=30))
+        db.add(work_session)
+        db.commit()
+        session_id = work_session.id
+        db.add(interruption_row(user_id, session_id))
+        db.commit()
+
+    read_done = threading.Event()
+    add_interruption = rollups.RollupDelta.add_interruption
+
+    def slow_add_interruption(delta, interruption):
+        # El rebuild está leyendo: una escritura que no esperase a que termine se perdería
+        add_interruption(delta, interruption)
+        read_done.set()
+        time.sleep(0.3)
+
+    monkeypatch.setattr(rollups.RollupDelta, "add_interruption", slow_add_interruption)
+    errors = []
+
+    def write():
+        read_done.wait()
+        interruption = interruption_row(user_id, session_id)
+        try:
+            with Session(engine) as db:
+                db.add(interruption)
+                bump_data_version(db, user_id)
+                record_interruption(db, interruption)
+                db.commit()
+        except Exception as exc:  # pragma: no cover - lo que se comprueba es que no ocurra
+            errors.append(exc)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    with Session(engine) as db:
+        rebuild_rollups(db, user_id=user_id)
+    writer.join()
+
+    # La escritura esperó al rebuild y se sumó encima: ni se pierde ni se cuenta dos veces
+    assert errors == []
+    with Session(engine) as db:
+        rollup_rows, types = _rollup_rows(db, user_id)
+    assert [(r[2], r[4]) for r in rollup_rows] == [(1, 2)]
+    assert [t[1:] for t in types] == [("digital", 2)]
+    engine.dispose()
+
+
+def test_concurrent_writes_to_a_new_bucket(tmp_path):
+    # Base de datos en fichero: cada hilo tiene su propia conexión y transacción
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'rollups.db'}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as db:
+        user = User(name="race", email="race@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+
+    writers = 8
+    start = datetime(2024, 5, 6, 10, 15, tzinfo=timezone.utc)
+    barrier = threading.Barrier(writers)
+    errors = []
+
+    def write():
+        interruption = Interruption(
+            user_id=user_id, session_id=1, type="digital", start_time=start, duration=30
+        )
+        try:
+            with Session(engine) as db:
+                barrier.wait()
+                record_interruption(db, interruption)
+                db.commit()
+        except Exception as exc:  # pragma: no cover - lo que se comprueba es que no ocurra
+            errors.append(exc)
+
+    threads = [threading.Thread(target=write) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Todos crean el mismo bucket a la vez: ni choques con la clave única ni incrementos perdidos
+    assert errors == []
+    with Session(engine) as db:
+        rollups, types = _rollup_rows(db, user_id)
+    assert [(r[4], r[5]) for r in rollups] == [(writers, 30 * writers)]
+    assert [t[1:] for t in types] == [("digital", writers)]
+    engine.dispose()
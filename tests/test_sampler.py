@@ -0,0 +1,127 @@
+import threading
+import time
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.sampler import ProfilerBusy, SamplingProfilerMiddleware, StackSampler
+from app.core.security import create_access_token, get_password_hash
+from app.db import get_session
+from app.models import User
+
+
+def _spin(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+@pytest.fixture(name="superuser_headers")
+def superuser_headers_fixture(db_session: Session) -> dict:
+    user = User(
+        name="Admin",
+        email="admin@example.com",
+        hashed_password=get_password_hash("adminpassword"),
+        is_superuser=True,
+        created_at=datetime.now(timezone.utc),
+    )
+    db_session.add(user)
+    db_session.commit()
+    return {"Authorization": f"Bearer {create_access_token(subject=user.id)}"}
+
+
+@pytest.fixture(name="sampled_client")
+def sampled_client_fixture(db_session: Session):
+    app = FastAPI()
+
+    @app.get("/spin")
+    def spin(seconds: float = 0.1):
+        _spin(seconds)
+        return {"seconds": seconds}
+
+    app.add_middleware(SamplingProfilerMiddleware)
+    app.dependency_overrides[get_session] = lambda: db_session
+    with TestClient(app) as client:
+        yield client
+
+
+def test_sampler_counts_busy_threads_and_skips_idle_ones():
+    idle = threading.Event()
+    waiting = threading.Thread(target=idle.wait, name="idle-thread")
+    busy = threading.Thread(target=_spin, args=(0.2,), name="busy-thread")
+    waiting.start()
+    with StackSampler(0.002) as sampler:
+        busy.start()
+        busy.join()
+    idle.set()
+    waiting.join()
+
+    lines = sampler.collapsed().splitlines()
+    busy_lines = [line for line in lines if line.startswith("busy-thread;")]
+    assert busy_lines and all("_spin (tests/test_sampler.py:" in line for line in busy_lines)
+    assert not any(line.startswith("idle-thread;") for line in lines)
+    # Cada línea termina con su número de muestras
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == sampler.samples
+
+
+def test_speedscope_output_references_shared_frames():
+    with StackSampler(0.002) as sampler:
+        _spin(0.05)
+
+    document = sampler.speedscope("demo")
+
+    frames = document["shared"]["frames"]
+    (main,) = [profile for profile in document["profiles"] if profile["name"] == "MainThread"]
+    assert main["type"] == "sampled" and main["unit"] == "milliseconds"
+    assert len(main["samples"]) == len(main["weights"])
+    assert main["endValue"] == pytest.approx(sum(main["weights"]), abs=0.01)
+    names = {frames[index]["name"] for sample in main["samples"] for index in sample}
+    assert "_spin" in names
+
+
+def test_only_one_profile_at_a_time():
+    with StackSampler():
+        with pytest.raises(ProfilerBusy):
+            with StackSampler():
+                pass
+    with StackSampler():
+        pass
+
+
+def test_profile_one_request(sampled_client, superuser_headers):
+    response = sampled_client.get("/spin", params={"seconds": 0.1, "__profile": "1"}, headers=superuser_headers)
+
+    assert response.status_code == 200
+    assert response.headers["x-profiled-status"] == "200"
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "_spin (tests/test_sampler.py:" in response.text
+
+    speedscope = sampled_client.get(
+        "/spin", params={"__profile": "1", "__profile_format": "speedscope"}, headers=superuser_headers
+    ).json()
+    assert speedscope["name"] == "GET /spin"
+
+
+def test_profile_requires_a_superuser(sampled_client, superuser_headers, sample_user: User):
+    user_headers = {"Authorization": f"Bearer {create_access_token(subject=sample_user.id)}"}
+
+    assert sampled_client.get("/spin", params={"__profile": "1"}).status_code == 401
+    assert sampled_client.get("/spin", params={"__profile": "1"}, headers=user_headers).status_code == 400
+    assert sampled_client.get(
+        "/spin", params={"__profile": "1", "__profile_format": "pprof"}, headers=superuser_headers
+    ).status_code == 400
+    # Sin __profile=1 la petición sigue su curso normal
+    assert sampled_client.get("/spin", params={"seconds": 0, "__profile": "0"}).json() == {"seconds": 0}
+
+
+def test_profile_process(client, superuser_headers, user_token_headers):
+    url = "/api/v1/profiler/process"
+
+    response = client.get(url, params={"seconds": 0.2, "format": "speedscope"}, headers=superuser_headers)
+
+    assert response.status_code == 200
+    assert response.json()["exporter"] == "hyperfocus"
+    assert client.get(url, params={"seconds": 0.2}, headers=user_token_headers).status_code == 400
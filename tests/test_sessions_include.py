@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlmodel import Session
+
+from app.core.security import create_access_token
+from app.models import Interruption, Session as WorkSession, User
+from tests.test_stats_dashboard import _QueryCounter
+
+BASE = datetime(2025, 3, 1, 9, 0, tzinfo=timezone.utc)
+
+
+def _seed(db: Session, user_id: int, sessions: int, interruptions_per_session: int) -> list[int]:
+    ids = []
+    for i in range(sessions):
+        start = BASE + timedelta(days=i)
+        work_session = WorkSession(user_id=user_id, start_time=start, end_time=start + timedelta(hours=1))
+        db.add(work_session)
+        db.commit()
+        ids.append(work_session.id)
+        # Se insertan en orden inverso: la respuesta las devuelve por start_time
+        for j in reversed(range(interruptions_per_session)):
+            it_start = start + timedelta(minutes=10 * j)
+            db.add(Interruption(
+                session_id=work_session.id,
+                user_id=user_id,
+                type="digital",
+                description="embedded",
+                start_time=it_start,
+                end_time=it_start + timedelta(seconds=30 * (j + 1)),
+                duration=30 * (j + 1),
+            ))
+    db.commit()
+    return ids
+
+
+def test_sessions_include_interruptions(auth_client, db_session: Session, sample_user: User):
+    _seed(db_session, sample_user.id, 2, 3)
+    empty = WorkSession(user_id=sample_user.id, start_time=BASE + timedelta(days=10))
+    db_session.add(empty)
+    db_session.commit()
+
+    response = auth_client.get("/api/v1/sessions/", params={"include": "interruptions"})
+
+    assert response.status_code == 200
+    first, second, third = response.json()
+    assert first["id"] == empty.id
+    assert (first["interruption_count"], first["lost_seconds"], first["interruptions"]) == (0, 0, [])
+    for row in (second, third):
+        assert row["interruption_count"] == 3
+        assert row["lost_seconds"] == 30 + 60 + 90
+        starts = [it["start_time"] for it in row["interruptions"]]
+        assert starts == sorted(starts)
+        assert {it["session_id"] for it in row["interruptions"]} == {row["id"]}
+
+
+def test_sessions_include_query_count_does_not_grow_with_page(auth_client, db_session: Session, sample_user: User):
+    _seed(db_session, sample_user.id, 2, 2)
+    auth_client.get("/api/v1/sessions/")
+
+    with _QueryCounter() as small:
+        assert auth_client.get("/api/v1/sessions/", params={"include": "interruptions"}).status_code == 200
+    _seed(db_session, sample_user.id, 10, 4)
+    with _QueryCounter() as large:
+        response = auth_client.get("/api/v1/sessions/", params={"include": "interruptions"})
+
+    assert len(response.json()) == 12
+    assert large.count == small.count
+
+
+def test_plain_listing_does_not_load_interruptions(auth_client, db_session: Session, sample_user: User):
+    _seed(db_session, sample_user.id, 2, 2)
+    auth_client.get("/api/v1/sessions/")
+
+    with _QueryCounter() as small:
+        auth_client.get("/api/v1/sessions/")
+    _seed(db_session, sample_user.id, 10, 2)
+    with _QueryCounter() as large:
+        response = auth_client.get("/api/v1/sessions/")
+
+    assert "interruptions" not in response.json()[0]
+    assert large.count == small.count
+
+
+def test_session_by_id_include_interruptions(auth_client, db_session: Session, sample_user: User):
+    (session_id,) = _seed(db_session, sample_user.id, 1, 2)
+
+    plain = auth_client.get(f"/api/v1/sessions/{session_id}").json()
+    embedded = auth_client.get(f"/api/v1/sessions/{session_id}", params={"include": "interruptions"}).json()
+
+    assert "interruptions" not in plain
+    assert embedded["interruption_count"] == 2
+    assert embedded["lost_seconds"] == 90
+    assert len(embedded["interruptions"]) == 2
+
+
+def test_include_rejects_fields_and_unknown_values(auth_client, sample_user: User):
+    assert auth_client.get("/api/v1/sessions/", params={"include": "interruptions", "fields": "id"}).status_code == 400
+    assert auth_client.get("/api/v1/sessions/", params={"include": "users"}).status_code == 422
+
+
+def test_interruptions_of_session_ownership(client, db_session: Session, sample_user: User):
+    (session_id,) = _seed(db_session, sample_user.id, 1, 2)
+    empty = WorkSession(user_id=sample_user.id, start_time=BASE)
+    other = User(name="Other", email="other@example.com", hashed_password="x")
+    db_session.add_all([empty, other])
+    db_session.commit()
+    as_owner = {"Authorization": f"Bearer {create_access_token(subject=sample_user.id)}"}
+    as_other = {"Authorization": f"Bearer {create_access_token(subject=other.id)}"}
+
+    assert len(client.get(f"/api/v1/interruptions/session/{session_id}", headers=as_owner).json()) == 2
+    assert client.get(f"/api/v1/interruptions/session/{empty.id}", headers=as_owner).json() == []
+    assert client.get(f"/api/v1/interruptions/session/{session_id}", headers=as_other).status_code == 403
+    assert client.get("/api/v1/interruptions/session/9999", headers=as_owner).status_code == 404
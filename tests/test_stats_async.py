@@ -0,0 +1,153 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core import stats_logic, stats_sql
+from app.core import stats_async as stats_async_core
+from app.core.cache import stats_cache
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db import create_async_db_engine, get_async_database_url, get_async_session
+from app.models import User
+from tests.test_stats_dashboard import _seed
+from tests.test_stats_sql_parity import _assert_same
+
+pytest.importorskip("aiosqlite")
+
+from sqlmodel.ext.asyncio.session import AsyncSession  # noqa: E402
+
+from app.routers import stats_async  # noqa: E402
+
+ENDPOINTS = {
+    "/stats/summary": "get_summary_stats",
+    "/stats/interruption-types": "get_interruption_type_stats",
+    "/stats/productive-hours": "get_productive_hours_stats",
+    "/stats/peak-distraction-time": "get_peak_distraction_hour",
+    "/stats/weekly-pattern": "get_weekly_pattern",
+    "/stats/dashboard": "get_dashboard_stats",
+}
+
+
+@pytest.fixture(name="async_stats")
+def async_stats_fixture(tmp_path):
+    """
+    App con solo el router async de stats sobre un SQLite en fichero,
+    compartido por un engine síncrono (para sembrar datos) y uno async.
+    """
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    sync_engine = create_engine(url, connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(sync_engine)
+    async_engine = create_async_db_engine(url)
+
+    async def override_get_async_session():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(stats_async.router, prefix=settings.API_V1_STR)
+    app.dependency_overrides[get_async_session] = override_get_async_session
+
+    with Session(sync_engine) as db:
+        user = User(name="Async", email="async@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        _seed(db, user.id)
+
+        stats_cache.clear()
+        with TestClient(app) as client:
+            client.headers["Authorization"] = f"Bearer {create_access_token(subject=user.id)}"
+            yield client, db, user.id
+
+    sync_engine.dispose()
+
+
+@pytest.mark.parametrize("backend", ["python", "sql"])
+@pytest.mark.parametrize("path,function_name", ENDPOINTS.items())
+def test_async_router_matches_sync_stats(async_stats, monkeypatch, backend, path, function_name):
+    client, db, user_id = async_stats
+    monkeypatch.setattr(settings, "STATS_BACKEND", backend)
+
+    response = client.get(f"{settings.API_V1_STR}{path}?range=7d")
+    assert response.status_code == 200
+
+    expected = getattr(stats_logic, function_name)(user_id=user_id, db=db, range_days=7)
+    _assert_same(expected, response.json())
+
+
+def test_async_router_conditional_get_and_insights(async_stats):
+    client, _, _ = async_stats
+
+    first = client.get(f"{settings.API_V1_STR}/stats/insights")
+    assert first.status_code == 200
+    assert first.json()
+
+    cached = client.get(f"{settings.API_V1_STR}/stats/insights", headers={"If-None-Match": first.headers["etag"]})
+    assert cached.status_code == 304
+
+
+def _busy(seconds: float):
+    """Agregación lenta que ocupa la CPU (no cede con await)."""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+@pytest.mark.parametrize("backend", ["python", "sql"])
+def test_heavy_stats_do_not_block_the_event_loop(async_stats, monkeypatch, backend):
+    client, _, _ = async_stats
+    monkeypatch.setattr(settings, "STATS_BACKEND", backend)
+    if backend == "python":
+        aggregate = stats_async_core._dashboard_from_rows
+        monkeypatch.setattr(
+            stats_async_core, "_dashboard_from_rows", lambda *args: (_busy(0.5), aggregate(*args))[1]
+        )
+    else:
+        compute = stats_sql.get_dashboard_stats
+        monkeypatch.setattr(stats_sql, "get_dashboard_stats", lambda **kwargs: (_busy(0.5), compute(**kwargs))[1])
+
+    async def scenario():
+        gaps = []
+
+        async def ticker(done: asyncio.Event):
+            last = time.perf_counter()
+            while not done.is_set():
+                await asyncio.sleep(0.01)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        done = asyncio.Event()
+        ticks = asyncio.create_task(ticker(done))
+        transport = httpx.ASGITransport(app=client.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", headers=client.headers) as http:
+            response = await http.get(f"{settings.API_V1_STR}/stats/dashboard?range=7d")
+        done.set()
+        await ticks
+        return response, gaps
+
+    response, gaps = asyncio.run(scenario())
+
+    assert response.status_code == 200
+    # El bucle sigue atendiendo otras tareas mientras se agrega en un hilo
+    assert len(gaps) >= 10
+    assert max(gaps) < 0.25
+
+
+def test_async_router_rejects_invalid_token(async_stats):
+    client, _, _ = async_stats
+    response = client.get(f"{settings.API_V1_STR}/stats/summary", headers={"Authorization": "Bearer nope"})
+    assert response.status_code == 403
+
+
+def test_async_database_url():
+    assert get_async_database_url("sqlite:///./hyperfocus.db") == "sqlite+aiosqlite:///./hyperfocus.db"
+    assert get_async_database_url("postgresql://u:p@db/hf") == "postgresql+asyncpg://u:p@db/hf"
+    assert get_async_database_url("postgresql+psycopg2://u:p@db/hf") == "postgresql+asyncpg://u:p@db/hf"
+    with pytest.raises(ValueError):
+        get_async_database_url("mysql://u:p@db/hf")
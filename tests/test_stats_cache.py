@@ -0,0 +1,171 @@
+import asyncio
+import threading
+
+from app.core import cache as cache_module
+from app.core.cache import InMemoryCacheBackend, RedisCacheBackend, StatsCache, stats_cache
+
+
+class _RedisStandIn:
+    """Sustituto local con el subconjunto de comandos Redis que usa el backend."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value.encode() if isinstance(value, str) else value
+
+    def scan_iter(self, match, count=None):
+        prefix = match.rstrip("*")
+        return [key for key in list(self.data) if key.startswith(prefix)]
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = InMemoryCacheBackend(max_entries=2)
+    backend.set(1, "a", "A", ttl=60)
+    backend.set(1, "b", "B", ttl=60)
+    assert backend.get(1, "a") == "A"  # "b" pasa a ser el menos usado
+
+    backend.set(2, "c", "C", ttl=60)
+
+    assert backend.size() == 2
+    assert backend.get(1, "b") is None
+    assert backend.get(1, "a") == "A"
+    assert backend.get(2, "c") == "C"
+
+
+def test_memory_backend_expires_entries(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: clock[0])
+    backend = InMemoryCacheBackend()
+    backend.set(1, "a", "A", ttl=60)
+
+    clock[0] += 61
+
+    assert backend.get(1, "a") is None
+    assert backend.size() == 0
+
+
+def test_invalidate_user_only_drops_that_user():
+    cache = StatsCache(InMemoryCacheBackend(), ttl_seconds=60)
+    calls = []
+
+    def compute(value):
+        calls.append(value)
+        return {"value": value}
+
+    cache.get_or_compute(1, "summary", 7, 0, lambda: compute(1))
+    cache.get_or_compute(2, "summary", 7, 0, lambda: compute(2))
+    cache.get_or_compute(1, "summary", 7, 0, lambda: compute(1))
+    cache.invalidate_user(1)
+    cache.get_or_compute(1, "summary", 7, 0, lambda: compute(1))
+    cache.get_or_compute(2, "summary", 7, 0, lambda: compute(2))
+
+    assert calls == [1, 2, 1]
+    assert cache.info()["hits"] == 2
+    assert cache.info()["misses"] == 3
+
+
+def test_redis_backend_with_local_stand_in():
+    cache = StatsCache(RedisCacheBackend(_RedisStandIn()), ttl_seconds=60)
+
+    first = cache.get_or_compute(1, "summary", 7, 0, lambda: {"total_sessions": 1})
+    cached = cache.get_or_compute(1, "summary", 7, 0, lambda: {"total_sessions": 2})
+    # Una escritura sube la versión de datos del usuario
+    fresh = cache.get_or_compute(1, "summary", 7, 1, lambda: {"total_sessions": 3})
+
+    assert (first, cached, fresh) == ({"total_sessions": 1}, {"total_sessions": 1}, {"total_sessions": 3})
+
+
+def test_redis_backend_clear_deletes_only_its_prefix():
+    client = _RedisStandIn()
+    client.set("other:key", "keep")
+    cache = StatsCache(RedisCacheBackend(client), ttl_seconds=60)
+    for user_id in range(3):
+        cache.get_or_compute(user_id, "summary", 7, 0, lambda: {"total_sessions": 1})
+
+    cache.clear()
+
+    assert list(client.data) == ["other:key"]
+
+
+def test_write_during_compute_is_not_served_with_the_new_version():
+    cache = StatsCache(InMemoryCacheBackend(), ttl_seconds=60)
+
+    def compute_while_writing():
+        # La escritura termina (e invalida) mientras se calcula con la versión 0
+        cache.invalidate_user(1)
+        return {"total_sessions": 0}
+
+    cache.get_or_compute(1, "summary", 7, 0, compute_while_writing)
+    after_write = cache.get_or_compute(1, "summary", 7, 1, lambda: {"total_sessions": 1})
+
+    assert after_write == {"total_sessions": 1}
+
+
+def test_zero_ttl_disables_the_cache(auth_client, monkeypatch):
+    monkeypatch.setattr(stats_cache, "ttl_seconds", 0)
+
+    for _ in range(2):
+        resp = auth_client.get("/api/v1/stats/summary")
+        assert resp.status_code == 200
+
+    assert stats_cache.info()["hits"] == stats_cache.info()["misses"] == 0
+
+
+def test_writes_invalidate_cached_stats(auth_client):
+    assert auth_client.get("/api/v1/stats/summary").json()["total_sessions"] == 0
+    assert auth_client.get("/api/v1/stats/summary").json()["total_sessions"] == 0
+    assert stats_cache.hits == 1
+
+    auth_client.post("/api/v1/sessions/start", json={})
+
+    assert auth_client.get("/api/v1/stats/summary").json()["total_sessions"] == 1
+
+
+def test_cache_info_requires_superuser(auth_client, db_session, sample_user):
+    assert auth_client.get("/api/v1/stats/cache").status_code == 400
+
+    sample_user.is_superuser = True
+    db_session.add(sample_user)
+    db_session.commit()
+
+    data = auth_client.get("/api/v1/stats/cache").json()
+    assert data["backend"] == "memory"
+    assert {"hits", "misses", "entries", "hit_ratio"} <= set(data)
+
+
+def test_async_lookups_of_blocking_backends_run_off_the_event_loop():
+    cache = StatsCache(RedisCacheBackend(_RedisStandIn()), ttl_seconds=60)
+    client = cache.backend.client
+    threads = []
+
+    def record_thread(method):
+        def wrapper(*args, **kwargs):
+            threads.append(threading.get_ident())
+            return method(*args, **kwargs)
+        return wrapper
+
+    client.get = record_thread(client.get)
+    client.set = record_thread(client.set)
+
+    async def compute():
+        return {"total_sessions": 1}
+
+    async def lookups():
+        first = await cache.get_or_compute_async(1, "summary", 7, 0, compute)
+        cached = await cache.get_or_compute_async(1, "summary", 7, 0, compute)
+        return threading.get_ident(), first, cached
+
+    loop_thread, first, cached = asyncio.run(lookups())
+
+    assert first == cached == {"total_sessions": 1}
+    # get (fallo), set y get (acierto): ninguno en el hilo del bucle de eventos
+    assert len(threads) == 3
+    assert loop_thread not in threads
@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.core import stats_rollup, stats_sql
+from app.models import Session as WorkSession, Interruption, User
+from tests.conftest import engine_test
+from tests.test_stats_sql_parity import _assert_same
+
+DASHBOARD_SECTIONS = {
+    "summary": "/api/v1/stats/summary",
+    "interruption_types": "/api/v1/stats/interruption-types",
+    "productive_hours": "/api/v1/stats/productive-hours",
+    "peak_distraction": "/api/v1/stats/peak-distraction-time",
+    "weekly_pattern": "/api/v1/stats/weekly-pattern",
+}
+
+SECTION_FUNCTIONS = {
+    "summary": "get_summary_stats",
+    "interruption_types": "get_interruption_type_stats",
+    "productive_hours": "get_productive_hours_stats",
+    "peak_distraction": "get_peak_distraction_hour",
+    "weekly_pattern": "get_weekly_pattern",
+}
+
+
+class _QueryCounter:
+    """Cuenta las sentencias SQL ejecutadas en el engine de test."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(engine_test, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine_test, "before_cursor_execute", self)
+
+
+def _seed(db: Session, user_id: int) -> None:
+    now = datetime.now(timezone.utc)
+    for day in range(1, 4):
+        start = now - timedelta(days=day, hours=2)
+        session = WorkSession(user_id=user_id, start_time=start, end_time=start + timedelta(hours=1, minutes=30))
+        db.add(session)
+        db.commit()
+        db.refresh(session)
+        for minutes, it_type in [(10, "digital"), (40, "external"), (70, "digital")]:
+            it_start = start + timedelta(minutes=minutes)
+            db.add(
+                Interruption(
+                    session_id=session.id,
+                    user_id=user_id,
+                    type=it_type,
+                    description="dashboard",
+                    start_time=it_start,
+                    end_time=it_start + timedelta(minutes=3),
+                    duration=180,
+                )
+            )
+    db.add(WorkSession(user_id=user_id, start_time=now - timedelta(minutes=30)))
+    db.commit()
+
+
+@pytest.mark.parametrize("range_param", ["7d", "30d"])
+def test_dashboard_matches_individual_endpoints(auth_client, db_session: Session, sample_user: User, range_param):
+    _seed(db_session, sample_user.id)
+
+    dashboard = auth_client.get(f"/api/v1/stats/dashboard?range={range_param}")
+    assert dashboard.status_code == 200
+    data = dashboard.json()
+
+    for section, url in DASHBOARD_SECTIONS.items():
+        expected = auth_client.get(f"{url}?range={range_param}").json()
+        _assert_same(expected, data[section])
+
+
+def test_dashboard_runs_fewer_queries(auth_client, db_session: Session, sample_user: User):
+    _seed(db_session, sample_user.id)
+
+    with _QueryCounter() as separate:
+        for url in DASHBOARD_SECTIONS.values():
+            auth_client.get(f"{url}?range=7d")
+
+    with _QueryCounter() as combined:
+        auth_client.get("/api/v1/stats/dashboard?range=7d")
+
+    # Usuario + versión de datos (ETag) + sesiones + interrupciones
+    assert combined.count <= 4
+    assert separate.count > 3 * combined.count
+
+
+@pytest.mark.parametrize("backend", [stats_sql, stats_rollup])
+def test_other_backends_build_the_same_dashboard_shape(db_session: Session, sample_user: User, backend):
+    data = backend.get_dashboard_stats(user_id=sample_user.id, db=db_session, range_days=7)
+
+    assert set(data) == {"user_id", "range_days", *DASHBOARD_SECTIONS}
+    assert data["summary"]["total_sessions"] == 0
+
+
+@pytest.mark.parametrize("backend, queries", [(stats_sql, 5), (stats_rollup, 4)])
+def test_other_backends_share_one_window_and_its_queries(
+    db_session: Session, sample_user: User, monkeypatch, backend, queries
+):
+    _seed(db_session, sample_user.id)
+    user_id = sample_user.id
+    calls = []
+    get_range_dates = backend._get_range_dates
+
+    def counted_range_dates(range_days):
+        calls.append(range_days)
+        return get_range_dates(range_days)
+
+    monkeypatch.setattr(backend, "_get_range_dates", counted_range_dates)
+
+    with _QueryCounter() as counter:
+        data = backend.get_dashboard_stats(user_id=user_id, db=db_session, range_days=7)
+
+    # Un solo (since, now) y cada consulta una vez, compartida por las secciones que la usan
+    assert calls == [7]
+    assert counter.count == queries
+    for section, function_name in SECTION_FUNCTIONS.items():
+        expected = getattr(backend, function_name)(user_id=user_id, db=db_session, range_days=7)
+        _assert_same(expected, data[section])
@@ -3,6 +3,10 @@ from datetime import datetime, timedelta, timezone
 from sqlmodel import Session
 
 from app.core.stats_logic import (
+    InterruptionRow,
+    SessionRow,
+    _get_interruptions_in_range,
+    _get_sessions_in_range,
     get_summary_stats,
     get_interruption_type_stats,
     get_productive_hours_stats,
@@ -194,3 +198,40 @@ def test_peak_distraction_hour(db_session: Session, sample_user: User):
     assert stats["total_interruptions"] == 3
     assert stats["peak_hour"] == 10
     assert stats["peak_interruptions"] == 2
+
+
+def test_range_loaders_return_column_tuples(db_session: Session, sample_user: User):
+    """
+    Los loaders de stats devuelven tuplas con solo las columnas necesarias,
+    no objetos ORM (sin description, created_at ni estado de sesión).
+    """
+    user_id = sample_user.id
+    finished = WorkSession(user_id=user_id, start_time=_make_dt(9), end_time=_make_dt(10))
+    open_session = WorkSession(user_id=user_id, start_time=_make_dt(12))
+    db_session.add(finished)
+    db_session.add(open_session)
+    db_session.commit()
+    db_session.refresh(finished)
+    db_session.add(
+        Interruption(
+            session_id=finished.id,
+            user_id=user_id,
+            type="digital",
+            description="x" * 500,
+            start_time=_make_dt(9, 30),
+            end_time=_make_dt(9, 35),
+            duration=300,
+        )
+    )
+    db_session.commit()
+
+    since = datetime.now(timezone.utc) - timedelta(days=7)
+    now = datetime.now(timezone.utc)
+
+    sessions = _get_sessions_in_range(user_id, db_session, since, now)
+    assert len(sessions) == 2
+    assert all(type(s) is SessionRow for s in sessions)
+    assert len(_get_sessions_in_range(user_id, db_session, since, now, finished_only=True)) == 1
+
+    interruptions = _get_interruptions_in_range(user_id, db_session, since)
+    assert interruptions == [InterruptionRow(_make_dt(9, 30).replace(tzinfo=None), 300, "digital")]
@@ -0,0 +1,73 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlmodel import Session
+
+from app.core import stats_logic
+from app.core.bucketing import DAY_US, EPOCH_WEEKDAY, HOUR_US, cyclic_overlap
+from app.models import User
+from tests.test_stats_sql_parity import _assert_same, parity_db_fixture  # noqa: F401
+
+np = pytest.importorskip("numpy")
+
+from app.core import stats_numpy  # noqa: E402
+
+NUMPY_FUNCTIONS = [
+    "get_summary_stats",
+    "get_interruption_type_stats",
+    "get_productive_hours_stats",
+    "get_peak_distraction_hour",
+    "get_weekly_pattern",
+    "get_dashboard_stats",
+]
+
+
+@pytest.mark.parametrize("function_name", NUMPY_FUNCTIONS)
+@pytest.mark.parametrize("range_days", [1, 7, 30])
+def test_numpy_backend_matches_reference(parity_db, function_name, range_days):
+    db, user_id = parity_db
+
+    reference = getattr(stats_logic, function_name)(user_id=user_id, db=db, range_days=range_days)
+    candidate = getattr(stats_numpy, function_name)(user_id=user_id, db=db, range_days=range_days)
+
+    _assert_same(reference, candidate)
+
+
+@pytest.mark.parametrize("function_name", NUMPY_FUNCTIONS)
+def test_numpy_backend_without_data(db_session: Session, sample_user: User, function_name):
+    reference = getattr(stats_logic, function_name)(user_id=sample_user.id, db=db_session, range_days=7)
+    candidate = getattr(stats_numpy, function_name)(user_id=sample_user.id, db=db_session, range_days=7)
+
+    _assert_same(reference, candidate)
+
+
+@pytest.mark.parametrize("bucket_us,buckets,offset", [(HOUR_US, 24, 0), (DAY_US, 7, EPOCH_WEEKDAY)])
+def test_vectorized_totals_match_scalar_overlap(bucket_us, buckets, offset):
+    rng = np.random.default_rng(7)
+    base = int(datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp()) * 1_000_000
+    starts = base + rng.integers(0, 60 * DAY_US, size=500)
+    ends = starts + rng.integers(0, 10 * DAY_US, size=500)
+
+    expected = [0] * buckets
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        for index, micros in enumerate(cyclic_overlap(start, end, bucket_us, buckets, offset)):
+            expected[index] += micros
+
+    assert stats_numpy._cyclic_totals(starts, ends, bucket_us, buckets, offset).tolist() == expected
+
+
+def test_results_are_plain_python_types(parity_db):
+    db, user_id = parity_db
+    data = stats_numpy.get_dashboard_stats(user_id=user_id, db=db, range_days=7)
+
+    def walk(value):
+        if isinstance(value, dict):
+            for item in value.values():
+                walk(item)
+        elif isinstance(value, list):
+            for item in value:
+                walk(item)
+        else:
+            assert value is None or type(value) in (int, float, str)
+
+    walk(data)
@@ -0,0 +1,166 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.core import stats_logic, stats_sql
+from app.models import Session as WorkSession, Interruption, User
+
+# Opcional: URL de un PostgreSQL local para ejecutar la paridad también en ese dialecto
+POSTGRES_URL = os.environ.get("HYPERFOCUS_TEST_POSTGRES_URL")
+
+PARITY_FUNCTIONS = [
+    "get_summary_stats",
+    "get_interruption_type_stats",
+    "get_productive_hours_stats",
+    "get_peak_distraction_hour",
+    "get_weekly_pattern",
+    "get_dashboard_stats",
+]
+
+
+def _assert_same(reference, candidate):
+    """Compara dicts/listas recursivamente, con tolerancia en los floats."""
+    if isinstance(reference, dict):
+        assert set(reference) == set(candidate)
+        for key in reference:
+            _assert_same(reference[key], candidate[key])
+    elif isinstance(reference, list):
+        assert len(reference) == len(candidate)
+        for ref_item, cand_item in zip(reference, candidate):
+            _assert_same(ref_item, cand_item)
+    elif isinstance(reference, float):
+        assert candidate == pytest.approx(reference)
+    else:
+        assert reference == candidate
+
+
+def _seed(db: Session, user_id: int, other_user_id: int) -> None:
+    """
+    Dataset variado: sesiones abiertas, cruzando medianoche, con microsegundos,
+    interrupciones de varios tipos y datos fuera del rango o de otro usuario.
+    """
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    sessions = [
+        (now - timedelta(days=1, hours=3), now - timedelta(days=1, hours=1)),
+        (now - timedelta(days=2, hours=1, minutes=7), now - timedelta(days=1, hours=22, seconds=13)),
+        (now - timedelta(days=3, hours=5, microseconds=250_000), now - timedelta(days=3, hours=4, microseconds=500)),
+        (now - timedelta(days=5), now - timedelta(days=5) + timedelta(minutes=1)),
+        (now - timedelta(hours=2), None),  # sesión todavía abierta
+        (now - timedelta(days=20), now - timedelta(days=19, hours=20)),  # fuera de 7d
+    ]
+    types = ["digital", "external", "internal", "other", "unknown", "digital", "digital"]
+
+    for index, (start, end) in enumerate(sessions):
+        work_session = WorkSession(user_id=user_id, start_time=start, end_time=end)
+        db.add(work_session)
+        db.commit()
+        db.refresh(work_session)
+
+        for offset in range(index + 2):
+            it_start = start + timedelta(minutes=5 * offset + 1)
+            duration = 0 if offset == 3 else 45 * (offset + 1)
+            db.add(
+                Interruption(
+                    session_id=work_session.id,
+                    user_id=user_id,
+                    type=types[(index + offset) % len(types)],
+                    description="parity",
+                    start_time=it_start,
+                    end_time=it_start + timedelta(seconds=duration),
+                    duration=duration,
+                )
+            )
+
+    # Ruido de otro usuario que no debe aparecer en ningún resultado
+    other_session = WorkSession(
+        user_id=other_user_id,
+        start_time=now - timedelta(hours=5),
+        end_time=now - timedelta(hours=4),
+    )
+    db.add(other_session)
+    db.commit()
+    db.refresh(other_session)
+    db.add(
+        Interruption(
+            session_id=other_session.id,
+            user_id=other_user_id,
+            type="external",
+            description="other user",
+            start_time=now - timedelta(hours=4, minutes=30),
+            end_time=now - timedelta(hours=4, minutes=20),
+            duration=600,
+        )
+    )
+    db.commit()
+
+
+def _parity_engines():
+    engines = [pytest.param("sqlite://", id="sqlite")]
+    engines.append(
+        pytest.param(
+            POSTGRES_URL,
+            id="postgresql",
+            marks=pytest.mark.skipif(not POSTGRES_URL, reason="HYPERFOCUS_TEST_POSTGRES_URL not set"),
+        )
+    )
+    return engines
+
+
+@pytest.fixture(name="parity_db", params=_parity_engines())
+def parity_db_fixture(request):
+    engine = create_engine(request.param)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        user = User(name="Parity", email="parity@example.com", hashed_password="x")
+        other = User(name="Other", email="other-parity@example.com", hashed_password="x")
+        session.add(user)
+        session.add(other)
+        session.commit()
+        _seed(session, user.id, other.id)
+        yield session, user.id
+    SQLModel.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest.mark.parametrize("function_name", PARITY_FUNCTIONS)
+@pytest.mark.parametrize("range_days", [1, 7, 30])
+def test_sql_backend_matches_reference(parity_db, function_name, range_days):
+    db, user_id = parity_db
+
+    reference = getattr(stats_logic, function_name)(user_id=user_id, db=db, range_days=range_days)
+    candidate = getattr(stats_sql, function_name)(user_id=user_id, db=db, range_days=range_days)
+
+    _assert_same(reference, candidate)
+
+
+@pytest.mark.parametrize("function_name", PARITY_FUNCTIONS)
+def test_sql_backend_matches_reference_without_data(db_session: Session, sample_user: User, function_name):
+    reference = getattr(stats_logic, function_name)(user_id=sample_user.id, db=db_session, range_days=7)
+    candidate = getattr(stats_sql, function_name)(user_id=sample_user.id, db=db_session, range_days=7)
+
+    _assert_same(reference, candidate)
+
+
+def test_datetime_functions_compile_for_postgresql():
+    query = select(
+        stats_sql.hour_of(Interruption.start_time),
+        stats_sql.weekday_of(Interruption.start_time),
+        stats_sql.epoch_micros(Interruption.start_time),
+    )
+    sql = str(query.compile(dialect=postgresql.dialect()))
+
+    assert "EXTRACT(HOUR FROM interruption.start_time)" in sql
+    assert "EXTRACT(ISODOW FROM interruption.start_time)" in sql
+    assert "EXTRACT(EPOCH FROM interruption.start_time)" in sql
+
+
+def test_stats_endpoint_uses_configured_backend(auth_client, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "STATS_BACKEND", "sql")
+    response = auth_client.get("/api/v1/stats/summary?range=7d")
+    assert response.status_code == 200
+    assert response.json()["total_sessions"] == 0